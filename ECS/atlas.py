@@ -0,0 +1,237 @@
+"""
+Texture atlas builder - packs project images into shared pages
+"""
+
+import hashlib
+import json
+import os
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tga", ".gif")
+ATLAS_VERSION = 1
+PAGE_SIZE = 2048
+PADDING = 2
+
+
+class SkylinePacker:
+    """Bottom-left skyline rectangle packer for a single atlas page."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.skyline = [[0, 0, width]]  # сегменти [x, y, ширина]
+        self.used_width = 0
+        self.used_height = 0
+
+    def _fit(self, i, w, h):
+        x = self.skyline[i][0]
+        if x + w > self.width:
+            return None
+        y = 0
+        remaining = w
+        j = i
+        while remaining > 0:
+            if j >= len(self.skyline):
+                return None
+            y = max(y, self.skyline[j][1])
+            if y + h > self.height:
+                return None
+            remaining -= self.skyline[j][2]
+            j += 1
+        return y
+
+    def insert(self, w, h):
+        """Place a w x h rectangle; returns (x, y) or None when the page is full."""
+        best = None
+        for i in range(len(self.skyline)):
+            y = self._fit(i, w, h)
+            if y is None:
+                continue
+            score = (y + h, self.skyline[i][2])
+            if best is None or score < best[0]:
+                best = (score, i, self.skyline[i][0], y)
+        if best is None:
+            return None
+
+        _, i, x, y = best
+        self._add_level(i, x, y, w, h)
+        self.used_width = max(self.used_width, x + w)
+        self.used_height = max(self.used_height, y + h)
+        return x, y
+
+    def _add_level(self, i, x, y, w, h):
+        sky = self.skyline
+        sky.insert(i, [x, y + h, w])
+        j = i + 1
+        while j < len(sky):
+            prev_end = sky[j - 1][0] + sky[j - 1][2]
+            if sky[j][0] >= prev_end:
+                break
+            shrink = prev_end - sky[j][0]
+            sky[j][0] += shrink
+            sky[j][2] -= shrink
+            if sky[j][2] > 0:
+                break
+            del sky[j]
+
+        j = 0
+        while j < len(sky) - 1:
+            if sky[j][1] == sky[j + 1][1]:
+                sky[j][2] += sky[j + 1][2]
+                del sky[j + 1]
+            else:
+                j += 1
+
+
+def _next_pow2(v):
+    p = 1
+    while p < v:
+        p *= 2
+    return p
+
+
+def _file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def scan_images(assets_path):
+    """Return sorted asset-relative paths of all images under assets_path."""
+    images = []
+    for root, dirs, files in os.walk(assets_path):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for file in files:
+            if file.lower().endswith(IMAGE_EXTENSIONS):
+                rel = os.path.relpath(os.path.join(root, file), assets_path)
+                images.append(rel.replace(os.sep, "/"))
+    return sorted(images)
+
+
+def atlas_key(assets_path, images, page_size=PAGE_SIZE, padding=PADDING):
+    """Cache key: content hashes of all images plus packing settings."""
+    h = hashlib.sha256(f"v{ATLAS_VERSION}:{page_size}:{padding}".encode())
+    for rel in images:
+        h.update(rel.encode())
+        h.update(_file_hash(os.path.join(assets_path, rel)).encode())
+    return h.hexdigest()
+
+
+class Atlas:
+    """Packed atlas layout: page image files plus a UV region per sprite."""
+
+    def __init__(self, assets_path, pages, regions, key=None):
+        self.assets_path = os.path.abspath(assets_path)
+        self.pages = pages
+        self.regions = regions
+        self.key = key
+
+    def region_key(self, image_path):
+        path = image_path
+        if not os.path.isabs(path):
+            path = os.path.join(self.assets_path, path)
+        rel = os.path.relpath(os.path.abspath(path), self.assets_path)
+        return rel.replace(os.sep, "/")
+
+    def find(self, image_path):
+        """Return the region dict for image_path, or None if it is not packed."""
+        if not image_path:
+            return None
+        return self.regions.get(self.region_key(image_path))
+
+    def to_dict(self):
+        return {"version": ATLAS_VERSION, "key": self.key, "pages": self.pages, "regions": self.regions}
+
+
+def build_atlas(assets_path, cache_dir=None, page_size=PAGE_SIZE, padding=PADDING):
+    """Pack every image in assets_path into atlas pages.
+
+    The layout and page images are cached in cache_dir (by default
+    ``<project>/.cache/atlas``) and reused while the content hash matches.
+
+    Returns:
+        Atlas or None if there are no images or PIL is unavailable
+    """
+    if not os.path.isdir(assets_path):
+        return None
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(assets_path)), ".cache", "atlas")
+
+    images = scan_images(assets_path)
+    if not images:
+        return None
+    key = atlas_key(assets_path, images, page_size, padding)
+
+    layout_path = os.path.join(cache_dir, "atlas.json")
+    if os.path.exists(layout_path):
+        try:
+            with open(layout_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("key") == key and all(os.path.exists(os.path.join(cache_dir, p["file"]))
+                                              for p in data["pages"]):
+                pages = [dict(p, path=os.path.join(cache_dir, p["file"])) for p in data["pages"]]
+                return Atlas(assets_path, pages, data["regions"], key)
+        except (OSError, ValueError, KeyError):
+            pass
+
+    if not Image:
+        print("PIL not installed. Install with: pip install Pillow")
+        return None
+
+    decoded = []
+    for rel in images:
+        try:
+            decoded.append((rel, Image.open(os.path.join(assets_path, rel)).convert("RGBA")))
+        except Exception as e:
+            print(f"Error loading sprite {rel}: {e}")
+    # Високі зображення першими - щільніша упаковка
+    decoded.sort(key=lambda item: (item[1].height, item[1].width), reverse=True)
+
+    packers, placements = [], []
+    for rel, img in decoded:
+        w, h = img.width + padding, img.height + padding
+        pos = None
+        for page, packer in enumerate(packers):
+            pos = packer.insert(w, h)
+            if pos:
+                break
+        if pos is None:
+            packer = SkylinePacker(max(page_size, _next_pow2(w)), max(page_size, _next_pow2(h)))
+            packers.append(packer)
+            page = len(packers) - 1
+            pos = packer.insert(w, h)
+        placements.append((rel, img, page, pos[0], pos[1]))
+
+    os.makedirs(cache_dir, exist_ok=True)
+    pages = []
+    canvases = []
+    for i, packer in enumerate(packers):
+        pw, ph = _next_pow2(packer.used_width), _next_pow2(packer.used_height)
+        canvases.append(Image.new("RGBA", (pw, ph), (0, 0, 0, 0)))
+        pages.append({"file": f"page_{i}.png", "width": pw, "height": ph})
+
+    regions = {}
+    for rel, img, page, x, y in placements:
+        canvases[page].paste(img, (x, y))
+        pw, ph = pages[page]["width"], pages[page]["height"]
+        regions[rel] = {
+            "page": page,
+            "rect": [x, y, img.width, img.height],
+            "uv": [x / pw, y / ph, (x + img.width) / pw, (y + img.height) / ph],
+        }
+
+    for page, canvas in zip(pages, canvases):
+        canvas.save(os.path.join(cache_dir, page["file"]))
+    atlas = Atlas(assets_path, pages, regions, key)
+    with open(layout_path, "w", encoding="utf-8") as f:
+        json.dump(atlas.to_dict(), f, indent=2)
+
+    for page in pages:
+        page["path"] = os.path.join(cache_dir, page["file"])
+    return atlas
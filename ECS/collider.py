@@ -2,6 +2,8 @@ from ECS.component import Component
 
 
 class Collider(Component):
+    __slots__ = ("width", "height", "is_solid", "mass", "colliding_with")
+
     def __init__(self, name="collider", width=1.0, height=1.0, is_solid=True, mass=1.0):
         super().__init__(name)
         self.width = width
@@ -0,0 +1,112 @@
+"""
+Collision detection - 2D box overlaps over the World's (Transform, Collider) archetypes
+"""
+
+import numpy as np
+
+from .component import Collider, Script
+from .render import Render
+from .transform import Transform
+
+PAIR_BLOCK = 1 << 18  # кандидатів на один векторний крок (обмежує пам'ять при щільних купах)
+
+
+def _owner(world, entity):
+    # SceneObject для живої сцени; у World, завантаженому зі scene.json, - сама сутність
+    render = world.get(entity, Render)
+    return render.owner if render is not None and render.owner is not None else entity
+
+
+class CollisionSystem:
+    """Finds overlapping colliders every frame and tells their scripts.
+
+    Only the archetypes that have both a Transform and a Collider are
+    visited (``world.query(Transform, Collider)``). Boxes are centred on the
+    transform, sized collider width/height times scale, and tested with a
+    vectorized sweep-and-prune along the axis the centres spread most on.
+    After ``update`` every collider's ``colliding_with`` holds the owners it
+    overlaps; scripts get ``on_collision(other)`` once when a pair starts touching.
+    """
+
+    def __init__(self):
+        self.pairs = set()   # (сутність, сутність) пари, що перетинаються в цьому кадрі
+        self._touched = []   # колайдери з непорожнім colliding_with
+
+    def reset(self):
+        """Forget the current pairs (the tracked World was replaced)."""
+        for collider in self._touched:
+            collider.colliding_with = []
+        self._touched = []
+        self.pairs = set()
+
+    def overlaps(self, world):
+        """Entity pairs whose boxes overlap, as two parallel lists of entities."""
+        entities, xs, ys, widths, heights, scales = [], [], [], [], [], []
+        for chunk_entities, transforms, colliders in world.query(Transform, Collider):
+            entities.extend(chunk_entities)
+            xs.extend([t.x for t in transforms])
+            ys.extend([t.y for t in transforms])
+            scales.extend([abs(t.scale) for t in transforms])
+            widths.extend([c.width for c in colliders])
+            heights.extend([c.height for c in colliders])
+        n = len(entities)
+        if n < 2:
+            return [], []
+
+        x, y, scale = np.array(xs), np.array(ys), np.array(scales)
+        half_w = np.abs(np.array(widths)) * scale * 0.5
+        half_h = np.abs(np.array(heights)) * scale * 0.5
+        min_x, max_x = x - half_w, x + half_w
+        min_y, max_y = y - half_h, y + half_h
+        if np.ptp(y) > np.ptp(x):
+            # Стовпчик об'єктів: сортуємо вздовж y, інакше майже всі пари стають кандидатами
+            min_x, max_x, min_y, max_y = min_y, max_y, min_x, max_x
+
+        # Sweep-and-prune: після сортування за min_x кандидати для i - наступні рамки, що починаються до max_x[i]
+        order = np.argsort(min_x, kind="stable")
+        ends = np.searchsorted(min_x[order], max_x[order], side="right")
+        counts = np.maximum(ends - np.arange(n) - 1, 0)
+        cumulative = np.cumsum(counts)
+        firsts, seconds = [], []
+        start = done = 0
+        while done < cumulative[-1]:
+            # Кандидатів може бути ~N², тому розгортаємо їх блоками по PAIR_BLOCK
+            stop = max(int(np.searchsorted(cumulative, done + PAIR_BLOCK, side="right")), start + 1)
+            block = counts[start:stop]
+            total = int(block.sum())
+            first = np.repeat(np.arange(start, stop), block)
+            offsets = np.arange(total) - np.repeat(np.cumsum(block) - block, block)
+            a, b = order[first], order[first + 1 + offsets]
+            hit = (min_y[a] <= max_y[b]) & (min_y[b] <= max_y[a])
+            firsts.extend(entities[i] for i in a[hit].tolist())
+            seconds.extend(entities[j] for j in b[hit].tolist())
+            start, done = stop, int(cumulative[stop - 1])
+        return firsts, seconds
+
+    def update(self, world):
+        """Refresh colliding_with and send on_collision for new pairs; returns the overlap count."""
+        for collider in self._touched:
+            collider.colliding_with = []
+        self._touched = []
+
+        firsts, seconds = self.overlaps(world)
+        pairs = set()
+        started = []
+        for e1, e2 in zip(firsts, seconds):
+            pair = (e1, e2) if str(e1) <= str(e2) else (e2, e1)
+            pairs.add(pair)
+            o1, o2 = _owner(world, e1), _owner(world, e2)
+            c1, c2 = world.get(e1, Collider), world.get(e2, Collider)
+            c1.colliding_with.append(o2)
+            c2.colliding_with.append(o1)
+            self._touched.extend((c1, c2))
+            if pair not in self.pairs:
+                started.append((e1, o1, e2, o2))
+        self.pairs = pairs
+
+        # Скрипти викликаємо після того, як усі списки colliding_with заповнені
+        for e1, o1, e2, o2 in started:
+            for entity, other in ((e1, o2), (e2, o1)):
+                for script in world.get(entity, Script) or ():
+                    script.on_collision(other)
+        return len(pairs)
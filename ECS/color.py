@@ -1,8 +1,10 @@
 from .component import Component
 
 class Color(Component):
+    __slots__ = ("r", "g", "b")
+
     def __init__(self, r, g, b):
-        super().__init__()
+        super().__init__("color")
         self.r = r
         self.g = g
         self.b = b
@@ -0,0 +1,128 @@
+"""
+Command buffer - structural scene changes deferred to a per-frame sync point
+
+Scripts run while the scene's object list and the engine's render list are
+being iterated, so they must not change them directly. They record
+commands instead:
+
+    self.scene.commands.spawn("bullet", {"transform": {"x": x}})
+    self.scene.commands.destroy(self.owner)
+
+``Scene.update`` flushes the buffer once per frame after all scripts ran.
+Between ``Scene.begin_play`` and ``end_play`` destroyed authored objects
+and their component edits are undone when play stops.
+"""
+
+import time
+import uuid
+
+SPAWN = "spawn"
+CREATE = "create"
+DESTROY = "destroy"
+ADD_COMPONENT = "add_component"
+REMOVE_COMPONENT = "remove_component"
+
+
+class CommandBuffer:
+    """Records create/destroy/add-component/remove-component and applies them in one batch."""
+
+    def __init__(self):
+        self.commands = []
+        self.last_counts = {}
+
+    def __len__(self):
+        return len(self.commands)
+
+    def spawn(self, prefab_name, overrides=None, name=None, on_created=None):
+        """Spawn a runtime prefab instance at the next flush; on_created(obj) is called afterwards."""
+        self.commands.append((SPAWN, prefab_name, overrides, name, on_created))
+
+    def create(self, components, name="Obj", on_created=None):
+        """Create a runtime object from full component dicts at the next flush."""
+        self.commands.append((CREATE, components, name, on_created))
+
+    def destroy(self, obj):
+        self.commands.append((DESTROY, obj))
+
+    def add_component(self, obj, name, data):
+        self.commands.append((ADD_COMPONENT, obj, name, data))
+
+    def remove_component(self, obj, name):
+        self.commands.append((REMOVE_COMPONENT, obj, name))
+
+    def flush(self, scene, engine, profiler=None):
+        """Apply every recorded command in order.
+
+        Removals from scene.objects and component re-syncs are collected and
+        done once per flush instead of once per command.
+
+        Returns:
+            dict: number of applied commands per kind
+        """
+        if not self.commands:
+            self.last_counts = {}
+            return self.last_counts
+        start = time.perf_counter()
+        # Команди, записані під час flush (напр. в on_start), виконаються наступного кадру
+        commands, self.commands = self.commands, []
+        from ECS.scene import SceneObject
+
+        counts = {}
+        removed_ids = set()
+        touched = {}
+        for cmd in commands:
+            kind = cmd[0]
+            counts[kind] = counts.get(kind, 0) + 1
+            if kind == SPAWN:
+                _, prefab_name, overrides, name, on_created = cmd
+                try:
+                    obj = scene.spawn_prefab(engine, prefab_name, overrides, name)
+                except ValueError as e:
+                    print(f"Spawn failed: {e}")
+                    continue
+                if on_created: on_created(obj)
+            elif kind == CREATE:
+                _, components, name, on_created = cmd
+                obj = SceneObject(str(uuid.uuid4())[:8], name, components)
+                scene.add_runtime_object(engine, obj)
+                if on_created: on_created(obj)
+            elif kind == DESTROY:
+                obj = cmd[1]
+                touched.pop(id(obj), None)
+                if obj.id in scene.spawned:
+                    scene.despawn(engine, obj)
+                elif obj.id not in removed_ids:
+                    removed_ids.add(obj.id)
+                    scene.untrack(obj)
+                    if obj.render:
+                        engine.remove_render(obj.render)
+            elif kind == ADD_COMPONENT:
+                _, obj, name, data = cmd
+                scene.preserve(obj)
+                obj.components[name] = data
+                touched[id(obj)] = obj
+            elif kind == REMOVE_COMPONENT:
+                _, obj, name = cmd
+                scene.preserve(obj)
+                if obj.components.pop(name, None) is not None:
+                    touched[id(obj)] = obj
+
+        if removed_ids:
+            scene.objects = [o for o in scene.objects if o.id not in removed_ids]
+        if touched:
+            for obj in touched.values():
+                obj.apply_components()
+                scene.track(obj)
+            # Один перерахунок активних наборів замість одного на кожну зміну
+            engine.rotation_system.mark_dirty()
+            engine.particle_system.mark_dirty()
+
+        self.last_counts = counts
+        if profiler is not None:
+            for kind, n in counts.items():
+                profiler.count(f"commands.{kind}", n)
+            profiler.add_time("commands.flush", time.perf_counter() - start)
+        return counts
+
+    def clear(self):
+        self.commands = []
@@ -1,9 +1,14 @@
 class Component:
+    # __slots__ замість __dict__: компактні екземпляри, фіксований набір полів
+    __slots__ = ("name",)
+
     def __init__(self, name):
         self.name = name
 
 
 class Collider(Component):
+    __slots__ = ("width", "height", "is_solid", "mass", "colliding_with")
+
     def __init__(self, name="collider", width=1.0, height=1.0, is_solid=True, mass=1.0):
         super().__init__(name)
         self.width = width
@@ -14,6 +19,8 @@ class Collider(Component):
 
 
 class Script(Component):
+    __slots__ = ("script_path", "script_instance")
+
     def __init__(self, name="script", script_path=""):
         super().__init__(name)
         self.script_path = script_path
@@ -0,0 +1,169 @@
+"""
+Particle emitters - vectorized CPU simulation over preallocated NumPy pools
+
+Each emitter owns one fixed-capacity float32 array, one row per particle:
+    [pos.x, pos.y, pos.z, life, vel.x, vel.y, vel.z, 1 / max_life]
+Live particles are kept packed in rows [0, count): slots of dead particles
+are refilled from the live tail and new particles go into the free rows
+after it, so nothing is allocated per particle. The live slice is uploaded
+as-is as the instance buffer; size and color are interpolated on the GPU.
+"""
+
+import numpy as np
+
+from .component import Component
+
+INSTANCE_FLOATS = 8
+
+
+class ParticleEmitter(Component):
+    __slots__ = ("rate", "lifetime", "speed", "spread", "direction", "gravity", "start_size", "end_size",
+                 "start_color", "end_color", "max_particles", "enabled", "seed",
+                 "count", "state", "positions", "life", "velocities", "inv_life", "_accum", "_rng")
+
+    def __init__(self, rate=50.0, lifetime=2.0, speed=2.0, spread=0.5, direction=(0.0, 1.0, 0.0),
+                 gravity=-1.0, start_size=0.1, end_size=0.0, start_color=(1.0, 0.8, 0.3, 1.0),
+                 end_color=(1.0, 0.2, 0.0, 0.0), max_particles=1000, enabled=True, seed=None):
+        super().__init__("particles")
+        self.rate = rate
+        self.lifetime = lifetime
+        self.speed = speed
+        self.spread = spread
+        self.direction = tuple(direction)
+        self.gravity = gravity
+        self.start_size = start_size
+        self.end_size = end_size
+        self.start_color = tuple(start_color)
+        self.end_color = tuple(end_color)
+        self.max_particles = max_particles
+        self.enabled = enabled
+        self.seed = seed
+        self._rng = np.random.default_rng(seed)
+        self._allocate(max_particles)
+
+    def _allocate(self, capacity):
+        self.count = 0
+        self._accum = 0.0
+        self.state = np.zeros((capacity, INSTANCE_FLOATS), dtype=np.float32)
+        # Подання стовпців state (без копій)
+        self.positions = self.state[:, 0:3]
+        self.life = self.state[:, 3]
+        self.velocities = self.state[:, 4:7]
+        self.inv_life = self.state[:, 7]
+
+    @classmethod
+    def from_dict(cls, d):
+        seed = d.get("seed")
+        return cls(rate=float(d.get("rate", 50.0)), lifetime=float(d.get("lifetime", 2.0)),
+                   speed=float(d.get("speed", 2.0)), spread=float(d.get("spread", 0.5)),
+                   direction=tuple(float(v) for v in d.get("direction", (0.0, 1.0, 0.0))),
+                   gravity=float(d.get("gravity", -1.0)),
+                   start_size=float(d.get("start_size", 0.1)), end_size=float(d.get("end_size", 0.0)),
+                   start_color=tuple(float(v) for v in d.get("start_color", (1.0, 0.8, 0.3, 1.0))),
+                   end_color=tuple(float(v) for v in d.get("end_color", (1.0, 0.2, 0.0, 0.0))),
+                   max_particles=max(1, int(d.get("max_particles", 1000))),
+                   enabled=bool(d.get("enabled", True)), seed=None if seed is None else int(seed))
+
+    def to_dict(self):
+        return {"rate": self.rate, "lifetime": self.lifetime, "speed": self.speed, "spread": self.spread,
+                "direction": list(self.direction), "gravity": self.gravity,
+                "start_size": self.start_size, "end_size": self.end_size,
+                "start_color": list(self.start_color), "end_color": list(self.end_color),
+                "max_particles": self.max_particles, "enabled": self.enabled, "seed": self.seed}
+
+    def configure(self, d):
+        """Apply edited settings; live particles survive unless the capacity changed."""
+        other = ParticleEmitter.from_dict(d)
+        for name in ("rate", "lifetime", "speed", "spread", "direction", "gravity", "start_size", "end_size",
+                     "start_color", "end_color", "enabled", "seed"):
+            setattr(self, name, getattr(other, name))
+        if other.max_particles != self.max_particles:
+            self.max_particles = other.max_particles
+            self._allocate(other.max_particles)
+
+    def clear(self):
+        self.count = 0
+        self._accum = 0.0
+
+    def _emit(self, n, origin):
+        start, end = self.count, self.count + n
+        rng = self._rng
+        d = np.asarray(self.direction, dtype=np.float32)
+        norm = float(np.linalg.norm(d))
+        d = d / norm if norm > 0 else np.array([0.0, 1.0, 0.0], dtype=np.float32)
+        # Напрям у межах конуса spread навколо direction
+        jitter = rng.standard_normal((n, 3), dtype=np.float32) * self.spread
+        dirs = d[None, :] + jitter
+        dirs /= np.maximum(np.linalg.norm(dirs, axis=1, keepdims=True), 1e-6)
+        self.positions[start:end] = origin
+        self.velocities[start:end] = dirs * self.speed
+        life = self.lifetime * rng.uniform(0.75, 1.0, n).astype(np.float32)
+        self.life[start:end] = life
+        self.inv_life[start:end] = 1.0 / np.maximum(life, 1e-6)
+        self.count = end
+
+    def simulate(self, dt, origin=(0.0, 0.0, 0.0)):
+        """Advance live particles by dt and emit new ones at origin (world space)."""
+        n = self.count
+        if n:
+            life = self.life[:n]
+            life -= dt
+            dead = np.flatnonzero(life <= 0.0)
+            if len(dead):
+                # Слоти мертвих частинок займають живі з хвоста пулу
+                k = n - len(dead)
+                holes = dead[dead < k]
+                tail = k + np.flatnonzero(life[k:] > 0.0)
+                self.state[holes] = self.state[tail]
+                n = self.count = k
+            vel = self.velocities[:n]
+            vel[:, 1] += self.gravity * dt
+            self.positions[:n] += vel * dt
+
+        if not self.enabled:
+            return
+        self._accum += self.rate * dt
+        spawn = int(self._accum)
+        self._accum -= spawn
+        spawn = min(spawn, self.max_particles - self.count)
+        if spawn > 0:
+            self._emit(spawn, origin)
+
+    def instance_data(self):
+        """Rows of the live particles, laid out for the instance buffer."""
+        return self.state[:self.count]
+
+
+class ParticleSystem:
+    """Steps every emitter attached to a Render; the emitter list is rebuilt on mark_dirty."""
+
+    def __init__(self):
+        self.renders = []
+        self.live = 0
+        self._dirty = True
+
+    def mark_dirty(self):
+        self._dirty = True
+
+    def rebuild(self, renderables):
+        self.renders = [r for r in renderables if r.particles is not None]
+        self._dirty = False
+
+    def add(self, render):
+        if not self._dirty and render.particles is not None:
+            self.renders.append(render)
+
+    def remove(self, render):
+        if not self._dirty and render.particles is not None and render in self.renders:
+            self.renders.remove(render)
+
+    def update(self, renderables, dt):
+        if self._dirty:
+            self.rebuild(renderables)
+        live = 0
+        for r in self.renders:
+            t = r.transform
+            origin = (t.x, t.y, t.z) if t is not None else (0.0, 0.0, 0.0)
+            r.particles.simulate(dt, origin)
+            live += r.particles.count
+        self.live = live
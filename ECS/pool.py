@@ -0,0 +1,46 @@
+"""
+Object pools - reuse SceneObject/Render instances for runtime spawn/despawn
+
+A despawned object keeps its Render, shape and GPU buffers; it is only
+detached from the engine. The next spawn of the same prefab resets it from
+the prefab template plus the new overrides instead of building everything
+again.
+"""
+
+
+class ObjectPool:
+    """Free list of despawned instances of one prefab."""
+
+    def __init__(self, prefab_name):
+        self.prefab_name = prefab_name
+        self.free = []
+        self.live = 0
+        self.hits = 0
+        self.misses = 0
+        self.high_water = 0  # найбільша кількість одночасно живих екземплярів
+
+    def acquire(self, reuse=True):
+        """Return a pooled SceneObject, or None if a new one has to be built."""
+        if reuse and self.free:
+            self.hits += 1
+            obj = self.free.pop()
+        else:
+            self.misses += 1
+            obj = None
+        self.live += 1
+        self.high_water = max(self.high_water, self.live)
+        return obj
+
+    def release(self, obj):
+        self.live -= 1
+        self.free.append(obj)
+
+    def trim(self, keep=0):
+        """Drop pooled instances beyond keep; returns the dropped objects."""
+        dropped = self.free[keep:]
+        del self.free[keep:]
+        return dropped
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "live": self.live,
+                "free": len(self.free), "high_water": self.high_water}
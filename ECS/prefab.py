@@ -0,0 +1,152 @@
+"""
+Prefabs - component templates shared by many scene objects
+
+A prefab is ``<assets>/<name>.prefab.json`` holding
+``{"prefab": {"name": ..., "components": {...}}}``.
+Scene objects reference it by name and store only a sparse override dict:
+    {"id": ..., "name": ..., "prefab": "enemy", "overrides": {"transform": {"x": 2.0}}}
+Each override entry replaces keys of one component; ``None`` removes the
+component. The template is never mutated, so everything built from it
+(shape, mesh data) is shared between instances until an object is edited.
+"""
+
+import copy
+import json
+import os
+
+PREFAB_SUFFIX = ".prefab.json"
+
+
+def merge_components(template, overrides):
+    """Return a new, fully independent components dict for one instance."""
+    merged = copy.deepcopy(template)
+    for name, data in (overrides or {}).items():
+        if data is None:
+            merged.pop(name, None)
+        elif name in merged and isinstance(merged[name], dict):
+            merged[name].update(copy.deepcopy(data))
+        else:
+            merged[name] = copy.deepcopy(data)
+    return merged
+
+
+def diff_components(template, components):
+    """Compute the sparse overrides that turn template into components."""
+    overrides = {}
+    for name, data in components.items():
+        base = template.get(name)
+        if base is None or not isinstance(base, dict) or not isinstance(data, dict):
+            if data != base:
+                overrides[name] = copy.deepcopy(data)
+            continue
+        changed = {k: copy.deepcopy(v) for k, v in data.items() if k not in base or base[k] != v}
+        if changed:
+            overrides[name] = changed
+    for name in template:
+        if name not in components:
+            overrides[name] = None
+    return overrides
+
+
+class Prefab:
+    """Immutable component template plus the runtime data derived from it."""
+
+    def __init__(self, name, components, path=None):
+        self.name = name
+        self.components = components
+        self.path = path
+        self._mesh = None
+
+    def component(self, name, overrides=None):
+        """Merged view of one component without copying the template.
+
+        The result may share nested values with the template; treat it as read-only.
+        """
+        override = (overrides or {}).get(name, ...)
+        if override is None:
+            return None
+        base = self.components.get(name)
+        if override is ...:
+            return base
+        if isinstance(base, dict):
+            merged = dict(base)
+            merged.update(override)
+            return merged
+        return override
+
+    def mesh(self):
+        """Shape and vertex data built once from the template's render.shape."""
+        if self._mesh is None:
+            from ECS.scene import shape_from_data
+            shape = shape_from_data(self.components.get("render", {}).get("shape", {}))
+            self._mesh = (shape, shape.get_vertices(), shape.get_indices(), getattr(shape, "draw_mode", "triangles"))
+        return self._mesh
+
+    def to_dict(self):
+        return {"prefab": {"name": self.name, "components": self.components}}
+
+
+class PrefabLibrary:
+    """Loads ``*.prefab.json`` files from an assets directory on demand."""
+
+    def __init__(self, assets_path):
+        self.assets_path = assets_path
+        self._cache = {}  # name -> (mtime_ns, Prefab)
+
+    def path_for(self, name):
+        return os.path.join(self.assets_path, *name.split("/")) + PREFAB_SUFFIX
+
+    def names(self):
+        result = []
+        if not os.path.isdir(self.assets_path):
+            return result
+        for root, _, files in os.walk(self.assets_path):
+            for f in files:
+                if f.endswith(PREFAB_SUFFIX):
+                    rel = os.path.relpath(os.path.join(root, f), self.assets_path)
+                    result.append(rel[:-len(PREFAB_SUFFIX)].replace(os.sep, "/"))
+        return sorted(result)
+
+    def get(self, name):
+        """Return the Prefab called name, or None if it does not exist."""
+        path = self.path_for(name)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            print(f"Prefab not found: {name}")
+            return None
+        cached = self._cache.get(name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading prefab {name}: {e}")
+            return None
+        prefab = Prefab(name, data.get("prefab", data).get("components", {}), path)
+        self._cache[name] = (mtime, prefab)
+        return prefab
+
+    def save(self, name, components):
+        """Write components as prefab name and return the new Prefab."""
+        path = self.path_for(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        prefab = Prefab(name, copy.deepcopy(components), path)
+        # Через тимчасовий файл: ассет може бути hardlink на спільний блоб
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(prefab.to_dict(), f, indent=2)
+        os.replace(tmp_path, path)
+        self._cache[name] = (os.stat(path).st_mtime_ns, prefab)
+        return prefab
+
+    def resolve_object_data(self, o):
+        """Expand a scene.json object that references a prefab into full components."""
+        if "prefab" not in o:
+            return o
+        prefab = self.get(o["prefab"])
+        template = prefab.components if prefab else {}
+        resolved = {k: v for k, v in o.items() if k not in ("prefab", "overrides")}
+        resolved["components"] = merge_components(template, o.get("overrides"))
+        return resolved
@@ -1,6 +1,10 @@
 from .component import Component
 
 class Render(Component):
+    __slots__ = ("shape", "shape_data", "vertex_data", "indices", "draw_mode", "color", "transform",
+                 "_gpu", "owner", "collider", "scripts", "sprite", "rotation", "particles",
+                 "tilemap")
+
     def __init__(self, name, shape=None, vertex_data=None, indices=None, color=(1.0, 1.0, 1.0, 1.0), transform=None):
         super().__init__(name)
         self.shape = shape
@@ -14,15 +18,21 @@ class Render(Component):
             self.indices = indices or []
             self.draw_mode = "triangles"
 
+        self.shape_data = None  # вихідний dict форми зі scene.json, якщо є
         self.color = color
         self.transform = transform
         self._gpu = None
+        self.owner = None  # SceneObject, якому належить рендер
         self.collider = None
         self.scripts = []
         self.sprite = None
+        self.rotation = None
+        self.particles = None
+        self.tilemap = None
 
     def set_shape(self, shape):
         self.shape = shape
+        self.shape_data = None
         if shape is not None:
             self.vertex_data = shape.get_vertices()
             self.indices = shape.get_indices()
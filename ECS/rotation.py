@@ -1,9 +1,111 @@
+import numpy as np
+
 from .component import Component
 
 class RotationComponent(Component):
+    __slots__ = ("speed_x", "speed_y", "speed_z", "enabled")
+
     def __init__(self, speed_x=0.0, speed_y=0.0, speed_z=0.0, enabled=True):
         super().__init__("rotation")
         self.speed_x = speed_x
         self.speed_y = speed_y
         self.speed_z = speed_z
-        self.enabled = enabled
\ No newline at end of file
+        self.enabled = enabled
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(speed_x=float(d.get("speed_x", 0.0)), speed_y=float(d.get("speed_y", 0.0)),
+                   speed_z=float(d.get("speed_z", 0.0)), enabled=bool(d.get("enabled", True)))
+
+
+class RotationSystem:
+    """Spins every Render that has an enabled RotationComponent.
+
+    Angles and speeds of the active set live in (N, 3) arrays, rebuilt only
+    when the set changes. Each spinning Transform reads and writes its
+    rotation_x/y/z straight from its row, so a frame is a single
+    multiply-add with no per-object Python work; a Transform gets its own
+    values back when it leaves the set. Scene dicts are updated on save.
+    Single renders can be added/removed without a rebuild (runtime spawns).
+    """
+
+    def __init__(self):
+        self.transforms = []
+        self.renders = []
+        self._rows = {}  # id(render) -> рядок у масивах
+        self._angles = np.zeros((0, 3))
+        self._speeds = np.zeros((0, 3))
+        self._dirty = True
+
+    @property
+    def angles(self):
+        return self._angles[:len(self.transforms)]
+
+    @property
+    def speeds(self):
+        return self._speeds[:len(self.transforms)]
+
+    def mark_dirty(self):
+        self._dirty = True
+
+    @staticmethod
+    def _is_active(r):
+        return r.rotation is not None and r.rotation.enabled and r.transform is not None
+
+    def rebuild(self, renderables):
+        # Старі трансформи забирають свої кути до заміни масивів
+        for t in self.transforms:
+            t.detach_rotation(self)
+        active = [r for r in renderables if self._is_active(r)]
+        self.renders = active
+        self.transforms = [r.transform for r in active]
+        self._rows = {id(r): i for i, r in enumerate(active)}
+        self._speeds = np.array([(r.rotation.speed_x, r.rotation.speed_y, r.rotation.speed_z) for r in active],
+                                dtype=np.float64).reshape(-1, 3)
+        self._angles = np.zeros((len(active), 3))
+        for i, t in enumerate(self.transforms):
+            t.attach_rotation(self, i)
+        self._dirty = False
+
+    def add(self, render):
+        """Append one render to the active set (amortised O(1))."""
+        if self._dirty or not self._is_active(render) or id(render) in self._rows:
+            return
+        n = len(self.transforms)
+        if n == len(self._angles):
+            capacity = max(16, n * 2)
+            self._angles = np.resize(self._angles, (capacity, 3))
+            self._speeds = np.resize(self._speeds, (capacity, 3))
+        t, rot = render.transform, render.rotation
+        t.attach_rotation(self, n)
+        self._speeds[n] = (rot.speed_x, rot.speed_y, rot.speed_z)
+        self._rows[id(render)] = n
+        self.renders.append(render)
+        self.transforms.append(t)
+
+    def remove(self, render):
+        """Drop one render by moving the last row into its place (O(1))."""
+        if self._dirty:
+            return
+        row = self._rows.pop(id(render), None)
+        if row is None:
+            return
+        self.transforms[row].detach_rotation(self)
+        last = len(self.transforms) - 1
+        if row != last:
+            moved = self.renders[last]
+            self.renders[row] = moved
+            self.transforms[row] = self.transforms[last]
+            self.transforms[row].attach_rotation(self, row)
+            self._speeds[row] = self._speeds[last]
+            self._rows[id(moved)] = row
+        self.renders.pop()
+        self.transforms.pop()
+
+    def update(self, renderables, dt):
+        if self._dirty:
+            self.rebuild(renderables)
+        if not self.transforms:
+            return
+        angles = self.angles
+        angles += self.speeds * dt
@@ -8,17 +8,28 @@ import uuid
 import time
 import hashlib
 
+from ECS.collision import CollisionSystem
+from ECS.commands import CommandBuffer
 from ECS.component import Collider, Script
+from ECS.particles import ParticleEmitter
+from ECS.pool import ObjectPool
+from ECS.prefab import PrefabLibrary, diff_components, merge_components
 from ECS.render import Render
+from ECS.rotation import RotationComponent
 from ECS.shapes import Rectangle, Triangle, Circle, Line, Polygon, Cube
 from ECS.sprite import Sprite as SpriteComponent
+from ECS.tilemap import Tilemap
 from ECS.transform import Transform
+from ECS.world import World, render_components
 
 # Константи для редактора
 SHAPE_TYPES = ("rectangle", "circle", "triangle", "line", "polygon", "cube")
 
 _script_cache = {}
 
+# Компоненти, які SceneObject.reset переналаштовує на місці; решта потребує нового об'єкта
+_RESETTABLE = frozenset(("transform", "render", "rotation", "collider"))
+
 
 # --- Функції дефолтних значень для Editor.py ---
 
@@ -55,37 +66,74 @@ def default_sprite_component(image_path=""):
     return {"image_path": image_path}
 
 
+def default_particles_component():
+    return ParticleEmitter().to_dict()
+
+
+def default_tilemap_component(width=32, height=32):
+    return Tilemap(width=width, height=height).to_dict()
+
+
 # --- Динамічне завантаження скриптів ---
 
+def load_script_class(script_path):
+    """Return the script class defined in script_path (module executed once per file version)."""
+    cache_key = os.path.abspath(script_path)
+    st = os.stat(script_path)
+    cached = _script_cache.get(cache_key)
+    # Щоб скрипти оновлювалися без перезапуску, ключ кешу - mtime і розмір файлу
+    if cached and cached[0] == (st.st_mtime_ns, st.st_size):
+        return cached[1]
+
+    # Створюємо унікальне ім'я модуля
+    module_name = f"user_script_{hashlib.md5(cache_key.encode()).hexdigest()}"
+
+    spec = importlib.util.spec_from_file_location(module_name, script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    # Шукаємо клас у модулі (зазвичай це перший знайдений клас)
+    script_class = None
+    for name in dir(module):
+        obj = getattr(module, name)
+        if isinstance(obj, type) and obj.__module__ == module_name:
+            script_class = obj
+            break
+    _script_cache[cache_key] = ((st.st_mtime_ns, st.st_size), script_class)
+    return script_class
+
+
 def load_script_instance(script_path):
     if not script_path or not os.path.exists(script_path):
         return None
     try:
-        # Щоб скрипти оновлювалися без перезапуску, використовуємо хеш файлу
-        with open(script_path, 'rb') as f:
-            script_content = f.read()
-            script_hash = hashlib.md5(script_content).hexdigest()
-
-        cache_key = os.path.abspath(script_path)
-
-        # Створюємо унікальне ім'я модуля
-        module_name = f"user_script_{hashlib.md5(cache_key.encode()).hexdigest()}"
-
-        spec = importlib.util.spec_from_file_location(module_name, script_path)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-
-        # Шукаємо клас у модулі (зазвичай це перший знайдений клас)
-        for name in dir(module):
-            obj = getattr(module, name)
-            if isinstance(obj, type) and obj.__module__ == module_name:
-                return obj()  # Створюємо екземпляр класу
+        script_class = load_script_class(script_path)
+        if script_class is not None:
+            return script_class()  # Створюємо екземпляр класу
     except Exception as e:
         print(f"Помилка завантаження скрипта {script_path}: {e}")
         traceback.print_exc()
     return None
 
 
+def poolable_overrides(overrides):
+    """True if a pooled prefab instance can be reset to these overrides.
+
+    Only transform, render colour, rotation and collider are re-applied by
+    SceneObject.reset; a new shape, sprite, script list or emitter config
+    needs a freshly built object.
+    """
+    for name, data in (overrides or {}).items():
+        if name not in _RESETTABLE:
+            return False
+        if data is None:
+            if name in ("transform", "render"):
+                return False
+        elif name == "render" and set(data) - {"color"}:
+            return False
+    return True
+
+
 def shape_from_data(shape_data):
     st = (shape_data.get("type") or "rectangle").lower()
     if st == "cube": return Cube(size=float(shape_data.get("size", 1.0)))
@@ -100,23 +148,64 @@ def shape_from_data(shape_data):
 # --- КЛАС ОБ'ЄКТА ---
 
 class SceneObject:
-    def __init__(self, object_id, name, components=None):
+    def __init__(self, object_id, name, components=None, prefab=None, overrides=None, prefab_name=None):
         self.id = object_id
         self.name = name
-        self.components = components or {}
+        # Екземпляр префаба тримає лише overrides; повний dict створюється при першому зверненні
+        self.prefab = prefab
+        self.prefab_name = prefab.name if prefab is not None else prefab_name
+        self.overrides = overrides or {}
+        self._components = None
         self.render = None
+        if self.prefab_name is None or components is not None:
+            self.components = components or {}
+
+    @property
+    def components(self):
+        if self._components is None:
+            template = self.prefab.components if self.prefab is not None else {}
+            self._components = merge_components(template, self.overrides)
+            self.ensure_transform()
+        return self._components
+
+    @components.setter
+    def components(self, value):
+        self._components = value
         self.ensure_transform()
 
+    def component(self, name):
+        """Read-only component dict; does not copy prefab templates."""
+        if self._components is not None:
+            return self._components.get(name)
+        if self.prefab is not None:
+            return self.prefab.component(name, self.overrides)
+        return self.overrides.get(name)
+
+    def update_component(self, name, values):
+        """Set keys of one component, keeping prefab instances sparse when possible."""
+        if self._components is not None or self.prefab_name is None:
+            self.components.setdefault(name, {}).update(values)
+        else:
+            override = self.overrides.get(name)
+            if override is None:
+                override = self.overrides[name] = {}
+            override.update(values)
+
     def ensure_transform(self):
-        if "transform" not in self.components:
-            self.components["transform"] = default_transform_component()
+        if "transform" not in self._components:
+            self._components["transform"] = default_transform_component()
 
     def to_dict(self):
-        return {"id": self.id, "name": self.name, "components": self.components}
+        if self.prefab_name is None:
+            return {"id": self.id, "name": self.name, "components": self.components}
+        overrides = self.overrides
+        if self._components is not None and self.prefab is not None:
+            overrides = diff_components(self.prefab.components, self._components)
+        return {"id": self.id, "name": self.name, "prefab": self.prefab_name, "overrides": overrides}
 
     def create_render(self):
         # 1. Створюємо трансформ
-        t_data = self.components.get("transform", {})
+        t_data = self.component("transform") or {}
         transform = Transform(
             x=float(t_data.get("x", 0.0)), y=float(t_data.get("y", 0.0)), z=float(t_data.get("z", 0.0)),
             scale=float(t_data.get("scale", 1.0))
@@ -126,11 +215,18 @@ class SceneObject:
         transform.rotation_z = float(t_data.get("rotation_z", 0.0))
 
         # 2. Якщо є компонент render, створюємо графіку
-        r_data = self.components.get("render")
+        r_data = self.component("render")
         if r_data:
-            shape = shape_from_data(r_data.get("shape", {}))
+            shape_data = r_data.get("shape", {})
             color = tuple(r_data.get("color", [1, 1, 1, 1]))
-            render = Render(self.name, shape=shape, color=color, transform=transform)
+            template = (self.prefab.components.get("render") or {}) if self.prefab is not None else {}
+            if shape_data == template.get("shape", {}) and self.prefab is not None:
+                # Спільна (незмінна) геометрія префаба - Engine завантажить її на GPU один раз
+                shape, vertices, indices, draw_mode = self.prefab.mesh()
+                render = Render(self.name, vertex_data=vertices, indices=indices, color=color, transform=transform)
+                render.shape, render.draw_mode = shape, draw_mode
+            else:
+                render = Render(self.name, shape=shape_from_data(shape_data), color=color, transform=transform)
         else:
             # Створюємо порожній рендер (Invisible Object) суто для скриптів
             render = Render(self.name, shape=None, transform=transform)
@@ -138,8 +234,26 @@ class SceneObject:
         render.owner = self
         render.scripts = []  # Ініціалізуємо список скриптів
 
+        # Спрайт: текстуру (регіон атласу) призначає Engine.add_render
+        sp_data = self.component("sprite")
+        if sp_data and sp_data.get("image_path"):
+            render.sprite = SpriteComponent("sprite")
+            render.sprite.image_path = sp_data["image_path"]
+
+        rot_data = self.component("rotation")
+        if rot_data:
+            render.rotation = RotationComponent.from_dict(rot_data)
+
+        p_data = self.component("particles")
+        if p_data:
+            render.particles = ParticleEmitter.from_dict(p_data)
+
+        tm_data = self.component("tilemap")
+        if tm_data:
+            render.tilemap = Tilemap.from_dict(tm_data)
+
         # 3. Додаємо колайдер
-        c_data = self.components.get("collider")
+        c_data = self.component("collider")
         if c_data:
             render.collider = Collider(
                 width=float(c_data.get("width", 1.0)), height=float(c_data.get("height", 1.0)),
@@ -147,7 +261,7 @@ class SceneObject:
             )
 
         # 4. ДОДАЄМО СКРИПТИ (Ось те, що ти питав)
-        s_data = self.components.get("script")
+        s_data = self.component("script")
         if s_data:
             for path in s_data.get("scripts", []):
                 if os.path.exists(path):
@@ -162,6 +276,47 @@ class SceneObject:
         self.render = render
         return render
 
+    def reset(self, overrides=None):
+        """Reinitialise a pooled prefab instance from its template plus new overrides.
+
+        overrides must pass poolable_overrides; geometry and GPU data are
+        reused as-is, script instances are created anew (not started).
+        """
+        self.overrides = overrides or {}
+        self._components = None
+        render = self.render
+        t_data = self.component("transform") or {}
+        t = render.transform
+        t.x, t.y, t.z = float(t_data.get("x", 0.0)), float(t_data.get("y", 0.0)), float(t_data.get("z", 0.0))
+        t.scale = float(t_data.get("scale", 1.0))
+        t.rotation_x = float(t_data.get("rotation_x", 0.0))
+        t.rotation_y = float(t_data.get("rotation_y", 0.0))
+        t.rotation_z = float(t_data.get("rotation_z", 0.0))
+
+        r_data = self.component("render") or {}
+        render.color = tuple(r_data.get("color", [1, 1, 1, 1]))
+        rot_data = self.component("rotation")
+        render.rotation = RotationComponent.from_dict(rot_data) if rot_data else None
+        if render.particles is not None:
+            render.particles.clear()
+        c_data = self.component("collider")
+        if not c_data:
+            render.collider = None
+        else:
+            if render.collider is None:
+                render.collider = Collider()
+            c = render.collider
+            c.width, c.height = float(c_data.get("width", 1.0)), float(c_data.get("height", 1.0))
+            c.is_solid, c.mass = bool(c_data.get("is_solid", False)), float(c_data.get("mass", 1.0))
+            c.colliding_with = []
+        # Стан попереднього екземпляра скрипта не переноситься
+        for script in render.scripts:
+            script.script_instance = load_script_instance(script.script_path)
+            if script.script_instance:
+                script.script_instance.render = render
+                script.script_instance.owner = self
+        render.scripts = [script for script in render.scripts if script.script_instance]
+
     def apply_components(self):
         if not self.render: return
         t_data = self.components.get("transform", {})
@@ -175,40 +330,274 @@ class SceneObject:
         if "color" in r_data:
             self.render.color = tuple(float(c) for c in r_data["color"])
 
+        c_data = self.components.get("collider")
+        if not c_data:
+            self.render.collider = None
+        else:
+            if self.render.collider is None:
+                self.render.collider = Collider()
+            c = self.render.collider
+            c.width, c.height = float(c_data.get("width", 1.0)), float(c_data.get("height", 1.0))
+            c.is_solid, c.mass = bool(c_data.get("is_solid", False)), float(c_data.get("mass", 1.0))
+
+        # Обертання: після зміни треба викликати RotationSystem.mark_dirty()
+        rot_data = self.components.get("rotation")
+        self.render.rotation = RotationComponent.from_dict(rot_data) if rot_data else None
+
+        # Частинки: налаштування оновлюються на місці, живі частинки не скидаються
+        p_data = self.components.get("particles")
+        if not p_data:
+            self.render.particles = None
+        elif self.render.particles is None:
+            self.render.particles = ParticleEmitter.from_dict(p_data)
+        else:
+            self.render.particles.configure(p_data)
+
+        tm_data = self.components.get("tilemap")
+        if not tm_data:
+            self.render.tilemap = None
+        elif self.render.tilemap is None:
+            self.render.tilemap = Tilemap.from_dict(tm_data)
+        else:
+            self.render.tilemap.configure(tm_data)
+
+    def store_runtime_state(self):
+        """Copy runtime-only changes (rotation angles, painted tiles) back into the component dicts."""
+        if not self.render: return
+        if self.render.tilemap is not None:
+            self.update_component("tilemap", self.render.tilemap.to_dict())
+        if not self.render.transform or self.render.rotation is None: return
+        t = self.render.transform
+        self.update_component("transform", {"rotation_x": t.rotation_x, "rotation_y": t.rotation_y,
+                                            "rotation_z": t.rotation_z})
+
 
 # --- КЛАС СЦЕНИ ---
 
 class Scene:
-    def __init__(self, name="Scene", objects=None, path=None):
+    def __init__(self, name="Scene", objects=None, path=None, prefabs=None):
         self.name = name
         self.objects = objects or []
         self.path = path
+        self.prefabs = prefabs
+        self.spawned = {}  # id -> SceneObject, створені під час гри (не зберігаються)
+        self.pools = {}  # ім'я префаба -> ObjectPool
+        self.commands = CommandBuffer()
+        self.dt = 0.0
+        self.manager = None  # SceneManager, якщо сценою керує він (переходи зі скриптів)
+        self._play = None  # стан авторської сцени на час гри (begin_play/end_play)
+        # Живі компоненти рендерів в архетипному сховищі - для систем на кшталт CollisionSystem
+        self.world = World()
+        self.world.scene_name = name
+        self.collisions = CollisionSystem()
 
     @classmethod
-    def load(cls, path):
-        if not os.path.exists(path): return cls(path=path)
+    def load(cls, path, assets_path=None):
+        # Префаби шукаються в assets поруч зі scene.json, якщо не вказано інше
+        if assets_path is None:
+            assets_path = os.path.join(os.path.dirname(os.path.abspath(path)), "assets")
+        prefabs = PrefabLibrary(assets_path)
+        if not os.path.exists(path): return cls(path=path, prefabs=prefabs)
         with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
         sc_data = data.get("scene", data)
         objs = []
         for o in sc_data.get("objects", []):
-            objs.append(SceneObject(o.get("id", str(uuid.uuid4())[:8]), o.get("name", "Obj"), o.get("components", {})))
-        return cls(name=sc_data.get("name", "Scene"), objects=objs, path=path)
-
-    def spawn(self, engine):
+            object_id, name = o.get("id", str(uuid.uuid4())[:8]), o.get("name", "Obj")
+            if "prefab" in o:
+                prefab = prefabs.get(o["prefab"])
+                objs.append(SceneObject(object_id, name, prefab=prefab, overrides=o.get("overrides"),
+                                        prefab_name=o["prefab"]))
+            else:
+                objs.append(SceneObject(object_id, name, o.get("components", {})))
+        return cls(name=sc_data.get("name", "Scene"), objects=objs, path=path, prefabs=prefabs)
+
+    def instantiate(self, prefab_name, object_id=None, name=None, overrides=None):
+        """Create a SceneObject referencing a prefab (not yet spawned)."""
+        prefab = self.prefabs.get(prefab_name) if self.prefabs else None
+        if prefab is None:
+            raise ValueError(f"Unknown prefab: {prefab_name}")
+        obj = SceneObject(object_id or str(uuid.uuid4())[:8], name or prefab_name.split("/")[-1].title(),
+                          prefab=prefab, overrides=overrides)
+        self.objects.append(obj)
+        return obj
+
+    def prepare(self):
+        """Build every object's Render (geometry, scripts) without an engine; safe off the GL thread."""
+        renders = []
         for obj in self.objects:
             render = obj.create_render()
             if render:
-                engine.add_render(render)
+                self._bind_scripts(render)
+                self.track(obj)
+                renders.append(render)
+        return renders
+
+    def track(self, obj):
+        """Mirror obj's runtime components into self.world (after create_render/apply_components)."""
+        if obj.render is None:
+            self.untrack(obj)
+            return
+        self.world.sync_entity(obj.id, render_components(obj.render), obj.name)
+
+    def untrack(self, obj):
+        if obj.id in self.world:
+            self.world.destroy(obj.id)
+
+    def spawn(self, engine):
+        for render in self.prepare():
+            engine.add_render(render)
+
+    def _bind_scripts(self, render):
+        for script in render.scripts:
+            script.script_instance.scene = self
+
+    def update(self, engine, dt, profiler=None):
+        """Run scripts' on_update, then apply their deferred commands (the frame's sync point)."""
+        self.dt = dt
+        start = time.perf_counter()
+        for objects in (self.objects, self.spawned.values()):
+            for obj in objects:
+                if obj.render:
+                    for script in obj.render.scripts:
+                        script.on_update()
+        if profiler is not None:
+            profiler.add_time("scripts", time.perf_counter() - start)
+        start = time.perf_counter()
+        self.collisions.update(self.world)
+        if profiler is not None:
+            profiler.add_time("collisions", time.perf_counter() - start)
+        return self.commands.flush(self, engine, profiler)
+
+    # --- Спавн під час гри ---
+
+    def spawn_prefab(self, engine, prefab_name, overrides=None, name=None):
+        """Spawn a runtime instance of a prefab, reusing a pooled one when possible."""
+        pool = self.pools.get(prefab_name)
+        if pool is None:
+            pool = self.pools[prefab_name] = ObjectPool(prefab_name)
+        # Інша форма, спрайт, скрипти чи частинки - пул не підходить
+        obj = pool.acquire(poolable_overrides(overrides))
+        if obj is not None:
+            obj.id = str(uuid.uuid4())[:8]
+            obj.name = name or prefab_name.split("/")[-1].title()
+            obj.reset(overrides)
+            self._bind_scripts(obj.render)
+            self.track(obj)
+            for script in obj.render.scripts:
+                script.on_start()
+            engine.attach_render(obj.render)
+        else:
+            prefab = self.prefabs.get(prefab_name) if self.prefabs else None
+            if prefab is None:
+                pool.live -= 1
+                raise ValueError(f"Unknown prefab: {prefab_name}")
+            obj = SceneObject(str(uuid.uuid4())[:8], name or prefab_name.split("/")[-1].title(),
+                              prefab=prefab, overrides=overrides)
+            render = obj.create_render()
+            self._bind_scripts(render)
+            self.track(obj)
+            for script in render.scripts:
+                script.on_start()
+            engine.add_render(render)
+        self.spawned[obj.id] = obj
+        return obj
+
+    def add_runtime_object(self, engine, obj):
+        """Spawn a non-prefab object created during play (tracked in spawned, not saved)."""
+        render = obj.create_render()
+        self._bind_scripts(render)
+        self.track(obj)
+        for script in render.scripts:
+            script.on_start()
+        engine.add_render(render)
+        self.spawned[obj.id] = obj
+        return obj
+
+    def despawn(self, engine, obj):
+        """Remove a runtime instance; its Render and GPU data go back to the pool."""
+        if isinstance(obj, str):
+            obj = self.spawned.get(obj)
+        if obj is None or self.spawned.pop(obj.id, None) is None:
+            return False
+        self.untrack(obj)
+        pool = self.pools.get(obj.prefab_name) if obj.prefab_name is not None else None
+        if pool is None or not poolable_overrides(obj.overrides):
+            engine.remove_render(obj.render)
+            if pool is not None:
+                pool.live -= 1
+        else:
+            engine.detach_render(obj.render)
+            pool.release(obj)
+        return True
+
+    def trim_pools(self, engine, keep=0):
+        """Free pooled instances (and their GPU data) beyond keep per prefab."""
+        for pool in self.pools.values():
+            for obj in pool.trim(keep):
+                engine.release_render(obj.render)
+
+    def pool_stats(self):
+        return {name: pool.stats() for name, pool in self.pools.items()}
+
+    # --- Режим гри ---
+
+    @property
+    def playing(self):
+        return self._play is not None
+
+    def begin_play(self):
+        """Remember the authored object list; runtime edits are undone by end_play."""
+        self._play = {"objects": list(self.objects), "components": {}}
+
+    def preserve(self, obj):
+        """Keep obj's authored components before a runtime command changes them (once per play)."""
+        if self._play is None or obj.id in self.spawned or id(obj) in self._play["components"]:
+            return
+        self._play["components"][id(obj)] = (copy.deepcopy(obj._components), copy.deepcopy(obj.overrides))
+
+    def end_play(self, engine):
+        """Drop runtime objects and commands, bring back destroyed objects and authored components."""
+        if self._play is None:
+            return
+        self.commands.clear()
+        for obj in list(self.spawned.values()):
+            self.despawn(engine, obj)
+        authored, saved = self._play["objects"], self._play["components"]
+        self._play = None
+        alive = {id(obj) for obj in self.objects}
+        for obj in authored:
+            state = saved.get(id(obj))
+            if id(obj) in alive and state is None:
+                continue
+            if state is not None:
+                obj._components, obj.overrides = state
+            if id(obj) in alive and obj.render:
+                engine.remove_render(obj.render)
+            # Знищений або змінений командами - будуємо рендер заново з авторських даних
+            render = obj.create_render()
+            self._bind_scripts(render)
+            engine.add_render(render)
+        self.objects = authored
+        # Рендери частини об'єктів замінено - архетипи будуємо заново з авторського набору
+        self.world = World()
+        self.world.scene_name = self.name
+        self.collisions.reset()
+        for obj in authored:
+            self.track(obj)
 
     def find_by_id(self, object_id):
         for obj in self.objects:
             if str(obj.id) == str(object_id):
                 return obj
-        return None
+        return self.spawned.get(str(object_id))
 
     def save(self, path=None):
         p = path or self.path
         if not p: return
+        if self._play is not None:
+            raise RuntimeError("Scene is in play mode; call end_play() before saving")
+        for obj in self.objects:
+            obj.store_runtime_state()
         data = {"scene": {"name": self.name, "objects": [obj.to_dict() for obj in self.objects]}}
         with open(p, "w", encoding="utf-8") as f: json.dump(data, f, indent=2)
\ No newline at end of file
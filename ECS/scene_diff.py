@@ -0,0 +1,215 @@
+"""
+Scene diff and three-way merge keyed on object ids
+
+Works on the raw scene.json data, not on SceneObjects:
+
+    changes = diff_scenes(load_scene_data("old.json"), load_scene_data("new.json"))
+    merged, conflicts = merge_scenes(base, ours, theirs)
+
+Objects are matched through a dict keyed by id, so both operations are
+linear in the number of objects. Unchanged objects are skipped with one
+dict comparison; only objects that differ are compared per component and
+per component key. Object order does not matter.
+
+A conflict is reported when both sides changed the same component key
+(or field, or a whole object) to different values. The merged scene
+keeps the preferred side's value at that path.
+"""
+
+import json
+
+# Ключі об'єкта, що містять словник компонентів (звичайні об'єкти та екземпляри префабів)
+COMPONENT_KEYS = ("components", "overrides")
+_MISSING = object()
+
+
+def load_scene_data(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data.get("scene", data)
+
+
+def save_scene_data(scene, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"scene": scene}, f, indent=2)
+
+
+def _index(scene):
+    index = {}
+    for obj in scene.get("objects", []):
+        object_id = str(obj.get("id"))
+        if object_id in index:
+            raise ValueError(f"Duplicate object id: {object_id}")
+        index[object_id] = obj
+    return index
+
+
+def _value(v):
+    return None if v is _MISSING else v
+
+
+# --- Diff ---
+
+def _diff_dict(old, new):
+    """Changed keys of two dicts as {key: [old, new]} (None for a missing side)."""
+    changes = {}
+    for key in old.keys() | new.keys():
+        a, b = old.get(key, _MISSING), new.get(key, _MISSING)
+        if a != b:
+            changes[key] = [_value(a), _value(b)]
+    return changes
+
+
+def diff_objects(old, new):
+    """Per-field and per-component changes of one object.
+
+    Returns:
+        dict: {"fields": {key: [old, new]}, "components": {name: {key: [old, new]} or [old, new]}}
+    """
+    fields = {}
+    components = {}
+    for key in old.keys() | new.keys():
+        a, b = old.get(key, _MISSING), new.get(key, _MISSING)
+        if a == b:
+            continue
+        if key in COMPONENT_KEYS and isinstance(a, dict) and isinstance(b, dict):
+            for name in a.keys() | b.keys():
+                ca, cb = a.get(name, _MISSING), b.get(name, _MISSING)
+                if ca == cb:
+                    continue
+                if isinstance(ca, dict) and isinstance(cb, dict):
+                    components[name] = _diff_dict(ca, cb)
+                else:
+                    components[name] = [_value(ca), _value(cb)]
+        else:
+            fields[key] = [_value(a), _value(b)]
+    return {"fields": fields, "components": components}
+
+
+def diff_scenes(old, new):
+    """Structural diff of two scenes (the dicts inside the "scene" key).
+
+    Returns:
+        dict: {"scene": {field: [old, new]}, "added": {id: obj}, "removed": {id: obj},
+               "changed": {id: diff_objects(...)}}
+    """
+    old_index, new_index = _index(old), _index(new)
+    added = {i: o for i, o in new_index.items() if i not in old_index}
+    removed = {i: o for i, o in old_index.items() if i not in new_index}
+    changed = {}
+    for object_id, a in old_index.items():
+        b = new_index.get(object_id)
+        if b is not None and a != b:
+            changed[object_id] = diff_objects(a, b)
+    meta = _diff_dict({k: v for k, v in old.items() if k != "objects"},
+                      {k: v for k, v in new.items() if k != "objects"})
+    return {"scene": meta, "added": added, "removed": removed, "changed": changed}
+
+
+def summarize(diff):
+    """Short human-readable lines for a diff_scenes result."""
+    lines = [f"scene.{k}: {a!r} -> {b!r}" for k, (a, b) in sorted(diff["scene"].items())]
+    lines += [f"+ {i} {o.get('name', '')}" for i, o in diff["added"].items()]
+    lines += [f"- {i} {o.get('name', '')}" for i, o in diff["removed"].items()]
+    for object_id, change in diff["changed"].items():
+        for key, (a, b) in sorted(change["fields"].items()):
+            lines.append(f"~ {object_id}.{key}: {a!r} -> {b!r}")
+        for name, comp in sorted(change["components"].items()):
+            if isinstance(comp, list):
+                lines.append(f"~ {object_id}.{name}: {'added' if comp[0] is None else 'removed' if comp[1] is None else 'replaced'}")
+            else:
+                for key, (a, b) in sorted(comp.items()):
+                    lines.append(f"~ {object_id}.{name}.{key}: {a!r} -> {b!r}")
+    return lines
+
+
+# --- Тристороннє злиття ---
+
+class _Merger:
+    def __init__(self, prefer):
+        if prefer not in ("ours", "theirs"):
+            raise ValueError(f"prefer must be 'ours' or 'theirs', got {prefer!r}")
+        self.prefer = prefer
+        self.conflicts = []
+
+    def value(self, path, base, ours, theirs):
+        """Three-way pick of one value; _MISSING stands for an absent key."""
+        if ours == theirs or theirs == base:
+            return ours
+        if ours == base:
+            return theirs
+        self.conflicts.append({"path": path, "base": _value(base), "ours": _value(ours), "theirs": _value(theirs)})
+        return ours if self.prefer == "ours" else theirs
+
+    def dict(self, path, base, ours, theirs, levels=()):
+        """Merge dicts key by key.
+
+        levels[0](key) decides whether a key changed on both sides is merged
+        one level deeper (with levels[1:]) instead of as a whole value.
+        """
+        merged = {}
+        # Порядок ключів як у ours, потім нові ключі з theirs
+        keys = list(ours) + [k for k in theirs if k not in ours] + [k for k in base if k not in ours and k not in theirs]
+        for key in keys:
+            b, o, t = base.get(key, _MISSING), ours.get(key, _MISSING), theirs.get(key, _MISSING)
+            sub = f"{path}.{key}" if path else str(key)
+            if levels and levels[0](key) and isinstance(o, dict) and isinstance(t, dict) \
+                    and (b is _MISSING or isinstance(b, dict)) and o != t and o != b and t != b:
+                v = self.dict(sub, {} if b is _MISSING else b, o, t, levels[1:])
+            else:
+                v = self.value(sub, b, o, t)
+            if v is not _MISSING:
+                merged[key] = v
+        return merged
+
+
+# Об'єкт -> components/overrides -> компонент -> ключі компонента
+_OBJECT_LEVELS = (lambda key: key in COMPONENT_KEYS, lambda key: True)
+
+
+def merge_scenes(base, ours, theirs, prefer="ours"):
+    """Three-way merge of scenes (the dicts inside the "scene" key).
+
+    Args:
+        base: Common ancestor
+        ours: Our version; its object order is kept
+        theirs: Their version; objects they added are appended
+        prefer: Side whose value is used at conflicting paths
+
+    Returns:
+        tuple: (merged scene dict, list of conflicts {"id", "path", "base", "ours", "theirs"})
+    """
+    merger = _Merger(prefer)
+    base_index, ours_index, theirs_index = _index(base), _index(ours), _index(theirs)
+
+    order = list(ours_index)
+    order += [i for i in theirs_index if i not in ours_index]
+    order += [i for i in base_index if i not in ours_index and i not in theirs_index]
+
+    objects = []
+    for object_id in order:
+        b = base_index.get(object_id, _MISSING)
+        o = ours_index.get(object_id, _MISSING)
+        t = theirs_index.get(object_id, _MISSING)
+        before = len(merger.conflicts)
+        if o == t or t == b:
+            obj = o
+        elif o == b:
+            obj = t
+        elif b is _MISSING or o is _MISSING or t is _MISSING:
+            # Додано з обох боків по-різному, або видалено з одного і змінено з іншого
+            obj = merger.value("object", b, o, t)
+        else:
+            obj = merger.dict("", b, o, t, _OBJECT_LEVELS)
+        for conflict in merger.conflicts[before:]:
+            conflict["id"] = object_id
+        if obj is not _MISSING:
+            objects.append(obj)
+
+    strip = lambda s: {k: v for k, v in s.items() if k != "objects"}
+    before = len(merger.conflicts)
+    merged = merger.dict("", strip(base), strip(ours), strip(theirs))
+    for conflict in merger.conflicts[before:]:
+        conflict["id"] = None
+    merged["objects"] = objects
+    return merged, merger.conflicts
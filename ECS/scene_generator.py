@@ -0,0 +1,116 @@
+"""
+Synthetic scene generator for scale testing
+
+    generate_scene("big/scene.json", 1_000_000, distribution="clustered", seed=7)
+
+Objects are produced one at a time by ``iter_objects`` and written as soon
+as they are made, so memory use does not grow with the object count. The
+same arguments and seed always give the same file.
+"""
+
+import json
+import math
+import random
+
+from ECS.scene import SHAPE_TYPES, default_render_component
+
+DISTRIBUTIONS = ("uniform", "clustered", "grid")
+
+
+def parse_shape_mix(spec):
+    """Parse "rectangle=3,circle=1" (or "all") into {shape: weight}."""
+    if not spec or spec == "all":
+        return {shape: 1.0 for shape in SHAPE_TYPES}
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip().lower()
+        if name not in SHAPE_TYPES:
+            raise ValueError(f"Unknown shape type: {name} (expected one of {', '.join(SHAPE_TYPES)})")
+        mix[name] = float(weight) if weight else 1.0
+    return mix
+
+
+def iter_objects(count, shape_mix=None, collider_ratio=0.25, script_ratio=0.0, rotation_ratio=0.1,
+                 script_paths=(), distribution="uniform", extent=50.0, clusters=8, cluster_spread=2.0,
+                 seed=0, id_prefix="obj"):
+    """Yield count scene.json object dicts.
+
+    Args:
+        count: Number of objects
+        shape_mix: {shape type: weight}; defaults to every type in SHAPE_TYPES equally
+        collider_ratio, script_ratio, rotation_ratio: Fraction of objects with each component
+        script_paths: Scripts assigned round-robin to objects that get a script component
+        distribution: "uniform" in [-extent, extent]², "clustered" gaussian blobs, or "grid"
+        extent: Half size of the populated area in world units
+        clusters, cluster_spread: Number of blobs and their standard deviation (clustered)
+        seed: Random seed; identical arguments give identical output
+        id_prefix: Prefix of the generated object ids
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution: {distribution} (expected one of {', '.join(DISTRIBUTIONS)})")
+    if script_ratio > 0 and not script_paths:
+        raise ValueError("script_ratio > 0 needs at least one script path")
+    rng = random.Random(seed)
+    mix = shape_mix or parse_shape_mix(None)
+    shapes = list(mix)
+    cum_weights = []
+    total = 0.0
+    for shape in shapes:
+        total += mix[shape]
+        cum_weights.append(total)
+    # Шаблони компонентів для кожного типу фігури будуються один раз
+    renders = {shape: default_render_component(shape) for shape in shapes}
+
+    centers = [(rng.uniform(-extent, extent), rng.uniform(-extent, extent)) for _ in range(max(clusters, 1))]
+    side = max(1, math.ceil(math.sqrt(count)))
+    step = 2.0 * extent / side
+    width = len(str(max(count - 1, 0)))
+
+    for i in range(count):
+        if distribution == "uniform":
+            x, y = rng.uniform(-extent, extent), rng.uniform(-extent, extent)
+        elif distribution == "clustered":
+            cx, cy = centers[rng.randrange(len(centers))]
+            x, y = rng.gauss(cx, cluster_spread), rng.gauss(cy, cluster_spread)
+        else:
+            x, y = -extent + (i % side + 0.5) * step, -extent + (i // side + 0.5) * step
+
+        shape = rng.choices(shapes, cum_weights=cum_weights)[0]
+        render = renders[shape]
+        components = {
+            "transform": {"x": round(x, 4), "y": round(y, 4), "z": 0.0, "scale": 1.0,
+                          "rotation_x": 0.0, "rotation_y": 0.0, "rotation_z": round(rng.uniform(0.0, math.tau), 4)},
+            "render": {"shape": dict(render["shape"]),
+                       "color": [round(rng.random(), 3), round(rng.random(), 3), round(rng.random(), 3), 1.0]},
+        }
+        if rng.random() < collider_ratio:
+            components["collider"] = {"width": 1.0, "height": 1.0, "is_solid": rng.random() < 0.5, "mass": 1.0}
+        if rng.random() < rotation_ratio:
+            components["rotation"] = {"speed_x": 0.0, "speed_y": 0.0, "speed_z": round(rng.uniform(-3.0, 3.0), 3),
+                                      "enabled": True}
+        if script_paths and rng.random() < script_ratio:
+            components["script"] = {"scripts": [script_paths[i % len(script_paths)]]}
+        yield {"id": f"{id_prefix}_{i:0{width}d}", "name": f"{shape.title()} {i}", "components": components}
+
+
+def generate_scene(path, count, name="Generated", **options):
+    """Stream a generated scene to path; options are passed to iter_objects.
+
+    Returns:
+        dict: number of objects and per-component counts
+    """
+    stats = {"objects": 0, "collider": 0, "script": 0, "rotation": 0}
+    encode = json.JSONEncoder(separators=(",", ":")).encode  # один енкодер замість нового на кожен dumps
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"scene": {"name": %s, "objects": [\n' % json.dumps(name))
+        for obj in iter_objects(count, **options):
+            if stats["objects"]:
+                f.write(",\n")
+            f.write(encode(obj))
+            stats["objects"] += 1
+            for key in ("collider", "script", "rotation"):
+                if key in obj["components"]:
+                    stats[key] += 1
+        f.write("\n]}}\n")
+    return stats
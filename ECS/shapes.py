@@ -11,6 +11,20 @@ class Shape:
     def get_indices(self):
         return self.indices
 
+    def get_bounding_radius(self):
+        # Радіус сфери навколо локального центру; не залежить від обертання
+        radius = getattr(self, "_bounding_radius", None)
+        if radius is None:
+            v = self.vertices
+            radius = 0.0
+            for i in range(0, len(v) - 2, 3):
+                d = v[i] * v[i] + v[i + 1] * v[i + 1] + v[i + 2] * v[i + 2]
+                if d > radius:
+                    radius = d
+            radius = radius ** 0.5
+            self._bounding_radius = radius
+        return radius
+
 
 class Rectangle(Shape):
     def __init__(self, width=1.0, height=1.0):
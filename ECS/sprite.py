@@ -1,5 +1,4 @@
 import os
-from OpenGL.GL import *
 import ctypes
 from .component import Component
 
@@ -10,18 +9,71 @@ except ImportError:
 
 
 class Sprite(Component):
-    def __init__(self, name="sprite", image_path=""):
+    __slots__ = ("image_path", "_width", "_height", "_texture_id", "handle", "uv", "atlas_page",
+                 "vertex_data", "indices", "loaded")
+
+    def __init__(self, name="sprite", image_path="", assets=None):
         super().__init__(name)
         self.image_path = image_path
-        self.width = 1.0
-        self.height = 1.0
-        self.texture_id = None
+        self._width = 1.0
+        self._height = 1.0
+        self._texture_id = None
+        self.handle = None  # TextureHandle з AssetManager
+        self.uv = (0.0, 0.0, 1.0, 1.0)  # u0, v0, u1, v1 (v від верхнього краю)
+        self.atlas_page = None
         self.vertex_data = []
         self.indices = []
         self.loaded = False
         
-        if image_path and os.path.exists(image_path):
+        if image_path and assets is not None:
+            self.set_handle(assets.acquire(image_path))
+        elif image_path and os.path.exists(image_path):
             self.load(image_path)
+
+    @property
+    def texture_id(self):
+        return self.handle.texture_id if self.handle is not None else self._texture_id
+
+    @texture_id.setter
+    def texture_id(self, value):
+        self._texture_id = value
+
+    @property
+    def width(self):
+        if self.handle is not None and self.handle.ready and self.atlas_page is None:
+            return self.handle.width / 100.0
+        return self._width
+
+    @width.setter
+    def width(self, value):
+        self._width = value
+
+    @property
+    def height(self):
+        if self.handle is not None and self.handle.ready and self.atlas_page is None:
+            return self.handle.height / 100.0
+        return self._height
+
+    @height.setter
+    def height(self, value):
+        self._height = value
+
+    def set_handle(self, handle):
+        """Use an asynchronously loaded texture; it shows a placeholder until ready."""
+        self.handle = handle
+        self.uv = (0.0, 0.0, 1.0, 1.0)
+        self.atlas_page = None
+        self.loaded = True
+
+    def set_region(self, handle, region, atlas_page=None):
+        """Point this sprite at a packed region of an atlas page texture."""
+        _, _, w, h = region["rect"]
+        self.handle = handle
+        self.uv = tuple(region["uv"])
+        self.atlas_page = atlas_page
+        self.width = w / 100.0
+        self.height = h / 100.0
+        self.loaded = True
     
     def load(self, image_path):
         if not Image:
@@ -32,6 +84,12 @@ class Sprite(Component):
             print(f"Image not found: {image_path}")
             return False
         
+        # GL імпортується тут, щоб ECS.scene не тягнув PyOpenGL без контексту
+        from OpenGL.GL import (GL_CLAMP_TO_EDGE, GL_LINEAR, GL_RGBA, GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER,
+                               GL_TEXTURE_MIN_FILTER, GL_TEXTURE_WRAP_S, GL_TEXTURE_WRAP_T, GL_UNSIGNED_BYTE,
+                               glBindTexture, glGenTextures, glTexImage2D, glTexParameteri)
+        from Engine.memory import gl_memory
+        
         try:
             img = Image.open(image_path)
             img = img.convert("RGBA")
@@ -52,6 +110,7 @@ class Sprite(Component):
             glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, img.width, img.height, 0, GL_RGBA, GL_UNSIGNED_BYTE, img_data)
             
             glBindTexture(GL_TEXTURE_2D, 0)
+            gl_memory.allocate("texture", self.texture_id, len(img_data))
             
             self.image_path = image_path
             self.loaded = True
@@ -73,11 +132,12 @@ class Sprite(Component):
         ]
     
     def get_quad_uv(self):
+        u0, v0, u1, v1 = self.uv
         return [
-            0.0, 1.0,
-            1.0, 1.0,
-            1.0, 0.0,
-            0.0, 0.0,
+            u0, v1,
+            u1, v1,
+            u1, v0,
+            u0, v0,
         ]
     
     def get_quad_indices(self):
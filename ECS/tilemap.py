@@ -0,0 +1,228 @@
+"""
+Tilemaps - compact tile grids meshed into static per-chunk geometry
+
+Tile indices live in one uint16 array (0 = empty, i = tileset[i - 1]).
+The grid is split into chunk_size x chunk_size chunks; edits only mark
+the touched chunks dirty, so the renderer re-meshes just those. Row 0 is
+the bottom row, one tile is tile_size world units.
+"""
+
+import base64
+import zlib
+
+import numpy as np
+
+from .component import Component
+
+FLOATS_PER_VERTEX = 5  # pos(3) + uv(2)
+_CORNERS = np.array([[0, 0], [1, 0], [1, 1], [0, 1]], dtype=np.float32)
+_QUAD_INDICES = np.array([0, 1, 2, 0, 2, 3], dtype=np.uint32)
+
+
+def encode_tiles(tiles):
+    return base64.b64encode(zlib.compress(tiles.astype("<u2").tobytes())).decode("ascii")
+
+
+def decode_tiles(data, width, height):
+    raw = zlib.decompress(base64.b64decode(data))
+    tiles = np.frombuffer(raw, dtype="<u2").astype(np.uint16)
+    if tiles.size != width * height:
+        raise ValueError(f"Tile data has {tiles.size} tiles, expected {width * height}")
+    return tiles.reshape(height, width)
+
+
+def merge_rects(mask):
+    """Greedy-merge a boolean grid into rectangles.
+
+    Runs of solid cells are found per row; a run with the same span as an
+    open rectangle from the row below extends that rectangle upwards.
+
+    Returns:
+        list: (col, row, width, height) in tiles
+    """
+    rects = []
+    open_rects = {}  # (x0, x1) -> [x0, y0, w, h]
+    for row in range(mask.shape[0]):
+        padded = np.concatenate(([0], mask[row].astype(np.int8), [0]))
+        edges = np.flatnonzero(np.diff(padded))
+        spans = set(zip(edges[0::2].tolist(), edges[1::2].tolist()))
+        for span in list(open_rects):
+            if span not in spans:
+                rects.append(tuple(open_rects.pop(span)))
+        for x0, x1 in spans:
+            rect = open_rects.get((x0, x1))
+            if rect is None:
+                open_rects[(x0, x1)] = [x0, row, x1 - x0, 1]
+            else:
+                rect[3] += 1
+    rects.extend(tuple(r) for r in open_rects.values())
+    return rects
+
+
+class Tilemap(Component):
+    __slots__ = ("width", "height", "tile_size", "chunk_size", "tileset", "solid", "tiles",
+                 "dirty_chunks", "version", "_rects", "_gpu")
+
+    def __init__(self, width=32, height=32, tile_size=1.0, chunk_size=16, tileset=None, solid=None, tiles=None):
+        super().__init__("tilemap")
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.chunk_size = chunk_size
+        self.tileset = list(tileset or [])
+        self.solid = None if solid is None else set(solid)  # None - тверді всі непорожні
+        self.tiles = tiles if tiles is not None else np.zeros((height, width), dtype=np.uint16)
+        self.dirty_chunks = set()
+        self.version = 0  # збільшується при кожній зміні тайлів
+        self._rects = None
+        self._gpu = {}  # (cx, cy) -> дані чанка на GPU, керує рендерер
+        self.mark_all_dirty()
+
+    @classmethod
+    def from_dict(cls, d):
+        width, height = max(1, int(d.get("width", 32))), max(1, int(d.get("height", 32)))
+        tiles = None
+        if d.get("data"):
+            try:
+                tiles = decode_tiles(d["data"], width, height)
+            except (ValueError, zlib.error) as e:
+                print(f"Error loading tilemap data: {e}")
+        solid = d.get("solid")
+        return cls(width=width, height=height, tile_size=float(d.get("tile_size", 1.0)),
+                   chunk_size=max(1, int(d.get("chunk_size", 16))), tileset=d.get("tileset", []),
+                   solid=None if solid is None else [int(s) for s in solid], tiles=tiles)
+
+    def to_dict(self):
+        return {"width": self.width, "height": self.height, "tile_size": self.tile_size,
+                "chunk_size": self.chunk_size, "tileset": list(self.tileset),
+                "solid": None if self.solid is None else sorted(self.solid),
+                "data": encode_tiles(self.tiles)}
+
+    def configure(self, d):
+        """Apply edited settings; tiles are kept and chunks re-meshed only if the layout changed."""
+        width, height = max(1, int(d.get("width", self.width))), max(1, int(d.get("height", self.height)))
+        tile_size = float(d.get("tile_size", self.tile_size))
+        chunk_size = max(1, int(d.get("chunk_size", self.chunk_size)))
+        layout_changed = (width, height, tile_size, chunk_size) != (self.width, self.height,
+                                                                    self.tile_size, self.chunk_size)
+        if (width, height) != (self.width, self.height):
+            tiles = np.zeros((height, width), dtype=np.uint16)
+            h, w = min(height, self.height), min(width, self.width)
+            tiles[:h, :w] = self.tiles[:h, :w]
+            self.tiles, self.width, self.height = tiles, width, height
+        self.tile_size, self.chunk_size = tile_size, chunk_size
+        # Зміну tileset рендерер помічає сам (за ключем) і перебудовує чанки
+        self.tileset = list(d.get("tileset", self.tileset))
+        solid = d.get("solid", self.solid)
+        self.solid = None if solid is None else set(int(s) for s in solid)
+        self._rects = None
+        if layout_changed:
+            self.mark_all_dirty()
+
+    # --- Редагування ---
+
+    @property
+    def chunks_x(self):
+        return (self.width + self.chunk_size - 1) // self.chunk_size
+
+    @property
+    def chunks_y(self):
+        return (self.height + self.chunk_size - 1) // self.chunk_size
+
+    def mark_all_dirty(self):
+        self.dirty_chunks = {(cx, cy) for cy in range(self.chunks_y) for cx in range(self.chunks_x)}
+        self._rects = None
+        self.version += 1
+
+    def _mark_dirty(self, x0, y0, x1, y1):
+        cs = self.chunk_size
+        for cy in range(y0 // cs, (y1 - 1) // cs + 1):
+            for cx in range(x0 // cs, (x1 - 1) // cs + 1):
+                self.dirty_chunks.add((cx, cy))
+        self._rects = None
+        self.version += 1
+
+    def get_tile(self, x, y):
+        return int(self.tiles[y, x])
+
+    def set_tile(self, x, y, tile):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise ValueError(f"Tile ({x}, {y}) is outside the {self.width}x{self.height} map")
+        if self.tiles[y, x] == tile:
+            return
+        self.tiles[y, x] = tile
+        self._mark_dirty(x, y, x + 1, y + 1)
+
+    def fill_rect(self, x, y, w, h, tile):
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(self.width, x + w), min(self.height, y + h)
+        if x0 >= x1 or y0 >= y1:
+            return
+        self.tiles[y0:y1, x0:x1] = tile
+        self._mark_dirty(x0, y0, x1, y1)
+
+    def take_dirty_chunks(self):
+        """Return and clear the set of chunks that need re-meshing."""
+        dirty, self.dirty_chunks = self.dirty_chunks, set()
+        return dirty
+
+    # --- Геометрія ---
+
+    def chunk_tiles(self, cx, cy):
+        cs = self.chunk_size
+        return self.tiles[cy * cs:(cy + 1) * cs, cx * cs:(cx + 1) * cs]
+
+    def build_chunk(self, cx, cy, uv_table, slot_table):
+        """Mesh one chunk into vertices and indices grouped by texture slot.
+
+        Args:
+            uv_table: float32 (len(tileset) + 1, 4) array of u0, v0, u1, v1 per tile index
+            slot_table: int array mapping tile index -> texture slot (-1 = not drawable)
+
+        Returns:
+            tuple: (vertices (n*4, 5) float32, indices (n*6,) uint32, [(slot, first_index, count), ...])
+        """
+        block = self.chunk_tiles(cx, cy)
+        rows, cols = np.nonzero(block)
+        ids = block[rows, cols].astype(np.int64)
+        ids = np.minimum(ids, len(slot_table) - 1)
+        slots = slot_table[ids]
+        keep = slots >= 0
+        rows, cols, ids, slots = rows[keep], cols[keep], ids[keep], slots[keep]
+        order = np.argsort(slots, kind="stable")
+        rows, cols, ids, slots = rows[order], cols[order], ids[order], slots[order]
+        n = len(ids)
+
+        cs, ts = self.chunk_size, self.tile_size
+        origin = np.stack([(cols + cx * cs), (rows + cy * cs)], axis=1).astype(np.float32) * ts
+        verts = np.zeros((n, 4, FLOATS_PER_VERTEX), dtype=np.float32)
+        verts[:, :, 0:2] = origin[:, None, :] + _CORNERS[None, :, :] * ts
+        uv = uv_table[ids]
+        u0, v0, u1, v1 = uv[:, 0], uv[:, 1], uv[:, 2], uv[:, 3]
+        verts[:, 0, 3], verts[:, 0, 4] = u0, v1
+        verts[:, 1, 3], verts[:, 1, 4] = u1, v1
+        verts[:, 2, 3], verts[:, 2, 4] = u1, v0
+        verts[:, 3, 3], verts[:, 3, 4] = u0, v0
+        indices = (np.arange(n, dtype=np.uint32)[:, None] * 4 + _QUAD_INDICES[None, :]).ravel()
+
+        ranges = []
+        if n:
+            bounds = np.flatnonzero(np.diff(slots)) + 1
+            starts = np.concatenate(([0], bounds))
+            ends = np.concatenate((bounds, [n]))
+            ranges = [(int(slots[s]), int(s) * 6, int(e - s) * 6) for s, e in zip(starts, ends)]
+        return verts.reshape(n * 4, FLOATS_PER_VERTEX), indices, ranges
+
+    # --- Колізії ---
+
+    def solid_mask(self):
+        if self.solid is None:
+            return self.tiles != 0
+        return np.isin(self.tiles, list(self.solid))
+
+    def collision_rects(self):
+        """Merged solid rectangles as (x, y, width, height) in local world units (cached)."""
+        if self._rects is None:
+            ts = self.tile_size
+            self._rects = [(x * ts, y * ts, w * ts, h * ts) for x, y, w, h in merge_rects(self.solid_mask())]
+        return self._rects
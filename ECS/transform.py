@@ -2,22 +2,62 @@ import math
 from .component import Component
 
 
+def _rotation_axis(axis, slot):
+    """rotation_x/y/z: own value, or a row of RotationSystem's angle array while spinning."""
+    own, set_own = slot.__get__, slot.__set__
+
+    def get(self):
+        system = self._angles_of
+        if system is None:
+            return own(self)
+        return float(system._angles[self._row, axis])
+
+    def set(self, value):
+        system = self._angles_of
+        if system is None:
+            set_own(self, value)
+        else:
+            system._angles[self._row, axis] = value
+
+    return property(get, set)
+
+
 class Transform(Component):
+    __slots__ = ("x", "y", "z", "scale", "_rx", "_ry", "_rz", "_angles_of", "_row")
+
     def __init__(self, x=0.0, y=0.0, z=0.0, scale=1.0):
+        super().__init__("transform")
         self.x = x
         self.y = y
         self.z = z
         self.scale = scale
-        self.rotation_x = 0.0
-        self.rotation_y = 0.0
-        self.rotation_z = 0.0
+        self._angles_of = None
+        self._row = 0
+        self._rx = 0.0
+        self._ry = 0.0
+        self._rz = 0.0
+
+    def attach_rotation(self, system, row):
+        """Read/write rotation from system's angle array row (RotationSystem only)."""
+        system._angles[row] = (self.rotation_x, self.rotation_y, self.rotation_z)
+        self._angles_of = system
+        self._row = row
+
+    def detach_rotation(self, system):
+        """Copy the current angles back into the Transform, if system still owns them."""
+        if self._angles_of is not system:
+            return
+        self._rx, self._ry, self._rz = system._angles[self._row].tolist()
+        self._angles_of = None
 
     def to_mat4(self):
         s = self.scale
 
-        rx = getattr(self, 'rotation_x', 0.0)
-        ry = getattr(self, 'rotation_y', 0.0)
-        rz = getattr(self, 'rotation_z', 0.0)
+        system = self._angles_of
+        if system is None:
+            rx, ry, rz = self._rx, self._ry, self._rz
+        else:
+            rx, ry, rz = system._angles[self._row].tolist()
 
         cx, sx = math.cos(rx), math.sin(rx)
         cy, sy = math.cos(ry), math.sin(ry)
@@ -28,4 +68,9 @@ class Transform(Component):
             s * (sx * sy * cz - cx * sz), s * (sx * sy * sz + cx * cz), s * (sx * cy), 0.0,
             s * (cx * sy * cz + sx * sz), s * (cx * sy * sz - sx * cz), s * (cx * cy), 0.0,
             self.x, self.y, self.z, 1.0
-        ]
\ No newline at end of file
+        ]
+
+
+Transform.rotation_x = _rotation_axis(0, Transform._rx)
+Transform.rotation_y = _rotation_axis(1, Transform._ry)
+Transform.rotation_z = _rotation_axis(2, Transform._rz)
@@ -0,0 +1,408 @@
+"""
+Archetype storage - entities grouped by component signature
+
+Entities that share the same set of component types live in one Archetype,
+which keeps a column (list) per component type. Queries walk only the
+archetypes whose signature contains the requested types.
+
+A World can be loaded from / saved to the scene.json layout on its own, or
+mirror a running Scene: ``Scene.track`` puts each object's live runtime
+components (the ones on its Render) into the columns, so systems such as
+CollisionSystem query them instead of probing every object.
+"""
+
+import copy
+import json
+import os
+import uuid
+
+from ECS.component import Collider, Script
+from ECS.particles import ParticleEmitter
+from ECS.render import Render
+from ECS.rotation import RotationComponent
+from ECS.sprite import Sprite
+from ECS.tilemap import Tilemap
+from ECS.transform import Transform
+
+
+# --- Конвертери між scene.json та типізованими компонентами ---
+
+def _transform_from_dict(d):
+    t = Transform(x=float(d.get("x", 0.0)), y=float(d.get("y", 0.0)), z=float(d.get("z", 0.0)),
+                  scale=float(d.get("scale", 1.0)))
+    t.rotation_x = float(d.get("rotation_x", 0.0))
+    t.rotation_y = float(d.get("rotation_y", 0.0))
+    t.rotation_z = float(d.get("rotation_z", 0.0))
+    return t
+
+
+def _transform_to_dict(t):
+    return {"x": t.x, "y": t.y, "z": t.z, "scale": t.scale,
+            "rotation_x": t.rotation_x, "rotation_y": t.rotation_y, "rotation_z": t.rotation_z}
+
+
+def _render_from_dict(d):
+    from ECS.scene import shape_from_data
+    shape_data = d.get("shape", {})
+    render = Render("render", shape=shape_from_data(shape_data), color=tuple(d.get("color", [1, 1, 1, 1])))
+    render.shape_data = dict(shape_data)
+    return render
+
+
+def _render_to_dict(r):
+    shape_data = r.shape_data
+    if shape_data is None:
+        shape_data = {"type": r.shape.shape_type} if r.shape is not None else {}
+    return {"shape": dict(shape_data), "color": list(r.color)}
+
+
+def _collider_from_dict(d):
+    return Collider(width=float(d.get("width", 1.0)), height=float(d.get("height", 1.0)),
+                    is_solid=bool(d.get("is_solid", False)), mass=float(d.get("mass", 1.0)))
+
+
+def _collider_to_dict(c):
+    return {"width": c.width, "height": c.height, "is_solid": c.is_solid, "mass": c.mass}
+
+
+def _scripts_from_dict(d):
+    # Колонка Script зберігає список: у об'єкта може бути кілька скриптів
+    return [Script("script", path) for path in d.get("scripts", [])]
+
+
+def _scripts_to_dict(scripts):
+    return {"scripts": [s.script_path for s in scripts]}
+
+
+def _rotation_from_dict(d):
+    return RotationComponent.from_dict(d)
+
+
+def _rotation_to_dict(r):
+    return {"speed_x": r.speed_x, "speed_y": r.speed_y, "speed_z": r.speed_z, "enabled": r.enabled}
+
+
+def _sprite_from_dict(d):
+    sprite = Sprite("sprite")
+    sprite.image_path = d.get("image_path", "")
+    return sprite
+
+
+def _sprite_to_dict(s):
+    return {"image_path": s.image_path}
+
+
+def _particles_from_dict(d):
+    return ParticleEmitter.from_dict(d)
+
+
+def _particles_to_dict(p):
+    return p.to_dict()
+
+
+def _tilemap_from_dict(d):
+    return Tilemap.from_dict(d)
+
+
+def _tilemap_to_dict(t):
+    return t.to_dict()
+
+
+# Ім'я компонента в scene.json -> (тип колонки, from_dict, to_dict)
+COMPONENT_TYPES = {
+    "transform": (Transform, _transform_from_dict, _transform_to_dict),
+    "render": (Render, _render_from_dict, _render_to_dict),
+    "collider": (Collider, _collider_from_dict, _collider_to_dict),
+    "script": (Script, _scripts_from_dict, _scripts_to_dict),
+    "rotation": (RotationComponent, _rotation_from_dict, _rotation_to_dict),
+    "sprite": (Sprite, _sprite_from_dict, _sprite_to_dict),
+    "particles": (ParticleEmitter, _particles_from_dict, _particles_to_dict),
+    "tilemap": (Tilemap, _tilemap_from_dict, _tilemap_to_dict),
+}
+_NAME_BY_TYPE = {cls: name for name, (cls, _, _) in COMPONENT_TYPES.items()}
+_KNOWN_KEYS = {}
+
+
+def render_components(render):
+    """The live typed components of a runtime Render, as {column type: instance}."""
+    components = {Render: render}
+    for ctype, component in ((Transform, render.transform), (Collider, render.collider),
+                             (RotationComponent, render.rotation), (Sprite, render.sprite),
+                             (ParticleEmitter, render.particles), (Tilemap, render.tilemap)):
+        if component is not None:
+            components[ctype] = component
+    if render.scripts:
+        components[Script] = render.scripts
+    return components
+
+
+_signatures = {}  # типи в порядку появи -> відсортована сигнатура
+
+
+def _type_key(t):
+    return t.__module__, t.__qualname__
+
+
+def _signature(types):
+    key = tuple(types)
+    signature = _signatures.get(key)
+    if signature is None:
+        signature = _signatures[key] = tuple(sorted(key, key=_type_key))
+    return signature
+
+
+def _by_type(components):
+    return {Script if isinstance(c, list) else type(c): c for c in components}
+
+
+class Archetype:
+    """Column storage for every entity with exactly this component signature."""
+
+    def __init__(self, signature):
+        self.signature = signature
+        self.type_set = frozenset(signature)
+        self.entities = []
+        self.columns = {t: [] for t in signature}
+        self.edges = {}  # (тип, додано?) -> сусідній Archetype
+
+    def __len__(self):
+        return len(self.entities)
+
+    def append(self, entity, components):
+        for t in self.signature:
+            self.columns[t].append(components[t])
+        self.entities.append(entity)
+        return len(self.entities) - 1
+
+    def row(self, index):
+        return {t: self.columns[t][index] for t in self.signature}
+
+    def swap_remove(self, index):
+        """Remove a row by moving the last row into it.
+
+        Returns:
+            The entity that now occupies ``index``, or None if it was the last row
+        """
+        last = len(self.entities) - 1
+        for column in self.columns.values():
+            column[index] = column[last]
+            column.pop()
+        self.entities[index] = self.entities[last]
+        self.entities.pop()
+        return self.entities[index] if index < last else None
+
+
+class World:
+    """Archetype-based entity store with chunked queries.
+
+    Usage:
+        for entities, transforms, colliders in world.query(Transform, Collider):
+            for t, c in zip(transforms, colliders): ...
+    """
+
+    def __init__(self):
+        self.archetypes = {}
+        self.locations = {}  # entity -> (Archetype, row)
+        self.names = {}
+        self.extras = {}  # компоненти/ключі без типізованої колонки, зберігаються як є
+        self.scene_name = "Scene"
+        self._query_cache = {}
+        self._get_archetype(())
+
+    def __len__(self):
+        return len(self.locations)
+
+    def __contains__(self, entity):
+        return entity in self.locations
+
+    def _get_archetype(self, signature):
+        arch = self.archetypes.get(signature)
+        if arch is None:
+            arch = Archetype(signature)
+            self.archetypes[signature] = arch
+            # Новий архетип дописуємо до вже закешованих запитів
+            for types, matches in self._query_cache.items():
+                if arch.type_set.issuperset(types):
+                    matches.append(arch)
+        return arch
+
+    def _neighbour(self, arch, component_type, added):
+        key = (component_type, added)
+        target = arch.edges.get(key)
+        if target is None:
+            types = set(arch.signature)
+            if added:
+                types.add(component_type)
+            else:
+                types.discard(component_type)
+            target = self._get_archetype(_signature(types))
+            arch.edges[key] = target
+        return target
+
+    def _move(self, entity, target, components):
+        arch, row = self.locations[entity]
+        moved = arch.swap_remove(row)
+        if moved is not None:
+            self.locations[moved] = (arch, row)
+        self.locations[entity] = (target, target.append(entity, components))
+
+    def create_entity(self, *components, entity_id=None, name=None):
+        """Create an entity from component instances and return its id."""
+        entity = entity_id if entity_id is not None else str(uuid.uuid4())[:8]
+        if entity in self.locations:
+            raise ValueError(f"Entity '{entity}' already exists")
+        return self._insert(entity, _by_type(components), name)
+
+    def _insert(self, entity, by_type, name):
+        arch = self._get_archetype(_signature(by_type))
+        self.locations[entity] = (arch, arch.append(entity, by_type))
+        self.names[entity] = name if name is not None else "Obj"
+        return entity
+
+    def sync_entity(self, entity, components, name=None):
+        """Create entity or make its row hold exactly these component instances.
+
+        ``components`` maps column type to instance (see ``render_components``).
+        Keeps the row when the signature is unchanged, otherwise moves the
+        entity to the matching archetype. Used to mirror runtime objects.
+        """
+        location = self.locations.get(entity)
+        if location is None:
+            return self._insert(entity, components, name)
+        arch, row = location
+        if arch.type_set == components.keys():
+            for t, component in components.items():
+                arch.columns[t][row] = component
+        else:
+            self._move(entity, self._get_archetype(_signature(components)), components)
+        if name is not None:
+            self.names[entity] = name
+        return entity
+
+    def destroy(self, entity):
+        arch, row = self.locations.pop(entity)
+        moved = arch.swap_remove(row)
+        if moved is not None:
+            self.locations[moved] = (arch, row)
+        self.names.pop(entity, None)
+        self.extras.pop(entity, None)
+
+    def add_component(self, entity, component, component_type=None):
+        ctype = component_type or type(component)
+        arch, row = self.locations[entity]
+        if ctype in arch.type_set:
+            arch.columns[ctype][row] = component
+            return
+        components = arch.row(row)
+        components[ctype] = component
+        self._move(entity, self._neighbour(arch, ctype, True), components)
+
+    def remove_component(self, entity, component_type):
+        arch, row = self.locations[entity]
+        if component_type not in arch.type_set:
+            return None
+        components = arch.row(row)
+        removed = components.pop(component_type)
+        self._move(entity, self._neighbour(arch, component_type, False), components)
+        return removed
+
+    def get(self, entity, component_type):
+        arch, row = self.locations[entity]
+        column = arch.columns.get(component_type)
+        return column[row] if column is not None else None
+
+    def has(self, entity, component_type):
+        return component_type in self.locations[entity][0].type_set
+
+    def query(self, *types):
+        """Yield (entities, column, ...) for every non-empty matching archetype."""
+        key = frozenset(types)
+        matches = self._query_cache.get(key)
+        if matches is None:
+            matches = [a for a in self.archetypes.values() if a.type_set.issuperset(key)]
+            self._query_cache[key] = matches
+        for arch in matches:
+            if arch.entities:
+                yield (arch.entities,) + tuple(arch.columns[t] for t in types)
+
+    def count(self, *types):
+        return sum(len(chunk[0]) for chunk in self.query(*types))
+
+    # --- Конвертація з/у формат scene.json ---
+
+    def add_object_data(self, o):
+        """Create an entity from one scene.json object dict."""
+        comps, extras = [], {}
+        for name, data in (o.get("components") or {}).items():
+            spec = COMPONENT_TYPES.get(name)
+            if spec is None:
+                extras[name] = copy.deepcopy(data)
+                continue
+            comp = spec[1](data)
+            comps.append(comp)
+            # Невідомі конвертеру ключі (напр. render.is_3d) не губимо
+            known = _KNOWN_KEYS.get(name)
+            if known is None:
+                known = _KNOWN_KEYS[name] = frozenset(spec[2](comp))
+            leftover = {k: copy.deepcopy(v) for k, v in data.items() if k not in known}
+            if leftover:
+                extras[name] = leftover
+        if not any(isinstance(c, Transform) for c in comps):
+            comps.append(Transform())
+        entity_id = o.get("id")
+        if entity_id in self.locations:
+            print(f"Duplicate object id '{entity_id}', assigning a new one")
+            entity_id = None
+        entity = self.create_entity(*comps, entity_id=entity_id, name=o.get("name", "Obj"))
+        if extras:
+            self.extras[entity] = extras
+        return entity
+
+    def object_data(self, entity):
+        arch, row = self.locations[entity]
+        components = {}
+        for t in arch.signature:
+            name = _NAME_BY_TYPE.get(t)
+            if name is not None:
+                components[name] = COMPONENT_TYPES[name][2](arch.columns[t][row])
+        for name, data in self.extras.get(entity, {}).items():
+            if name in components:
+                components[name].update(copy.deepcopy(data))
+            else:
+                components[name] = copy.deepcopy(data)
+        return {"id": entity, "name": self.names.get(entity, "Obj"), "components": components}
+
+    @classmethod
+    def from_scene_data(cls, data, prefabs=None):
+        """Build a World from scene.json data; prefab references are expanded through prefabs (a PrefabLibrary)."""
+        world = cls()
+        sc_data = data.get("scene", data)
+        world.scene_name = sc_data.get("name", "Scene")
+        for o in sc_data.get("objects", []):
+            if prefabs is not None:
+                o = prefabs.resolve_object_data(o)
+            world.add_object_data(o)
+        return world
+
+    @classmethod
+    def from_scene(cls, scene):
+        world = cls()
+        world.scene_name = scene.name
+        for obj in scene.objects:
+            world.add_object_data({"id": obj.id, "name": obj.name, "components": obj.components})
+        return world
+
+    @classmethod
+    def load(cls, path, prefabs=None):
+        if not os.path.exists(path):
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_scene_data(json.load(f), prefabs)
+
+    def to_scene_data(self, name=None):
+        name = name or getattr(self, "scene_name", "Scene")
+        return {"scene": {"name": name, "objects": [self.object_data(e) for e in self.locations]}}
+
+    def save(self, path, name=None):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_scene_data(name), f, indent=2)
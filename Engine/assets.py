@@ -0,0 +1,191 @@
+"""
+Asset manager - background image decoding and budgeted texture uploads
+"""
+
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from OpenGL.GL import *
+
+from .memory import gl_memory
+from .texture_cache import TextureCache
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+DEFAULT_UPLOAD_BUDGET = 8 * 1024 * 1024  # байтів текстур за кадр
+
+
+def decode_image(path):
+    """Decode an image file to RGBA.
+
+    Returns:
+        tuple: (width, height, rgba_bytes)
+    """
+    img = Image.open(path).convert("RGBA")
+    return img.width, img.height, img.tobytes()
+
+
+class _DecodedImage:
+    """In-memory counterpart of texture_cache.CachedTexture."""
+
+    def __init__(self, width, height, data):
+        self.width = width
+        self.height = height
+        self.levels = [(width, height, data)]
+        self.nbytes = len(data)
+
+    def close(self):
+        self.levels = []
+
+
+class TextureHandle:
+    """Shared texture reference; texture_id is the placeholder until ready."""
+
+    def __init__(self, path, placeholder):
+        self.path = path
+        self.texture_id = placeholder
+        self.width = 1
+        self.height = 1
+        self.nbytes = 0
+        self.ready = False
+        self.error = None
+        self.refcount = 0
+
+
+class AssetManager:
+    """Decodes images on a worker pool and uploads them on the GL thread.
+
+    ``acquire`` returns immediately; ``update`` must be called once per frame
+    from the thread that owns the GL context.
+    """
+
+    def __init__(self, workers=4, upload_budget=DEFAULT_UPLOAD_BUDGET):
+        self.upload_budget = upload_budget
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pof-decode")
+        self._decoded = queue.Queue()
+        self._handles = {}
+        self._placeholder = None
+        self.cache = None
+        self.uploaded_bytes = 0
+
+    def use_cache(self, cache_dir, mipmaps=False):
+        """Load images through a persistent raw RGBA cache in cache_dir."""
+        self.cache = TextureCache(cache_dir, mipmaps=mipmaps)
+        return self.cache
+
+    @staticmethod
+    def _key(path):
+        return os.path.normcase(os.path.abspath(path))
+
+    def _get_placeholder(self):
+        if self._placeholder is None:
+            self._placeholder = self._create_texture([(1, 1, b"\xff\xff\xff\xff")])
+        return self._placeholder
+
+    def _create_texture(self, levels):
+        tex = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, tex)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        min_filter = GL_LINEAR_MIPMAP_LINEAR if len(levels) > 1 else GL_LINEAR
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, min_filter)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAX_LEVEL, len(levels) - 1)
+        for level, (w, h, data) in enumerate(levels):
+            # np.frombuffer не копіює - дані йдуть напряму з mmap
+            glTexImage2D(GL_TEXTURE_2D, level, GL_RGBA, w, h, 0, GL_RGBA, GL_UNSIGNED_BYTE,
+                         np.frombuffer(data, dtype=np.uint8))
+        glBindTexture(GL_TEXTURE_2D, 0)
+        gl_memory.allocate("texture", tex, sum(w * h * 4 for w, h, _ in levels))
+        return tex
+
+    def _decode(self, handle):
+        try:
+            if self.cache is not None:
+                result = self.cache.load(handle.path)
+            else:
+                width, height, data = decode_image(handle.path)
+                result = _DecodedImage(width, height, data)
+        except Exception as e:
+            result = e
+        self._decoded.put((handle, result))
+
+    def acquire(self, image_path):
+        """Return a shared handle for image_path, scheduling a decode if needed."""
+        key = self._key(image_path)
+        handle = self._handles.get(key)
+        if handle is None:
+            handle = TextureHandle(image_path, self._get_placeholder())
+            self._handles[key] = handle
+            if Image is None:
+                handle.error = "PIL not installed. Install with: pip install Pillow"
+                print(handle.error)
+            elif not os.path.exists(image_path):
+                handle.error = f"Image not found: {image_path}"
+                print(handle.error)
+            else:
+                self._pool.submit(self._decode, handle)
+        handle.refcount += 1
+        return handle
+
+    def release(self, handle):
+        """Drop one reference; the texture is freed when nothing uses it."""
+        handle.refcount -= 1
+        if handle.refcount > 0:
+            return
+        self._handles.pop(self._key(handle.path), None)
+        if handle.ready:
+            glDeleteTextures(1, [handle.texture_id])
+            gl_memory.free("texture", handle.texture_id)
+            handle.texture_id = self._placeholder
+            handle.ready = False
+
+    def update(self):
+        """Upload decoded images until this frame's byte budget is spent.
+
+        At least one image is uploaded per call so oversized textures still
+        make progress.
+        """
+        spent = 0
+        while spent < self.upload_budget:
+            try:
+                handle, result = self._decoded.get_nowait()
+            except queue.Empty:
+                break
+            if handle.refcount <= 0:
+                if not isinstance(result, Exception):
+                    result.close()
+                continue  # звільнено до завершення декодування
+            if isinstance(result, Exception):
+                handle.error = str(result)
+                print(f"Error loading sprite {handle.path}: {result}")
+                continue
+
+            handle.texture_id = self._create_texture(result.levels)
+            handle.width, handle.height = result.width, result.height
+            handle.nbytes = result.nbytes
+            handle.ready = True
+            result.close()
+            spent += handle.nbytes
+        self.uploaded_bytes += spent
+        return spent
+
+    def pending(self):
+        return sum(1 for h in self._handles.values() if not h.ready and h.error is None)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+        textures = [h.texture_id for h in self._handles.values() if h.ready]
+        if self._placeholder is not None:
+            textures.append(self._placeholder)
+        if textures:
+            glDeleteTextures(len(textures), textures)
+            for tex in textures:
+                gl_memory.free("texture", tex)
+        self._handles.clear()
+        self._placeholder = None
@@ -0,0 +1,296 @@
+"""
+Shared blob store - deduplicated assets and scripts across projects
+
+Files are stored once under ``<projects>/.blobs/<sha[:2]>/<sha256>`` and
+each project's copy shares the blob's data:
+
+- ``reflink``: a copy-on-write clone (Linux FICLONE on btrfs/XFS/...). The
+  project file is its own inode, so writing into it - in place or not -
+  only ever changes that project.
+- ``link``: a hardlink to the read-only blob, used only where clones are
+  unavailable and only for directories passed as ``hardlink_dirs``
+  (assets). Editable files (scripts) are never hardlinked: an in-place
+  write through a hardlink would change every project sharing the inode.
+
+Each project keeps ``.blobs.json`` (relative path -> hash, inode, size,
+mtime, mode). A blob is referenced by every manifest entry naming it;
+garbage collection removes blobs that no manifest references and no
+hardlink still points to. ``verify_project`` re-hashes the files and
+detaches every one whose content no longer matches its manifest entry.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+MANIFEST_FILE = ".blobs.json"
+CHUNK_SIZE = 1 << 20
+FICLONE = 0x40049409  # _IOW(0x94, 9, int), linux/fs.h
+
+
+def _hash_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _reflink(src, dst):
+    """Create dst as a copy-on-write clone of src; False where the FS can't."""
+    if fcntl is None:
+        return False
+    try:
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        return True
+    except OSError:
+        if os.path.exists(dst):
+            os.remove(dst)
+        return False
+
+
+def make_writable(func, path, _exc_info):
+    """shutil.rmtree onerror handler for read-only blob links (Windows)."""
+    os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+    func(path)
+
+
+class BlobStore:
+    """SHA-256 keyed file store shared by all projects in one projects root."""
+
+    def __init__(self, root):
+        self.root = root
+        self.projects_root = os.path.dirname(os.path.abspath(root))
+        self.reflinks_supported = True
+        self.links_supported = True
+
+    def path_for(self, digest):
+        return os.path.join(self.root, digest[:2], digest)
+
+    def intern(self, path, digest=None, allow_link=False):
+        """Make path share its blob's data, adding the blob if new.
+
+        Args:
+            path: Project file
+            digest: Known hash of path (skips hashing)
+            allow_link: Fall back to a hardlink when clones are unavailable
+
+        Returns:
+            tuple: (hash, "reflink" | "link"), or (None, None) if nothing is shared
+        """
+        if digest is None:
+            digest = _hash_file(path)
+        blob = self.path_for(digest)
+        if os.path.exists(blob):
+            if os.path.samefile(blob, path):
+                return digest, "link"
+            tmp = path + ".bloblink"
+            if self.reflinks_supported and _reflink(blob, tmp):
+                mode = "reflink"
+            elif allow_link and self._link(blob, tmp):
+                mode = "link"
+            else:
+                self.reflinks_supported = False
+                return None, None
+            os.replace(tmp, path)
+            return digest, mode
+
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        if self.reflinks_supported and _reflink(path, blob):
+            os.chmod(blob, stat.S_IREAD | stat.S_IRGRP | stat.S_IROTH)
+            return digest, "reflink"
+        self.reflinks_supported = False
+        if allow_link and self._link(path, blob):
+            os.chmod(blob, stat.S_IREAD | stat.S_IRGRP | stat.S_IROTH)
+            return digest, "link"
+        return None, None
+
+    def _link(self, src, dst):
+        if not self.links_supported:
+            return False
+        try:
+            os.link(src, dst)
+            return True
+        except OSError as e:
+            # Інша файлова система або FS без hardlink - файл лишається копією
+            print(f"Blob store: hardlinks unavailable ({e}), keeping plain copies")
+            self.links_supported = False
+            return False
+
+    def intern_project(self, project_path, dirs, hardlink_dirs=()):
+        """Intern every file in the given project subdirectories.
+
+        Files whose inode, size and mtime match the manifest are not
+        re-hashed; changed files go through verify_project's checks first.
+
+        Args:
+            project_path: Project directory
+            dirs: Subdirectories to share (copy-on-write clones only)
+            hardlink_dirs: Subset of dirs that may fall back to hardlinks
+
+        Returns:
+            dict: the new manifest (relative path -> entry)
+        """
+        old = self.verify_project(project_path, full=False)
+        manifest = {}
+        for sub in dirs:
+            allow_link = sub in hardlink_dirs
+            for root, _, files in os.walk(os.path.join(project_path, sub)):
+                for f in files:
+                    full = os.path.join(root, f)
+                    if os.path.islink(full) or f.endswith(".bloblink"):
+                        continue
+                    rel = os.path.relpath(full, project_path).replace(os.sep, "/")
+                    entry = old.get(rel)
+                    if entry is not None and (entry["mode"] == "reflink" or allow_link):
+                        manifest[rel] = entry
+                        continue
+                    if entry is not None:
+                        self._detach(full)  # посилання з каталогу, де тепер не можна hardlink
+                    digest, mode = self.intern(full, allow_link=allow_link)
+                    if digest is not None:
+                        manifest[rel] = self._entry(full, digest, mode)
+        self._write_manifest(project_path, manifest)
+        return manifest
+
+    @staticmethod
+    def _entry(path, digest, mode):
+        st = os.stat(path)
+        return {"sha256": digest, "ino": st.st_ino, "size": st.st_size, "mtime": st.st_mtime_ns, "mode": mode}
+
+    @staticmethod
+    def _detach(path):
+        """Replace a hardlinked file by a private copy of its current content."""
+        tmp = path + ".bloblink"
+        shutil.copyfile(path, tmp)
+        os.replace(tmp, path)
+
+    def verify_project(self, project_path, full=True):
+        """Re-hash a project's shared files and drop entries that no longer match.
+
+        A mismatching hardlinked file means the blob itself was written in
+        place: the blob is removed from the store and the file becomes a
+        private copy (other projects linking it are detached when they are
+        verified). A mismatching clone only changed this project's copy.
+
+        Args:
+            project_path: Project directory
+            full: Re-hash every file; False re-hashes only files whose
+                inode, size or mtime differ from the manifest
+
+        Returns:
+            dict: the remaining (still valid) manifest entries
+        """
+        manifest = self.read_manifest(project_path)
+        valid = {}
+        changed = []
+        for rel, entry in manifest.items():
+            full_path = os.path.join(project_path, rel)
+            try:
+                st = os.stat(full_path)
+            except OSError:
+                continue
+            entry.setdefault("mode", "link")
+            same = (st.st_ino, st.st_size, st.st_mtime_ns) == (entry["ino"], entry.get("size"), entry.get("mtime"))
+            if same and not full:
+                valid[rel] = entry
+                continue
+            digest = _hash_file(full_path)
+            if digest == entry["sha256"]:
+                if st.st_ino == entry["ino"]:
+                    valid[rel] = self._entry(full_path, digest, entry["mode"])
+                # Інакше файл замінили копією з тим самим вмістом - intern_project поділить його знову
+                continue
+            changed.append(rel)
+            blob = self.path_for(entry["sha256"])
+            if os.path.exists(blob) and os.path.samefile(blob, full_path):
+                os.chmod(blob, stat.S_IWRITE | stat.S_IREAD)
+                os.remove(blob)
+            if st.st_nlink > 1:
+                self._detach(full_path)
+        if changed:
+            print(f"Blob store: {len(changed)} modified shared file(s) detached in {project_path}")
+        if changed or full:
+            self._write_manifest(project_path, valid)
+        return valid
+
+    @staticmethod
+    def _write_manifest(project_path, manifest):
+        with open(os.path.join(project_path, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+    @staticmethod
+    def read_manifest(project_path):
+        try:
+            with open(os.path.join(project_path, MANIFEST_FILE), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def references(self):
+        """Count manifest entries per hash over every project in the projects root."""
+        counts = {}
+        with os.scandir(self.projects_root) as it:
+            for entry in it:
+                if entry.is_dir() and entry.path != self.root:
+                    for item in self.read_manifest(entry.path).values():
+                        counts[item["sha256"]] = counts.get(item["sha256"], 0) + 1
+        return counts
+
+    def collect_garbage(self, digests=None):
+        """Remove blobs no project references any more.
+
+        A blob is kept while a manifest names it or a hardlink to it exists.
+
+        Args:
+            digests: Only check these hashes (e.g. a deleted project's manifest).
+                Defaults to every blob in the store
+
+        Returns:
+            tuple: (removed blob count, freed bytes)
+        """
+        if digests is None:
+            digests = self.digests()
+        referenced = self.references()
+        removed = freed = 0
+        for digest in set(digests):
+            if digest in referenced:
+                continue
+            blob = self.path_for(digest)
+            try:
+                st = os.stat(blob)
+            except OSError:
+                continue
+            if st.st_nlink <= 1:
+                os.chmod(blob, stat.S_IWRITE | stat.S_IREAD)
+                os.remove(blob)
+                removed += 1
+                freed += st.st_size
+        return removed, freed
+
+    def digests(self):
+        if not os.path.isdir(self.root):
+            return []
+        return [f for sub in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, sub))
+                for f in os.listdir(os.path.join(self.root, sub))]
+
+    def stats(self):
+        """Blob count, stored bytes, project references and bytes saved by sharing."""
+        referenced = self.references()
+        blobs = size = refs = saved = 0
+        for digest in self.digests():
+            st = os.stat(self.path_for(digest))
+            count = referenced.get(digest, 0)
+            blobs += 1
+            size += st.st_size
+            refs += count
+            saved += max(count - 1, 0) * st.st_size
+        return {"blobs": blobs, "bytes": size, "references": refs, "bytes_saved": saved}
@@ -1,5 +1,7 @@
 import math
 
+from .math3d import mat4_mul
+
 class Camera:
     def __init__(self, width=1024, height=768, position=(0, 0), zoom=1.0):
         self.width = width
@@ -14,6 +16,14 @@ class Camera:
         self.fov = 125.0
         self.near = 0.1
         self.far = 100.0
+        # Матриці перераховуються лише коли змінився їхній ключ
+        self._view_key = None
+        self._view = None
+        self._proj_key = None
+        self._proj = None
+        self._view_proj_key = None
+        self._view_proj = None
+        self.version = 0  # збільшується при кожному перерахунку матриць
 
     def set_position(self, x, y):
         self.x = x
@@ -42,20 +52,37 @@ class Camera:
     def get_view_matrix(self):
         # Матриця вигляду (View Matrix)
         # Вона переміщує весь світ у протилежному напрямку від камери
-        x, y, z = self.pos
-        return [
-            1.0, 0.0, 0.0, 0.0,
-            0.0, 1.0, 0.0, 0.0,
-            0.0, 0.0, 1.0, 0.0,
-            -x, -y, -z, 1.0
-        ]
+        key = tuple(self.pos)
+        if key != self._view_key:
+            x, y, z = key
+            self._view = [
+                1.0, 0.0, 0.0, 0.0,
+                0.0, 1.0, 0.0, 0.0,
+                0.0, 0.0, 1.0, 0.0,
+                -x, -y, -z, 1.0
+            ]
+            self._view_key = key
+            self.version += 1
+        return self._view
+
     def get_projection_matrix(self):
         aspect = self.width / self.height if self.height != 0 else 1.0
-        f = 1.0 / math.tan(math.radians(self.fov) / 2.0)
-
-        return [
-            f / aspect, 0.0, 0.0, 0.0,
-            0.0, f, 0.0, 0.0,
-            0.0, 0.0, (self.far + self.near) / (self.near - self.far), -1.0,
-            0.0, 0.0, (2.0 * self.far * self.near) / (self.near - self.far), 0.0
-        ]
\ No newline at end of file
+        key = (aspect, self.fov, self.near, self.far, self.zoom)
+        if key != self._proj_key:
+            f = 1.0 / math.tan(math.radians(self.fov) / 2.0)
+            self._proj = [
+                f / aspect, 0.0, 0.0, 0.0,
+                0.0, f, 0.0, 0.0,
+                0.0, 0.0, (self.far + self.near) / (self.near - self.far), -1.0,
+                0.0, 0.0, (2.0 * self.far * self.near) / (self.near - self.far), 0.0
+            ]
+            self._proj_key = key
+            self.version += 1
+        return self._proj
+
+    def get_view_projection_matrix(self):
+        view, proj = self.get_view_matrix(), self.get_projection_matrix()
+        if self._view_proj_key != self.version:
+            self._view_proj = mat4_mul(proj, view)
+            self._view_proj_key = self.version
+        return self._view_proj
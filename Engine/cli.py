@@ -0,0 +1,332 @@
+"""
+Batch command line interface for project operations
+
+    python main.py create Game1 Game2 Game3 --width 1280 --height 720
+    python main.py list --json
+    python main.py export --all --output backups/ --jobs 4
+    python main.py import a.zip b.zip
+    python main.py compile --all
+    python main.py run Game1 --headless --frames 600
+    python main.py run Game1 --headless --memory
+    python main.py diff old/scene.json new/scene.json
+    python main.py merge base.json ours.json theirs.json -o scene.json
+    python main.py generate big.json --count 1000000 --distribution clustered --seed 7
+
+Operations over several targets are independent and run in a process
+pool (--jobs). With --json a single JSON document is printed to stdout
+and all progress messages go to stderr.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .project_manager import ProjectManager
+
+
+# --- Операції (функції верхнього рівня, щоб їх можна було передати в інший процес) ---
+
+def _op_create(manager, name, opts):
+    data = manager.create_project(name, opts.get("description", ""), opts.get("width", 1024), opts.get("height", 768))
+    return {"name": data["name"], "path": data["path"]}
+
+
+def _op_info(manager, name, opts):
+    return manager.get_project_info(name)
+
+
+def _op_export(manager, name, opts):
+    output = opts.get("output") or os.getcwd()
+    os.makedirs(output, exist_ok=True)
+    path = manager.export_project(name, os.path.join(output, f"{name}.zip"))
+    return {"name": name, "archive": path, "bytes": os.path.getsize(path)}
+
+
+def _op_import(manager, zip_path, opts):
+    data = manager.import_project(zip_path, opts.get("name"))
+    return {"name": data["name"], "path": data["path"]}
+
+
+def _op_compile(manager, name, opts):
+    """Byte-compile the project's scripts and check that its scene loads."""
+    import py_compile
+    from ECS.scene import Scene
+
+    project = manager._load_project_data(os.path.join(manager.base_path, name))
+    errors = []
+    scripts = sorted(manager._get_scripts(project["scripts_path"]))
+    for script in scripts:
+        try:
+            py_compile.compile(os.path.join(project["scripts_path"], script), doraise=True)
+        except py_compile.PyCompileError as e:
+            errors.append(f"{script}: {e.msg.strip()}")
+    objects = 0
+    try:
+        scene = Scene.load(project["scene_path"], project["assets_path"])
+        objects = len(scene.objects)
+        for obj in scene.objects:
+            for path in (obj.component("script") or {}).get("scripts", []):
+                if not os.path.exists(path) and not os.path.exists(os.path.join(project["path"], path)):
+                    errors.append(f"{obj.name}: missing script {path}")
+    except (OSError, ValueError) as e:
+        errors.append(f"scene: {e}")
+    if errors:
+        raise ValueError("; ".join(errors))
+    return {"name": name, "scripts": len(scripts), "objects": objects}
+
+
+def _op_run(manager, name, opts):
+    """Run a project's scene; headless runs a fixed number of frames without a window."""
+    project = manager.load_project(name)
+    if not opts.get("headless"):
+        import main as app
+        app.run_project(project)
+        return {"name": name}
+
+    from ECS.scene import Scene
+    from Engine.headless import HeadlessEngine
+    from Engine.memory import memory_tracker
+
+    if opts.get("memory"):
+        memory_tracker.enable()
+    engine = HeadlessEngine(project["settings"].get("width", 1024), project["settings"].get("height", 768))
+    with memory_tracker.snapshot("scene.load"):
+        scene = Scene.load(project["scene_path"], project["assets_path"])
+    start = time.perf_counter()
+    with memory_tracker.snapshot("scene.spawn"):
+        scene.spawn(engine)
+    spawn_time = time.perf_counter() - start
+    frames = opts.get("frames", 60)
+    start = time.perf_counter()
+    for _ in range(frames):
+        with memory_tracker.phase("begin"):
+            engine.begin()
+        with memory_tracker.phase("scene.update"):
+            scene.update(engine, engine.dt, engine.profiler)
+        with memory_tracker.phase("end"):
+            engine.end()
+        memory_tracker.end_frame()
+    elapsed = time.perf_counter() - start
+    result = {"name": name, "objects": len(scene.objects), "renderables": len(engine.renderables),
+              "frames": frames, "spawn_ms": spawn_time * 1000.0,
+              "frame_ms": elapsed * 1000.0 / frames if frames else 0.0}
+    if memory_tracker.enabled:
+        result["memory_report"] = memory_tracker.dump(os.path.join(project["path"], "memory_report.json"))
+        result["heap_peak_bytes"] = memory_tracker.report()["traced_peak_bytes"]
+    return result
+
+
+OPERATIONS = {
+    "create": _op_create,
+    "info": _op_info,
+    "export": _op_export,
+    "import": _op_import,
+    "compile": _op_compile,
+    "run": _op_run,
+}
+
+
+def execute(operation, base_path, target, opts, quiet=False):
+    """Run one operation on one target; never raises.
+
+    Returns:
+        dict: {"target", "ok", "result"} or {"target", "ok", "error"}
+    """
+    stream = sys.stderr if quiet else sys.stdout
+    try:
+        with contextlib.redirect_stdout(stream):
+            result = OPERATIONS[operation](ProjectManager(base_path), target, opts)
+        return {"target": target, "ok": True, "result": result}
+    except Exception as e:
+        return {"target": target, "ok": False, "error": f"{type(e).__name__}: {e}"}
+
+
+def run_batch(operation, targets, base_path=None, jobs=None, opts=None, quiet=False):
+    """Run operation for every target, in parallel processes when jobs > 1.
+
+    Returns:
+        list: one execute() result per target, in target order
+    """
+    opts = opts or {}
+    jobs = min(jobs or os.cpu_count() or 1, len(targets))
+    # Вікно і run без --headless працюють лише в головному процесі
+    if jobs <= 1 or (operation == "run" and not opts.get("headless")):
+        return [execute(operation, base_path, t, opts, quiet) for t in targets]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(execute, operation, base_path, t, opts, quiet) for t in targets]
+        return [f.result() for f in futures]
+
+
+def build_parser():
+    # Спільні опції можна вказувати як до, так і після підкоманди
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--projects", default=argparse.SUPPRESS, help="projects root (defaults to ./projects)")
+    common.add_argument("--json", action="store_true", default=argparse.SUPPRESS, help="print machine-readable output")
+    common.add_argument("--jobs", "-j", type=int, default=argparse.SUPPRESS, help="parallel worker processes")
+
+    parser = argparse.ArgumentParser(prog="pof-engine", description="POF Engine project tools", parents=[common])
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub_parser = sub.add_parser
+
+    def add_parser(name, **kwargs):
+        return sub_parser(name, parents=[common], **kwargs)
+    sub.add_parser = add_parser
+
+    p = sub.add_parser("create", help="create projects")
+    p.add_argument("names", nargs="+")
+    p.add_argument("--description", default="")
+    p.add_argument("--width", type=int, default=1024)
+    p.add_argument("--height", type=int, default=768)
+
+    sub.add_parser("list", help="list projects with counts")
+
+    for command, help_text in (("info", "show project details"), ("export", "export projects as ZIP"),
+                               ("compile", "check scripts and scenes")):
+        p = sub.add_parser(command, help=help_text)
+        p.add_argument("names", nargs="*")
+        p.add_argument("--all", action="store_true", help="every project in the projects root")
+        if command == "export":
+            p.add_argument("--output", "-o", default=None, help="directory for the archives")
+
+    p = sub.add_parser("import", help="import projects from ZIP archives")
+    p.add_argument("names", nargs="+", metavar="archive")
+    p.add_argument("--name", default=None, help="project name (single archive only)")
+
+    p = sub.add_parser("run", help="run projects")
+    p.add_argument("names", nargs="+")
+    p.add_argument("--headless", action="store_true", help="no window; run --frames frames and report timings")
+    p.add_argument("--frames", type=int, default=60)
+    p.add_argument("--memory", action="store_true",
+                   help="headless: trace Python allocations, write memory_report.json to the project")
+
+    p = sub.add_parser("diff", help="structural diff of two scene files")
+    p.add_argument("old")
+    p.add_argument("new")
+
+    p = sub.add_parser("merge", help="three-way merge of scene files")
+    p.add_argument("base")
+    p.add_argument("ours")
+    p.add_argument("theirs")
+    p.add_argument("--output", "-o", default=None, help="merged scene file (defaults to ours)")
+    p.add_argument("--prefer", choices=("ours", "theirs"), default="ours", help="side kept on conflicts")
+
+    p = sub.add_parser("generate", help="write a synthetic scene for scale testing")
+    p.add_argument("output", help="scene file to write")
+    p.add_argument("--count", type=int, default=10000)
+    p.add_argument("--name", default="Generated")
+    p.add_argument("--shapes", default="all", help='shape weights, e.g. "rectangle=3,circle=1"')
+    p.add_argument("--colliders", type=float, default=0.25, help="fraction of objects with a collider")
+    p.add_argument("--scripts", type=float, default=0.0, help="fraction of objects with a script")
+    p.add_argument("--script-path", action="append", default=[], help="script to assign (repeatable)")
+    p.add_argument("--rotation", type=float, default=0.1, help="fraction of objects with rotation")
+    p.add_argument("--distribution", choices=("uniform", "clustered", "grid"), default="uniform")
+    p.add_argument("--extent", type=float, default=50.0, help="half size of the populated area")
+    p.add_argument("--clusters", type=int, default=8)
+    p.add_argument("--cluster-spread", type=float, default=2.0)
+    p.add_argument("--seed", type=int, default=0)
+    return parser
+
+
+def _generate_command(args):
+    from ECS import scene_generator
+
+    start = time.perf_counter()
+    try:
+        stats = scene_generator.generate_scene(
+            args.output, args.count, name=args.name, shape_mix=scene_generator.parse_shape_mix(args.shapes),
+            collider_ratio=args.colliders, script_ratio=args.scripts, rotation_ratio=args.rotation,
+            script_paths=args.script_path, distribution=args.distribution, extent=args.extent,
+            clusters=args.clusters, cluster_spread=args.cluster_spread, seed=args.seed)
+    except ValueError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return 2
+    stats.update(output=args.output, bytes=os.path.getsize(args.output), elapsed_s=time.perf_counter() - start)
+    if args.json:
+        print(json.dumps(stats, indent=2))
+    else:
+        print(f"✓ {stats['objects']} objects written to {args.output} in {stats['elapsed_s']:.2f}s "
+              f"(colliders {stats['collider']}, scripts {stats['script']}, rotation {stats['rotation']})")
+    return 0
+
+
+def _scene_command(args):
+    """diff/merge work on scene files rather than projects."""
+    from ECS import scene_diff
+
+    if args.command == "diff":
+        diff = scene_diff.diff_scenes(scene_diff.load_scene_data(args.old), scene_diff.load_scene_data(args.new))
+        if args.json:
+            print(json.dumps(diff, indent=2))
+        else:
+            for line in scene_diff.summarize(diff):
+                print(line)
+            print(f"{len(diff['added'])} added, {len(diff['removed'])} removed, {len(diff['changed'])} changed")
+        return 0
+
+    merged, conflicts = scene_diff.merge_scenes(scene_diff.load_scene_data(args.base),
+                                                scene_diff.load_scene_data(args.ours),
+                                                scene_diff.load_scene_data(args.theirs), args.prefer)
+    output = args.output or args.ours
+    scene_diff.save_scene_data(merged, output)
+    if args.json:
+        print(json.dumps({"output": output, "objects": len(merged["objects"]), "conflicts": conflicts}, indent=2))
+    else:
+        for c in conflicts:
+            print(f"✗ conflict {c['id']}.{c['path']}: ours={c['ours']!r} theirs={c['theirs']!r}")
+        print(f"✓ Merged {len(merged['objects'])} objects into {output} ({len(conflicts)} conflicts, kept {args.prefer})")
+    return 1 if conflicts else 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    for name, default in (("projects", None), ("json", False), ("jobs", None)):
+        if not hasattr(args, name):
+            setattr(args, name, default)
+    if args.command in ("diff", "merge"):
+        return _scene_command(args)
+    if args.command == "generate":
+        return _generate_command(args)
+    manager = ProjectManager(args.projects)
+
+    if args.command == "list":
+        manager.list_projects()
+        projects = [manager.catalog.info(name) for name in manager.catalog.names()]
+        if args.json:
+            print(json.dumps(projects, indent=2))
+        else:
+            for info in projects:
+                print(f"{info['name']:<30} scripts {info['script_count']:>4}  assets {info['asset_count']:>5}  "
+                      f"{info['description']}")
+        return 0
+
+    targets = args.names
+    if getattr(args, "all", False):
+        targets = manager.list_projects()
+    if not targets:
+        print("✗ No targets given", file=sys.stderr)
+        return 2
+    opts = {k: v for k, v in vars(args).items() if k not in ("names", "all", "command", "projects", "json", "jobs")}
+    if args.command == "import" and opts.get("name") and len(targets) > 1:
+        print("✗ --name can only be used with a single archive", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    results = run_batch(args.command, targets, manager.base_path, args.jobs, opts, quiet=args.json)
+    failed = [r for r in results if not r["ok"]]
+
+    if args.json:
+        print(json.dumps({"command": args.command, "elapsed_s": time.perf_counter() - start,
+                          "failed": len(failed), "results": results}, indent=2))
+    else:
+        for r in results:
+            if not r["ok"]:
+                print(f"✗ {r['target']}: {r['error']}")
+            elif args.command in ("info", "run", "compile"):
+                print(f"✓ {r['target']}: " + ", ".join(f"{k}={v}" for k, v in r["result"].items()
+                                                       if k not in ("name", "settings")))
+        print(f"{len(results) - len(failed)}/{len(results)} succeeded in {time.perf_counter() - start:.2f}s")
+    return 1 if failed else 0
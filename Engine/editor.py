@@ -2,26 +2,38 @@ import imgui
 from imgui.integrations.glfw import GlfwRenderer
 import os
 import glfw
+from Engine.hierarchy import ROW_GROUP, HierarchyIndex
+from Engine.memory import gl_memory, memory_tracker
+from Engine.picking import ScenePicker
 from ECS.scene import (
     SHAPE_TYPES,
     SceneObject,
     default_collider_component,
+    default_particles_component,
     default_render_component,
     default_script_component,
     default_sprite_component,
+    default_tilemap_component,
     default_shape_data,
     default_transform_component,
 )
 
 
 class Editor:
-    def __init__(self, engine, scene, scene_path):
+    def __init__(self, engine, scene, scene_path, scenes=None, scene_paths=()):
         self.engine = engine
         self.scene = scene
         self.scene_path = scene_path
+        self.scenes = scenes  # SceneManager, якщо в проекті кілька сцен
+        self.scene_paths = list(scene_paths)
         self.selected_id = None
         self.is_playing = False
+        self.tile_brush = [0, 0, 1]  # x, y, індекс тайла
+        self.prefab_name_buffer = ""
         self.scene_name_buffer = scene.name
+        self.show_profiler = False
+        self.picker = ScenePicker(scene)
+        self.hierarchy = HierarchyIndex(scene)
         imgui.create_context()
         self._apply_style()
         self.impl = GlfwRenderer(self.engine.window)
@@ -30,6 +42,15 @@ class Editor:
     def shutdown(self):
         self.impl.shutdown()
 
+    def set_scene(self, scene):
+        """Edit another scene (SceneManager on_switch callback)."""
+        self.scene = scene
+        self.scene_path = scene.path
+        self.scene_name_buffer = scene.name
+        self.selected_id = None
+        self.picker = ScenePicker(scene)
+        self.hierarchy = HierarchyIndex(scene)
+
     def begin_frame(self):
         self.impl.process_inputs()
         imgui.new_frame()
@@ -54,12 +75,72 @@ class Editor:
         self._draw_scenes_panel(260, 80)
         self._draw_hierarchy(260, h - 80)
         self._draw_inspector(w - 320, 320, h)
+        if self.show_profiler:
+            self._draw_profiler(260, w - 580)
+        self._handle_viewport_click(w, h)
+
+    def _handle_viewport_click(self, width, height):
+        # Клік поза вікнами imgui вибирає об'єкт у в'юпорті
+        io = imgui.get_io()
+        if io.want_capture_mouse or not imgui.is_mouse_clicked(0):
+            return
+        if self.is_playing:
+            self.picker.mark_moved()  # скрипти могли зсунути об'єкти - підганяємо рамки, без перебудови
+        mx, my = io.mouse_pos
+        obj = self.picker.pick(self.engine.camera, mx, my, width, height)
+        self.selected_id = obj.id if obj else None
 
     def _draw_scenes_panel(self, width, height):
         imgui.set_next_window_position(0, 0)
         imgui.set_next_window_size(width, height)
         imgui.begin("Scenes", flags=imgui.WINDOW_NO_MOVE | imgui.WINDOW_NO_RESIZE | imgui.WINDOW_NO_COLLAPSE)
         if imgui.button("Save Scene"): self._save_scene()
+        imgui.same_line()
+        if imgui.button("Profiler"): self.show_profiler = not self.show_profiler
+        if self.scenes is not None and len(self.scene_paths) > 1:
+            self._draw_scene_switcher()
+        imgui.end()
+
+    def _draw_scene_switcher(self):
+        if self.scenes.pending():
+            imgui.text_disabled("Loading scene...")
+            return
+        names = [os.path.splitext(os.path.basename(p))[0] for p in self.scene_paths]
+        keys = [self.scenes.resolve(p) for p in self.scene_paths]
+        current = keys.index(self.scene_path) if self.scene_path in keys else 0
+        changed, index = imgui.combo("Scene", current, names)
+        if changed and index != current and not self.is_playing:
+            self._save_scene()
+            self.scenes.switch(self.scene_paths[index])
+
+    def _draw_profiler(self, x, width):
+        imgui.set_next_window_position(x, 0, imgui.FIRST_USE_EVER)
+        imgui.set_next_window_size(min(width, 420), 360, imgui.FIRST_USE_EVER)
+        _, self.show_profiler = imgui.begin("Profiler", closable=True)
+        for name, value in sorted(self.engine.profiler.last_frame.items()):
+            imgui.text(f"{name}: {value:.2f}" if isinstance(value, float) else f"{name}: {value}")
+
+        imgui.separator()
+        imgui.text(f"GPU memory: {gl_memory.total() / 1024:.1f} KB")
+        for category, nbytes in sorted(gl_memory.bytes.items()):
+            imgui.text(f"  {category}: {nbytes / 1024:.1f} KB ({gl_memory.objects[category]})")
+
+        imgui.separator()
+        if not memory_tracker.enabled:
+            imgui.text_disabled("Python heap tracking off")
+            if imgui.button("Enable tracemalloc"): memory_tracker.enable()
+        else:
+            for name, entry in memory_tracker.phases.items():
+                imgui.text(f"{name}: peak {entry['peak_bytes'] / 1024:.1f} KB, net {entry['net_bytes'] / 1024:+.1f} KB, "
+                           f"{entry['net_blocks']:+d} blocks, {entry['ms']:.2f} ms")
+            for name, entry in memory_tracker.snapshots.items():
+                imgui.text(f"[{name}] peak {entry['peak_bytes'] / 1024:.1f} KB, net {entry['net_bytes'] / 1024:+.1f} KB "
+                           f"in {entry['ms']:.0f} ms")
+            if imgui.button("Dump JSON"):
+                # Корінь проекту, а не scenes/ - там кожен *.json вважається сценою
+                root = self.scenes.root if self.scenes is not None else os.path.dirname(self.scene_path)
+                path = memory_tracker.dump(os.path.join(root, "memory_report.json"))
+                print(f"✓ Memory report written to {path}")
         imgui.end()
 
     def _draw_hierarchy(self, width, height):
@@ -72,6 +153,9 @@ class Editor:
             if imgui.button("Add 2D"): imgui.open_popup("a2d")
             imgui.same_line()
             if imgui.button("Add 3D"): imgui.open_popup("a3d")
+            if self.scene.prefabs is not None:
+                imgui.same_line()
+                if imgui.button("Add Prefab"): imgui.open_popup("aprefab")
 
             if imgui.begin_popup("a2d"):
                 for t in SHAPE_TYPES:
@@ -80,15 +164,50 @@ class Editor:
             if imgui.begin_popup("a3d"):
                 if imgui.menu_item("Cube")[0]: self._add_3d_object("cube")
                 imgui.end_popup()
+            if imgui.begin_popup("aprefab"):
+                names = self.scene.prefabs.names()
+                if not names: imgui.text_disabled("No *.prefab.json in assets")
+                for name in names:
+                    if imgui.menu_item(name)[0]: self._add_prefab_instance(name)
+                imgui.end_popup()
         else:
             if imgui.button("Stop"): self._set_playing(False)
 
         imgui.separator()
-        for obj in self.scene.objects:
-            if imgui.selectable(f"{obj.name}##{obj.id}", obj.id == self.selected_id)[0]:
-                self.selected_id = obj.id
+        changed, text = imgui.input_text("Search", self.hierarchy.filter_text, 128)
+        if changed: self.hierarchy.set_filter(text)
+
+        imgui.begin_child("hierarchy_rows", 0, 0)
+        self._draw_hierarchy_rows()
+        imgui.end_child()
         imgui.end()
 
+    def _draw_hierarchy_rows(self):
+        # Будуємо лише видимі рядки; решту списку заміняє відступ курсора
+        rows = self.hierarchy.get_rows()
+        row_h = imgui.get_text_line_height_with_spacing()
+        top = imgui.get_cursor_pos_y()
+        first = max(0, int(imgui.get_scroll_y() // row_h))
+        last = min(len(rows), first + int(imgui.get_window_height() // row_h) + 2)
+
+        labels, ids = self.hierarchy.labels, self.hierarchy.ids
+        imgui.set_cursor_pos_y(top + first * row_h)
+        for row in rows[first:last]:
+            if row[0] == ROW_GROUP:
+                _, group, count = row
+                mark = "+" if group in self.hierarchy.folded else "-"
+                if imgui.selectable(f"[{mark}] {group} ({count})##group_{group}")[0]:
+                    self.hierarchy.toggle_group(group)
+            else:
+                i = row[1]
+                imgui.indent()
+                if imgui.selectable(labels[i], ids[i] == self.selected_id)[0]:
+                    self.selected_id = ids[i]
+                imgui.unindent()
+
+        imgui.set_cursor_pos_y(top + len(rows) * row_h)
+        imgui.dummy(0, 0)
+
     def _draw_inspector(self, x_pos, width, height):
         imgui.set_next_window_position(x_pos, 0)
         imgui.set_next_window_size(width, height)
@@ -103,11 +222,12 @@ class Editor:
         if imgui.button("Add Component"): imgui.open_popup("add_c")
         if imgui.begin_popup("add_c"):
             # Додав "script" та "collider" у список
-            for c in ["transform", "render", "rotation", "collider", "script"]:
+            for c in ["transform", "render", "rotation", "collider", "script", "particles", "tilemap"]:
                 if c not in obj.components and imgui.menu_item(c.title())[0]:
                     self._add_comp(obj, c)
             imgui.end_popup()
 
+        self._draw_prefab_controls(obj)
         imgui.separator()
 
         # Відображення компонентів
@@ -116,6 +236,8 @@ class Editor:
         self._draw_render(obj)
         self._draw_collider_comp(obj)  # Відображення колайдера
         self._draw_script_comp(obj)  # ВІДОБРАЖЕННЯ СКРИПТІВ
+        self._draw_particles_comp(obj)
+        self._draw_tilemap_comp(obj)
 
         imgui.spacing()
         if imgui.button("Delete Object"): self._delete_object(obj)
@@ -132,8 +254,21 @@ class Editor:
             obj.components[name] = default_collider_component()
         elif name == "script":
             obj.components[name] = default_script_component()
+        elif name == "particles":
+            obj.components[name] = default_particles_component()
+        elif name == "tilemap":
+            obj.components[name] = default_tilemap_component()
 
         obj.apply_components()
+        self.scene.track(obj)
+        self.engine.rotation_system.mark_dirty()
+        self.engine.particle_system.mark_dirty()
+        if name == "render":
+            # Новий об'єкт для пікінгу; група в ієрархії теж залежить від render
+            self.picker.invalidate()
+            self.hierarchy.invalidate()
+        else:
+            self.picker.mark_moved(obj)
         self._save_scene()
 
     def _draw_script_comp(self, obj):
@@ -195,7 +330,84 @@ class Editor:
             c, v = imgui.drag_float(f"{axis.replace('_', ' ').title()}", rot.get(axis, 0.0), 0.05)
             if c: rot[axis] = v; changed = True
 
-        if changed: self._save_scene()
+        if changed:
+            obj.apply_components()
+            self.scene.track(obj)
+            self.engine.rotation_system.mark_dirty()
+            self._save_scene()
+
+    def _draw_particles_comp(self, obj):
+        p = obj.components.get("particles")
+        if not p or not imgui.collapsing_header("Particle Emitter", imgui.TREE_NODE_DEFAULT_OPEN)[0]: return
+
+        changed = False
+        c, v = imgui.checkbox("Emitting", p.get("enabled", True))
+        if c: p["enabled"] = v; changed = True
+
+        for key, label, speed in [("rate", "Rate", 1.0), ("lifetime", "Lifetime", 0.05), ("speed", "Speed", 0.05),
+                                  ("spread", "Spread", 0.01), ("gravity", "Gravity", 0.05),
+                                  ("start_size", "Start Size", 0.01), ("end_size", "End Size", 0.01)]:
+            c, v = imgui.drag_float(f"{label}##particles", float(p.get(key, 0.0)), speed)
+            if c: p[key] = max(0.0, v) if key != "gravity" else v; changed = True
+
+        c, v = imgui.drag_float3("Direction##particles", *p.get("direction", [0.0, 1.0, 0.0]), 0.05)
+        if c: p["direction"] = list(v); changed = True
+
+        c, v = imgui.drag_int("Max Particles##particles", int(p.get("max_particles", 1000)), 10, 1, 1000000)
+        if c: p["max_particles"] = max(1, v); changed = True
+
+        c, v = imgui.color_edit4("Start Color##particles", *p.get("start_color", [1, 1, 1, 1]))
+        if c: p["start_color"] = list(v); changed = True
+
+        c, v = imgui.color_edit4("End Color##particles", *p.get("end_color", [1, 1, 1, 0]))
+        if c: p["end_color"] = list(v); changed = True
+
+        if obj.render and obj.render.particles is not None:
+            imgui.text(f"Live: {obj.render.particles.count}")
+
+        if changed:
+            obj.apply_components()
+            self.scene.track(obj)
+            self.engine.particle_system.mark_dirty()
+            self._save_scene()
+
+    def _draw_tilemap_comp(self, obj):
+        tm = obj.components.get("tilemap")
+        if not tm or not imgui.collapsing_header("Tilemap", imgui.TREE_NODE_DEFAULT_OPEN)[0]: return
+
+        changed = False
+        c, v = imgui.drag_int2("Size##tilemap", int(tm.get("width", 32)), int(tm.get("height", 32)), 1, 1, 4096)
+        if c: tm["width"], tm["height"] = max(1, v[0]), max(1, v[1]); changed = True
+
+        c, v = imgui.drag_float("Tile Size##tilemap", float(tm.get("tile_size", 1.0)), 0.01, 0.01, 100.0)
+        if c: tm["tile_size"] = v; changed = True
+
+        tileset = tm.setdefault("tileset", [])
+        for i, path in enumerate(tileset):
+            c, v = imgui.input_text(f"Tile {i + 1}##tileset_{obj.id}_{i}", path, 256)
+            if c: tileset[i] = v; changed = True
+        if imgui.button("Add Tile Image"):
+            tileset.append("")
+            changed = True
+
+        if changed:
+            obj.apply_components()
+            self.scene.track(obj)
+            self._save_scene()
+
+        tilemap = obj.render.tilemap if obj.render else None
+        if tilemap is None: return
+        imgui.separator()
+        _, self.tile_brush = imgui.drag_int3("Brush X/Y/Tile##tilemap", *self.tile_brush, 0.2, 0, 65535)
+        x, y, tile = self.tile_brush
+        if imgui.button("Paint##tilemap") and x < tilemap.width and y < tilemap.height:
+            tilemap.set_tile(x, y, tile)
+            self._save_scene()
+        imgui.same_line()
+        if imgui.button("Clear Map##tilemap"):
+            tilemap.fill_rect(0, 0, tilemap.width, tilemap.height, 0)
+            self._save_scene()
+        imgui.text(f"Chunks: {tilemap.chunks_x * tilemap.chunks_y}  Colliders: {len(tilemap.collision_rects())}")
 
     def _draw_transform(self, obj):
         t = obj.components.get("transform")
@@ -208,13 +420,13 @@ class Editor:
         c, v = imgui.drag_float("Scale", float(t.get("scale", 1.0)), 0.05)
         if c: t["scale"] = v; changed = True
 
-        if changed: obj.apply_components(); self._save_scene()
+        if changed: obj.apply_components(); self.scene.track(obj); self.picker.mark_moved(obj); self._save_scene()
 
     def _draw_render(self, obj):
         r = obj.components.get("render")
         if not r or not imgui.collapsing_header("Render")[0]: return
         c, nc = imgui.color_edit4("Color", *r.get("color", [1, 1, 1, 1]))
-        if c: r["color"] = list(nc); self._save_scene()
+        if c: r["color"] = list(nc); obj.apply_components(); self.scene.track(obj); self._save_scene()
 
     def _add_3d_object(self, shape_type):
         obj_id = f"3d_{shape_type}_{len(self.scene.objects)}"
@@ -226,24 +438,55 @@ class Editor:
         }
         obj = SceneObject(obj_id, "New 3D Object", components)
         r = obj.create_render()
-        if r: self.engine.add_render(r)
+        if r: self.engine.add_render(r); self.scene.track(obj)
         self.scene.objects.append(obj)
         self.selected_id = obj.id
         self._save_scene()
 
+    def _draw_prefab_controls(self, obj):
+        if self.scene.prefabs is None: return
+        if obj.prefab_name is not None:
+            imgui.text(f"Prefab: {obj.prefab_name}")
+            imgui.same_line()
+            if imgui.button("Unpack"):
+                obj.components = obj.components  # повна копія замість посилання на шаблон
+                obj.prefab, obj.prefab_name, obj.overrides = None, None, {}
+                self._save_scene()
+            return
+        _, self.prefab_name_buffer = imgui.input_text("##prefab_name", self.prefab_name_buffer or obj.name, 128)
+        imgui.same_line()
+        if imgui.button("Save as Prefab") and self.prefab_name_buffer.strip():
+            # Трансформ лишається у кожного екземпляра окремо
+            template = {k: v for k, v in obj.components.items() if k != "transform"}
+            prefab = self.scene.prefabs.save(self.prefab_name_buffer.strip(), template)
+            obj.prefab, obj.prefab_name, obj.overrides = prefab, prefab.name, {}
+            self.prefab_name_buffer = ""
+            self._save_scene()
+
+    def _add_prefab_instance(self, prefab_name):
+        obj = self.scene.instantiate(prefab_name)
+        r = obj.create_render()
+        if r: self.engine.add_render(r); self.scene.track(obj)
+        self.selected_id = obj.id
+        self.picker.invalidate()
+        self._save_scene()
+
     def _add_object(self, shape_type):
         obj_id = f"{shape_type}_{len(self.scene.objects)}"
         components = {"transform": default_transform_component(), "render": default_render_component(shape_type)}
         obj = SceneObject(obj_id, shape_type.title(), components)
         r = obj.create_render()
-        if r: self.engine.add_render(r)
+        if r: self.engine.add_render(r); self.scene.track(obj)
         self.scene.objects.append(obj)
         self.selected_id = obj.id
         self._save_scene()
 
     def _delete_object(self, obj):
         if obj.render: self.engine.remove_render(obj.render)
+        self.scene.untrack(obj)
         self.scene.objects = [o for o in self.scene.objects if o.id != obj.id]
+        self.picker.invalidate()
+        self.hierarchy.invalidate()
         self.selected_id = None
         self._save_scene()
 
@@ -251,4 +494,13 @@ class Editor:
         if not self.is_playing: self.scene.save(self.scene_path)
 
     def _set_playing(self, playing):
-        self.is_playing = playing
\ No newline at end of file
+        self.is_playing = playing
+        self.picker.mark_moved()
+        if playing:
+            self.scene.begin_play()
+        else:
+            # Створене скриптами прибираємо, знищене і змінене командами - відновлюємо
+            self.scene.end_play(self.engine)
+            self.hierarchy.invalidate()
+            if self.selected_id is not None and self.scene.find_by_id(self.selected_id) is None:
+                self.selected_id = None
\ No newline at end of file
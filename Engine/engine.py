@@ -1,30 +1,36 @@
 import glfw
 from OpenGL.GL import *
 import ctypes
+from .assets import AssetManager
 from .camera import Camera
+from .profiler import Profiler
+from .render_queue import RenderQueue
+from ECS.particles import ParticleSystem
+from ECS.rotation import RotationSystem
+from .particle_renderer import PARTICLE_FRAGMENT_SRC, PARTICLE_VERTEX_SRC, ParticleRenderer
+from .tilemap_renderer import TILEMAP_FRAGMENT_SRC, TILEMAP_VERTEX_SRC, TilemapRenderer
+from .sprite_batch import SPRITE_FRAGMENT_SRC, SPRITE_VERTEX_SRC, SpriteBatch
+from .uniform_buffer import FRAME_BLOCK_GLSL, FrameUniforms
+from .memory import gl_memory
+from ECS.atlas import build_atlas
 
+# Текстуровані об'єкти малює SpriteBatch, тож цей шейдер без гілок
 VERTEX_SRC = """
 #version 330 core
+""" + FRAME_BLOCK_GLSL + """
 layout (location = 0) in vec3 aPos;
-layout (location = 1) in vec2 aTexCoord;
-uniform mat4 uModel; uniform mat4 uView; uniform mat4 uProj;
-out vec2 TexCoord;
+uniform mat4 uModel;
 void main() {
-    gl_Position = uProj * uView * uModel * vec4(aPos, 1.0);
-    TexCoord = aTexCoord;
+    gl_Position = uViewProj * uModel * vec4(aPos, 1.0);
 }
 """
 
 FRAGMENT_SRC = """
 #version 330 core
-in vec2 TexCoord;
 out vec4 FragColor;
 uniform vec4 uColor;
-uniform sampler2D uTexture;
-uniform bool uUseTexture;
 void main() {
-    if (uUseTexture) FragColor = texture(uTexture, TexCoord) * uColor;
-    else FragColor = uColor;
+    FragColor = uColor;
 }
 """
 
@@ -46,8 +52,28 @@ class Engine:
         glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
 
         self.program = self._create_prog(VERTEX_SRC, FRAGMENT_SRC)
+        self._uniforms = {n: glGetUniformLocation(self.program, n) for n in ("uModel", "uColor")}
+        self.render_queue = RenderQueue()
+        self.sprite_batch = SpriteBatch(self._create_prog(SPRITE_VERTEX_SRC, SPRITE_FRAGMENT_SRC))
+        # Камера і час - один UBO на всі програми
+        self.frame_uniforms = FrameUniforms()
+        self.frame_uniforms.attach(self.program)
+        self.frame_uniforms.attach(self.sprite_batch.program)
+        self.particle_renderer = ParticleRenderer(self._create_prog(PARTICLE_VERTEX_SRC, PARTICLE_FRAGMENT_SRC))
+        self.frame_uniforms.attach(self.particle_renderer.program)
+        self.tilemap_renderer = TilemapRenderer(self._create_prog(TILEMAP_VERTEX_SRC, TILEMAP_FRAGMENT_SRC), self)
+        self.frame_uniforms.attach(self.tilemap_renderer.program)
         self.camera = Camera(width, height)
         self.renderables = []
+        self._render_index = {}  # id(render) -> позиція в renderables
+        self._meshes = {}  # id(vertex_data) -> [vertex_data, gpu, кількість рендерів]
+        self.rotation_system = RotationSystem()
+        self.particle_system = ParticleSystem()
+        self.profiler = Profiler()
+        self.dt = 0.0
+        self.assets = AssetManager()
+        self.atlas = None
+        self.atlas_pages = []
         self.last_time = glfw.get_time()
 
         # Реєструємо функцію зміни розміру
@@ -77,12 +103,19 @@ class Engine:
         return p
 
     def _upload_render(self, r):
+        # Рендери зі спільними vertex_data (екземпляри префаба) ділять один VAO
+        entry = self._meshes.get(id(r.vertex_data))
+        if entry is not None and entry[0] is r.vertex_data:
+            entry[2] += 1
+            r._gpu = entry[1]
+            return 0
         vao = glGenVertexArrays(1);
         vbo = glGenBuffers(1)
         glBindVertexArray(vao);
         glBindBuffer(GL_ARRAY_BUFFER, vbo)
         verts = (ctypes.c_float * len(r.vertex_data))(*r.vertex_data)
         glBufferData(GL_ARRAY_BUFFER, ctypes.sizeof(verts), verts, GL_STATIC_DRAW)
+        gl_memory.allocate("mesh", vbo, ctypes.sizeof(verts))
         glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 3 * 4, ctypes.c_void_p(0))
         glEnableVertexAttribArray(0)
 
@@ -93,55 +126,173 @@ class Engine:
             inds = (ctypes.c_uint * len(r.indices))(*r.indices)
             glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
             glBufferData(GL_ELEMENT_ARRAY_BUFFER, ctypes.sizeof(inds), inds, GL_STATIC_DRAW)
+            gl_memory.allocate("mesh", ebo, ctypes.sizeof(inds))
             count = len(r.indices)
         r._gpu = (vao, vbo, ebo, count)
+        self._meshes[id(r.vertex_data)] = [r.vertex_data, r._gpu, 1]
+        return ctypes.sizeof(verts) + (ctypes.sizeof(inds) if ebo else 0)
+
+    def load_atlas(self, assets_path):
+        """Pack the project's assets into atlas pages and queue their upload."""
+        self.atlas = build_atlas(assets_path)
+        self.atlas_pages = [self.assets.acquire(page["path"]) for page in self.atlas.pages] if self.atlas else []
+        return self.atlas
+
+    def _resolve_sprite(self, sprite):
+        if sprite.handle is not None:
+            return
+        region = self.atlas.find(sprite.image_path) if self.atlas_pages else None
+        if region:
+            # Власне посилання на сторінку: _release_render одного спрайта не видаляє її для інших
+            page = self.atlas.pages[region["page"]]
+            sprite.set_region(self.assets.acquire(page["path"]), region, region["page"])
+        elif not sprite.loaded and sprite.image_path:
+            # Зображення поза атласом - окрема текстура, декодується у фоні
+            sprite.set_handle(self.assets.acquire(sprite.image_path))
+
+    def prepare_render(self, render):
+        """Create a render's GPU data (or queue its texture) without drawing it yet.
+
+        Returns:
+            int: Bytes uploaded to GL buffers (0 for shared meshes and sprites)
+        """
+        if render.sprite is not None:
+            self._resolve_sprite(render.sprite)
+            return 0
+        return self._upload_render(render)
 
     def add_render(self, render):
-        self._upload_render(render)
+        self.prepare_render(render)
+        self.attach_render(render)
+
+    def attach_render(self, render):
+        """Start drawing a render whose GPU data already exists (e.g. from a pool)."""
+        self._render_index[id(render)] = len(self.renderables)
         self.renderables.append(render)
+        self.rotation_system.add(render)
+        self.particle_system.add(render)
+
+    def set_renders(self, renders):
+        """Replace the whole draw list at once (scene switch); GPU data is not touched."""
+        self.renderables = list(renders)
+        self._render_index = {id(r): i for i, r in enumerate(self.renderables)}
+        self.rotation_system.rebuild(self.renderables)
+        self.particle_system.rebuild(self.renderables)
+
+    def detach_render(self, render):
+        """Stop drawing a render but keep its GPU data. O(1): the last render takes its slot."""
+        index = self._render_index.pop(id(render), None)
+        if index is None: return False
+        last = self.renderables.pop()
+        if last is not render:
+            self.renderables[index] = last
+            self._render_index[id(last)] = index
+        self.rotation_system.remove(render)
+        self.particle_system.remove(render)
+        return True
+
+    def remove_render(self, render):
+        if self.detach_render(render):
+            self._release_render(render)
+
+    def release_render(self, render):
+        """Free the GPU data of a render that is no longer attached."""
+        self._release_render(render)
+
+    def _release_render(self, r):
+        if r._gpu:
+            entry = self._meshes.get(id(r.vertex_data))
+            if entry is not None and entry[1] is r._gpu:
+                entry[2] -= 1
+                if entry[2] <= 0:
+                    del self._meshes[id(r.vertex_data)]
+                    self._delete_mesh(r._gpu)
+            else:
+                self._delete_mesh(r._gpu)
+            r._gpu = None
+        if r.sprite is not None and r.sprite.handle is not None:
+            self.assets.release(r.sprite.handle)
+            r.sprite.handle = None
+        self.tilemap_renderer.release(r)
+
+    @staticmethod
+    def _delete_mesh(gpu):
+        vao, vbo, ebo, _ = gpu
+        glDeleteVertexArrays(1, [vao])
+        glDeleteBuffers(1, [vbo])
+        gl_memory.free("mesh", vbo)
+        if ebo:
+            glDeleteBuffers(1, [ebo])
+            gl_memory.free("mesh", ebo)
 
     def begin(self):
         glfw.poll_events()
         t = glfw.get_time();
         dt = t - self.last_time;
         self.last_time = t
+        self.dt = dt
+        self.profiler.begin_frame()
+        self.assets.update()
 
-        # ЛОГІКА ОБЕРТАННЯ
-        for r in self.renderables:
-            if hasattr(r, 'owner') and r.owner:
-                r.owner.apply_components()
-                rot = r.owner.components.get("rotation")
-                if rot and rot.get("enabled", True):
-                    r.transform.rotation_x += float(rot.get("speed_x", 0.0)) * dt
-                    r.transform.rotation_y += float(rot.get("speed_y", 0.0)) * dt
-                    r.transform.rotation_z += float(rot.get("speed_z", 0.0)) * dt
-
-                    t_comp = r.owner.components["transform"]
-                    t_comp["rotation_x"], t_comp["rotation_y"], t_comp["rotation_z"] = \
-                        r.transform.rotation_x, r.transform.rotation_y, r.transform.rotation_z
+        # ЛОГІКА ОБЕРТАННЯ (у dict-и сцени записується лише при збереженні)
+        self.rotation_system.update(self.renderables, dt)
+        self.particle_system.update(self.renderables, dt)
 
+        for k in self.render_queue.stats: self.render_queue.stats[k] = 0
         self.camera.update()
-        self.view = self.camera.get_view_matrix()
-        self.proj = self.camera.get_projection_matrix()
+        self.frame_uniforms.update(self.camera, t)
         glClearColor(0.1, 0.1, 0.12, 1.0)
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
 
     def draw(self):
+        sprites, meshes, tilemaps = [], [], []
+        for r in self.renderables:
+            if r.tilemap is not None:
+                tilemaps.append(r)
+            if r.sprite is not None:
+                if r.sprite.texture_id is not None: sprites.append(r)
+            elif r._gpu and r._gpu[3]:
+                meshes.append(r)
+
+        ordered, first_transparent = self.render_queue.sort(meshes, self.program, self.camera)
+        self._draw_meshes(ordered[:first_transparent])
+        self.tilemap_renderer.draw(tilemaps)
+        self.sprite_batch.draw(sprites)
+
+        # Прозорі - після непрозорих і без запису в буфер глибини
+        if first_transparent < len(ordered):
+            glDepthMask(GL_FALSE)
+            self._draw_meshes(ordered[first_transparent:])
+            glDepthMask(GL_TRUE)
+
+        # Частинки - напівпрозорі, тож теж без запису глибини
+        if self.particle_system.renders:
+            glDepthMask(GL_FALSE)
+            self.particle_renderer.draw(self.particle_system.renders)
+            glDepthMask(GL_TRUE)
+
+    def _draw_meshes(self, renders):
+        if not renders: return
+        stats = self.render_queue.stats
         glUseProgram(self.program)
-        glUniformMatrix4fv(glGetUniformLocation(self.program, "uView"), 1, GL_FALSE, self.view)
-        glUniformMatrix4fv(glGetUniformLocation(self.program, "uProj"), 1, GL_FALSE, self.proj)
+        stats["program_binds"] += 1
+        u_model, u_color = self._uniforms["uModel"], self._uniforms["uColor"]
 
-        for r in self.renderables:
-            model = r.transform.to_mat4()
-            glUniformMatrix4fv(glGetUniformLocation(self.program, "uModel"), 1, GL_FALSE, model)
-            glUniform4f(glGetUniformLocation(self.program, "uColor"), *r.color)
+        bound_vao = None
+        for r in renders:
+            glUniformMatrix4fv(u_model, 1, GL_FALSE, r.transform.to_mat4())
+            glUniform4f(u_color, *r.color)
 
             vao, _, ebo, count = r._gpu
-            glBindVertexArray(vao)
+            if vao != bound_vao:
+                glBindVertexArray(vao)
+                bound_vao = vao
+                stats["vao_binds"] += 1
             if ebo:
                 glDrawElements(GL_TRIANGLES, count, GL_UNSIGNED_INT, None)
             else:
                 glDrawArrays(GL_TRIANGLES, 0, count)
+        stats["draws"] += len(renders)
 
     def end(self):
         glfw.swap_buffers(self.window)
@@ -152,14 +303,18 @@ class Engine:
     def terminate(self):
         if hasattr(self, 'program'):
             glDeleteProgram(self.program)
+        self.sprite_batch.delete()
+        glDeleteProgram(self.sprite_batch.program)
+        self.frame_uniforms.delete()
+        self.particle_renderer.delete()
+        glDeleteProgram(self.particle_renderer.program)
+        self.tilemap_renderer.delete()
+        glDeleteProgram(self.tilemap_renderer.program)
+        self.assets.shutdown()
 
-        for r in self.renderables:
-            if hasattr(r, '_gpu') and r._gpu:
-                vao, vbo, ebo, _ = r._gpu
-                glDeleteVertexArrays(1, [vao])
-                glDeleteBuffers(1, [vbo])
-                if ebo:
-                    glDeleteBuffers(1, [ebo])
+        for _, gpu, _ in self._meshes.values():
+            self._delete_mesh(gpu)
+        self._meshes.clear()
 
         # Закриваємо GLFW
         glfw.terminate()
\ No newline at end of file
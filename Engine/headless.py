@@ -0,0 +1,90 @@
+"""
+Headless engine - the Engine interface without a window or GL context
+
+Used by benchmarks and batch tools that need Scene.spawn and the per-frame
+update without rendering.
+"""
+
+import time
+
+from .camera import Camera
+from .profiler import Profiler
+from ECS.particles import ParticleSystem
+from ECS.rotation import RotationSystem
+
+
+class HeadlessEngine:
+    """Null renderer: keeps the render list, performs no GPU work."""
+
+    def __init__(self, width=1024, height=768, title="POF Engine (headless)"):
+        self.window = None
+        self.title = title
+        self.camera = Camera(width, height)
+        self.renderables = []
+        self._render_index = {}
+        self.rotation_system = RotationSystem()
+        self.particle_system = ParticleSystem()
+        self.profiler = Profiler()
+        self.dt = 0.0
+        self.last_time = time.perf_counter()
+        self.frame = 0
+
+    def prepare_render(self, render):
+        # Скільки байтів завантажив би Engine - щоб бюджети кадру поводились так само
+        return 4 * (len(render.vertex_data) + len(render.indices)) if render.sprite is None else 0
+
+    def add_render(self, render):
+        self.attach_render(render)
+
+    def attach_render(self, render):
+        self._render_index[id(render)] = len(self.renderables)
+        self.renderables.append(render)
+        self.rotation_system.add(render)
+        self.particle_system.add(render)
+
+    def set_renders(self, renders):
+        self.renderables = list(renders)
+        self._render_index = {id(r): i for i, r in enumerate(self.renderables)}
+        self.rotation_system.rebuild(self.renderables)
+        self.particle_system.rebuild(self.renderables)
+
+    def detach_render(self, render):
+        index = self._render_index.pop(id(render), None)
+        if index is None:
+            return False
+        last = self.renderables.pop()
+        if last is not render:
+            self.renderables[index] = last
+            self._render_index[id(last)] = index
+        self.rotation_system.remove(render)
+        self.particle_system.remove(render)
+        return True
+
+    def remove_render(self, render):
+        self.detach_render(render)
+
+    def release_render(self, render):
+        pass
+
+    def begin(self):
+        t = time.perf_counter()
+        dt = t - self.last_time
+        self.last_time = t
+        self.dt = dt
+        self.profiler.begin_frame()
+        self.rotation_system.update(self.renderables, dt)
+        self.particle_system.update(self.renderables, dt)
+        self.camera.update()
+
+    def draw(self):
+        pass
+
+    def end(self):
+        self.frame += 1
+
+    def should_close(self):
+        return False
+
+    def terminate(self):
+        self.renderables = []
+        self._render_index = {}
@@ -0,0 +1,120 @@
+"""
+Hierarchy index - cached rows, name search and grouping for the editor panel
+"""
+
+ROW_GROUP = 0
+ROW_OBJECT = 1
+
+
+def object_group(obj):
+    """Group key for an object: its shape type, or "empty" without a render."""
+    r_data = obj.component("render")
+    if not r_data:
+        return "empty"
+    return (r_data.get("shape", {}).get("type") or "rectangle").lower()
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class HierarchyIndex:
+    """Prebuilt view of scene objects for the hierarchy panel.
+
+    Labels, lowercase names and a trigram index are built once per change of
+    ``scene.objects``; filtering and folding only rebuild the flat ``rows``
+    list, so drawing a frame touches just the visible slice of it.
+    """
+
+    def __init__(self, scene):
+        self.scene = scene
+        self.filter_text = ""
+        self.folded = set()
+        self.rows = []
+        self.ids = []
+        self.labels = []
+        self.groups = []
+        self._names = []
+        self._trigram_index = {}
+        self._matches = None
+        self._objects_ref = None
+        self._objects_len = -1
+        self._rows_dirty = True
+
+    def invalidate(self):
+        self._objects_ref = None
+
+    def _ensure_index(self):
+        objects = self.scene.objects
+        if objects is self._objects_ref and len(objects) == self._objects_len:
+            return
+        self._objects_ref = objects
+        self._objects_len = len(objects)
+
+        self.ids = [obj.id for obj in objects]
+        self.labels = [f"{obj.name}##{obj.id}" for obj in objects]
+        self.groups = [object_group(obj) for obj in objects]
+        self._names = [str(obj.name).lower() for obj in objects]
+
+        index = {}
+        for i, name in enumerate(self._names):
+            for tri in _trigrams(name):
+                index.setdefault(tri, []).append(i)
+        self._trigram_index = index
+
+        self._matches = None
+        self.set_filter(self.filter_text, incremental=False)
+
+    def set_filter(self, text, incremental=True):
+        query = text.strip().lower()
+        previous = self.filter_text.strip().lower()
+        self.filter_text = text
+        self._rows_dirty = True
+
+        if not query:
+            self._matches = None
+            return
+
+        if incremental and self._matches is not None and previous and previous in query:
+            # Звуження запиту: фільтруємо лише попередні збіги
+            candidates = self._matches
+        elif len(query) >= 3:
+            postings = [self._trigram_index.get(tri, ()) for tri in _trigrams(query)]
+            postings.sort(key=len)
+            candidates = postings[0]
+            if len(postings) > 1:
+                rest = [set(p) for p in postings[1:]]
+                candidates = [i for i in candidates if all(i in s for s in rest)]
+        else:
+            candidates = range(len(self._names))
+
+        names = self._names
+        self._matches = [i for i in candidates if query in names[i]]
+
+    def toggle_group(self, group):
+        if group in self.folded:
+            self.folded.discard(group)
+        else:
+            self.folded.add(group)
+        self._rows_dirty = True
+
+    def get_rows(self):
+        """Return the flat row list: (ROW_GROUP, group, count) or (ROW_OBJECT, index)."""
+        self._ensure_index()
+        if not self._rows_dirty:
+            return self.rows
+
+        members = {}
+        visible = range(len(self.ids)) if self._matches is None else self._matches
+        for i in visible:
+            members.setdefault(self.groups[i], []).append(i)
+
+        rows = []
+        for group in sorted(members):
+            items = members[group]
+            rows.append((ROW_GROUP, group, len(items)))
+            if group not in self.folded:
+                rows.extend((ROW_OBJECT, i) for i in items)
+        self.rows = rows
+        self._rows_dirty = False
+        return rows
@@ -0,0 +1,30 @@
+"""
+4x4 matrix helpers for flat column-major lists (the layout glUniformMatrix4fv expects)
+"""
+
+
+def mat4_mul(a, b):
+    # Матриці зберігаються по стовпцях (як їх очікує glUniformMatrix4fv)
+    out = [0.0] * 16
+    for c in range(4):
+        for r in range(4):
+            out[c * 4 + r] = (a[r] * b[c * 4] + a[4 + r] * b[c * 4 + 1] +
+                              a[8 + r] * b[c * 4 + 2] + a[12 + r] * b[c * 4 + 3])
+    return out
+
+
+def mat4_inverse(m):
+    # Гаус-Жордан на рядковому представленні
+    a = [[m[c * 4 + r] for c in range(4)] + [1.0 if r == i else 0.0 for i in range(4)] for r in range(4)]
+    for col in range(4):
+        pivot = max(range(col, 4), key=lambda r: abs(a[r][col]))
+        if abs(a[pivot][col]) < 1e-12:
+            return None
+        a[col], a[pivot] = a[pivot], a[col]
+        p = a[col][col]
+        a[col] = [v / p for v in a[col]]
+        for r in range(4):
+            if r != col and a[r][col] != 0.0:
+                f = a[r][col]
+                a[r] = [v - f * w for v, w in zip(a[r], a[col])]
+    return [a[r][4 + c] for c in range(4) for r in range(4)]
@@ -0,0 +1,228 @@
+"""
+Memory instrumentation - GL byte counters and tracemalloc phase tracking
+
+GL counters are always on and cost one dict update per allocation:
+
+    gl_memory.allocate("mesh", vbo, nbytes)
+    gl_memory.free("mesh", vbo)
+
+Python heap tracking is opt-in (``POF_TRACE_MEMORY=1`` or
+``memory_tracker.enable()``) because tracemalloc slows allocation down:
+
+    with memory_tracker.phase("draw"):
+        engine.draw()
+    with memory_tracker.snapshot("scene.load"):
+        scene = Scene.load(path)
+
+``phase`` records, per frame, the net change (``net_bytes``,
+``net_blocks``: what the phase left allocated) and the transient volume
+(``peak_bytes``: highest traced heap inside the phase above its start, so
+a phase that allocates and frees 10 MB shows 10 MB there and ~0 net).
+``snapshot`` adds the same peak to a diff of full tracemalloc snapshots
+grouped by subsystem (engine module or third-party package); the
+per-subsystem figures are net. On Python 3.8 (no ``tracemalloc.reset_peak``)
+``peak_bytes`` is exact only when a phase pushes the heap above every
+earlier peak; otherwise it is the higher of the start and end levels.
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_HAS_RESET_PEAK = hasattr(tracemalloc, "reset_peak")  # Python 3.9+
+
+
+class GLMemory:
+    """Bytes held by GL buffers and textures, per category."""
+
+    def __init__(self):
+        self.bytes = {}
+        self.objects = {}
+        self.allocated_total = 0
+        self._sizes = {}  # (категорія, GL-ім'я) -> байти
+
+    def allocate(self, category, key, nbytes):
+        self.free(category, key)  # glBufferData на той самий буфер замінює старі дані
+        self._sizes[(category, key)] = nbytes
+        self.bytes[category] = self.bytes.get(category, 0) + nbytes
+        self.objects[category] = self.objects.get(category, 0) + 1
+        self.allocated_total += nbytes
+
+    def free(self, category, key):
+        nbytes = self._sizes.pop((category, key), None)
+        if nbytes is not None:
+            self.bytes[category] -= nbytes
+            self.objects[category] -= 1
+
+    def total(self):
+        return sum(self.bytes.values())
+
+    def report(self):
+        return {"total_bytes": self.total(), "allocated_total_bytes": self.allocated_total,
+                "categories": {c: {"bytes": self.bytes[c], "objects": self.objects[c]} for c in sorted(self.bytes)}}
+
+
+def subsystem_of(filename):
+    """Map a source file to "ECS.scene", "Engine.engine", "numpy", "<python>", ..."""
+    path = os.path.abspath(filename)
+    if path.startswith(_ROOT + os.sep):
+        rel = os.path.relpath(path, _ROOT)
+        return os.path.splitext(rel)[0].replace(os.sep, ".")
+    for marker in ("site-packages", "dist-packages"):
+        if marker in path:
+            rest = path.split(marker, 1)[1].lstrip(os.sep)
+            return rest.split(os.sep, 1)[0].split(".", 1)[0]
+    return "<python>"
+
+
+class MemoryTracker:
+    """Per-phase net/peak heap usage and per-subsystem snapshot diffs."""
+
+    def __init__(self, frames=1):
+        self.enabled = False
+        self.frames = frames
+        self.phases = {}      # назва -> останній кадр {"net_bytes", "peak_bytes", "net_blocks", "ms"}
+        self.phase_totals = {}
+        self.frame = {}
+        self.frame_count = 0
+        self.snapshots = {}   # назва -> результат snapshot()
+        self.peak_bytes = 0   # tracemalloc.reset_peak() у фазах скидає глобальний пік, тож ведемо свій
+        self._peaks = []      # стек вкладених фаз: найвищий рівень, бачений до вкладеної фази
+
+    def enable(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def _begin_peak(self):
+        """Start a peak window; an enclosing window keeps the peak seen so far."""
+        current, peak = tracemalloc.get_traced_memory()
+        if self._peaks:
+            parent = self._peaks[-1]
+            parent[0] = max(parent[0], peak if _HAS_RESET_PEAK else current)
+        self.peak_bytes = max(self.peak_bytes, peak)
+        self._peaks.append([current, peak])  # [найвищий відомий рівень, глобальний пік на старті]
+        if _HAS_RESET_PEAK:
+            tracemalloc.reset_peak()
+        return current
+
+    def _end_peak(self):
+        """Close the innermost window; returns (current bytes, peak bytes inside it)."""
+        current, peak = tracemalloc.get_traced_memory()
+        seen, start_peak = self._peaks.pop()
+        if _HAS_RESET_PEAK or peak > start_peak:
+            inner = max(seen, peak)
+        else:
+            # Python 3.8: глобальний пік не зріс, тож справжній пік фази невідомий - беремо нижню межу
+            inner = max(seen, current)
+        if self._peaks:
+            parent = self._peaks[-1]
+            parent[0] = max(parent[0], inner)
+        self.peak_bytes = max(self.peak_bytes, peak)
+        return current, inner
+
+    def phase(self, name):
+        """Context manager recording net and peak heap usage inside it."""
+        if not self.enabled:
+            return nullcontext()
+        return self._phase(name)
+
+    @contextmanager
+    def _phase(self, name):
+        start_bytes = self._begin_peak()
+        start_blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            current, peak = self._end_peak()
+            entry = self.frame.setdefault(name, {"net_bytes": 0, "peak_bytes": 0, "net_blocks": 0, "ms": 0.0})
+            entry["net_bytes"] += current - start_bytes
+            # Кілька викликів фази за кадр: пік - найбільший з них
+            entry["peak_bytes"] = max(entry["peak_bytes"], peak - start_bytes)
+            entry["net_blocks"] += sys.getallocatedblocks() - start_blocks
+            entry["ms"] += (time.perf_counter() - start) * 1000.0
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        for name, entry in self.frame.items():
+            total = self.phase_totals.setdefault(name, {"net_bytes": 0, "peak_bytes": 0, "net_blocks": 0, "ms": 0.0})
+            for key in total:
+                total[key] += entry[key]
+        self.phases = self.frame
+        self.frame = {}
+        self.frame_count += 1
+
+    def snapshot(self, name):
+        """Context manager diffing tracemalloc snapshots by subsystem (slow; for load/spawn)."""
+        if not self.enabled:
+            return nullcontext()
+        return self._snapshot(name)
+
+    @contextmanager
+    def _snapshot(self, name):
+        before = tracemalloc.take_snapshot()
+        start_bytes = self._begin_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            _, peak = self._end_peak()
+            after = tracemalloc.take_snapshot()
+            by_subsystem = {}
+            for stat in after.compare_to(before, "filename"):
+                key = subsystem_of(stat.traceback[0].filename)
+                entry = by_subsystem.setdefault(key, {"net_bytes": 0, "net_blocks": 0})
+                entry["net_bytes"] += stat.size_diff
+                entry["net_blocks"] += stat.count_diff
+            subsystems = dict(sorted(by_subsystem.items(), key=lambda kv: -kv[1]["net_bytes"]))
+            self.snapshots[name] = {"net_bytes": sum(e["net_bytes"] for e in subsystems.values()),
+                                    "peak_bytes": peak - start_bytes, "ms": elapsed * 1000.0,
+                                    "subsystems": subsystems}
+
+    def current_by_subsystem(self, limit=20):
+        """Live Python heap grouped by subsystem (takes a snapshot)."""
+        if not self.enabled:
+            return {}
+        result = {}
+        for stat in tracemalloc.take_snapshot().statistics("filename"):
+            key = subsystem_of(stat.traceback[0].filename)
+            result[key] = result.get(key, 0) + stat.size
+        return dict(sorted(result.items(), key=lambda kv: -kv[1])[:limit])
+
+    def report(self, subsystems=False):
+        report = {"enabled": self.enabled, "gl": gl_memory.report(), "frames": self.frame_count,
+                  "last_frame": self.phases, "snapshots": self.snapshots}
+        if self.enabled:
+            current, peak = tracemalloc.get_traced_memory()
+            self.peak_bytes = max(self.peak_bytes, peak)
+            report["traced_bytes"] = current
+            report["traced_peak_bytes"] = self.peak_bytes
+            report["phase_averages"] = {name: {k: v / max(self.frame_count, 1) for k, v in total.items()}
+                                        for name, total in self.phase_totals.items()}
+            if subsystems:
+                report["subsystems"] = self.current_by_subsystem()
+        return report
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(subsystems=True), f, indent=2)
+        return path
+
+
+# Глобальні екземпляри, як стан клавіш у Engine.input
+gl_memory = GLMemory()
+memory_tracker = MemoryTracker()
+if os.environ.get("POF_TRACE_MEMORY") == "1":
+    memory_tracker.enable()
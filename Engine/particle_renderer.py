@@ -0,0 +1,112 @@
+"""
+Particle rendering - one instanced draw per emitter
+
+A shared unit quad is expanded into camera-facing billboards in the vertex
+shader. The emitter's live state rows are the instance buffer; age-based
+size and color are interpolated from per-emitter uniforms on the GPU.
+"""
+
+import ctypes
+
+import numpy as np
+from OpenGL.GL import *
+
+from ECS.particles import INSTANCE_FLOATS
+from .memory import gl_memory
+from .uniform_buffer import FRAME_BLOCK_GLSL
+
+PARTICLE_VERTEX_SRC = """
+#version 330 core
+""" + FRAME_BLOCK_GLSL + """
+layout (location = 0) in vec2 aCorner;
+layout (location = 1) in vec4 iPosLife;
+layout (location = 2) in vec4 iVelInvLife;
+uniform vec4 uStartColor; uniform vec4 uEndColor; uniform vec2 uSize;
+out vec4 Color;
+out vec2 Local;
+void main() {
+    float t = clamp(1.0 - iPosLife.w * iVelInvLife.w, 0.0, 1.0);
+    float size = mix(uSize.x, uSize.y, t);
+    // Білборд: кут квадрата зсувається у просторі камери
+    vec4 center = uView * vec4(iPosLife.xyz, 1.0);
+    gl_Position = uProj * (center + vec4(aCorner * size, 0.0, 0.0));
+    Color = mix(uStartColor, uEndColor, t);
+    Local = aCorner * 2.0;
+}
+"""
+
+PARTICLE_FRAGMENT_SRC = """
+#version 330 core
+in vec4 Color;
+in vec2 Local;
+out vec4 FragColor;
+void main() {
+    float fade = 1.0 - smoothstep(0.6, 1.0, length(Local));
+    FragColor = vec4(Color.rgb, Color.a * fade);
+}
+"""
+
+_QUAD = np.array([-0.5, -0.5, 0.5, -0.5, 0.5, 0.5, -0.5, 0.5], dtype=np.float32)
+
+
+class ParticleRenderer:
+    """Draws live particles of each emitter with glDrawArraysInstanced."""
+
+    def __init__(self, program):
+        self.program = program
+        self.vao = glGenVertexArrays(1)
+        self.quad_vbo = glGenBuffers(1)
+        self.instance_vbo = glGenBuffers(1)
+        self._capacity = 0
+        self.draw_calls = 0
+        self._uniforms = {n: glGetUniformLocation(program, n) for n in ("uStartColor", "uEndColor", "uSize")}
+
+        glBindVertexArray(self.vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.quad_vbo)
+        glBufferData(GL_ARRAY_BUFFER, _QUAD.nbytes, _QUAD, GL_STATIC_DRAW)
+        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, 2 * 4, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(0)
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.instance_vbo)
+        stride = INSTANCE_FLOATS * 4
+        glVertexAttribPointer(1, 4, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(1)
+        glVertexAttribDivisor(1, 1)
+        glVertexAttribPointer(2, 4, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(4 * 4))
+        glEnableVertexAttribArray(2)
+        glVertexAttribDivisor(2, 1)
+        glBindVertexArray(0)
+
+    def _ensure_capacity(self, count):
+        if count <= self._capacity:
+            return
+        self._capacity = max(count, self._capacity * 2, 1024)
+        glBufferData(GL_ARRAY_BUFFER, self._capacity * INSTANCE_FLOATS * 4, None, GL_STREAM_DRAW)
+        gl_memory.allocate("particles", self.instance_vbo, self._capacity * INSTANCE_FLOATS * 4)
+
+    def draw(self, renders):
+        self.draw_calls = 0
+        if not renders:
+            return
+        glUseProgram(self.program)
+        glBindVertexArray(self.vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.instance_vbo)
+        u = self._uniforms
+        for r in renders:
+            emitter = r.particles
+            data = emitter.instance_data()
+            if not len(data):
+                continue
+            glUniform4f(u["uStartColor"], *emitter.start_color)
+            glUniform4f(u["uEndColor"], *emitter.end_color)
+            glUniform2f(u["uSize"], emitter.start_size, emitter.end_size)
+            self._ensure_capacity(len(data))
+            glBufferSubData(GL_ARRAY_BUFFER, 0, data.nbytes, data)
+            glDrawArraysInstanced(GL_TRIANGLE_FAN, 0, 4, len(data))
+            self.draw_calls += 1
+        glBindVertexArray(0)
+
+    def delete(self):
+        glDeleteVertexArrays(1, [self.vao])
+        glDeleteBuffers(2, [self.quad_vbo, self.instance_vbo])
+        gl_memory.free("particles", self.instance_vbo)
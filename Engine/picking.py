@@ -0,0 +1,376 @@
+"""
+Viewport picking - ray casting against scene geometry through a BVH
+"""
+
+import math
+from itertools import compress, count
+from operator import attrgetter, is_, is_not, ne
+
+from .math3d import mat4_inverse
+
+LEAF_SIZE = 4
+_render_of = attrgetter("render")
+_placement = attrgetter("x", "y", "z", "scale")
+
+
+def _union(boxes):
+    return [min(b[0] for b in boxes), min(b[1] for b in boxes), min(b[2] for b in boxes),
+            max(b[3] for b in boxes), max(b[4] for b in boxes), max(b[5] for b in boxes)]
+
+
+def _union2(a, b):
+    return [min(a[0], b[0]), min(a[1], b[1]), min(a[2], b[2]), max(a[3], b[3]), max(a[4], b[4]), max(a[5], b[5])]
+
+
+def _transform_point(m, x, y, z):
+    w = m[3] * x + m[7] * y + m[11] * z + m[15]
+    if w == 0.0:
+        w = 1.0
+    return ((m[0] * x + m[4] * y + m[8] * z + m[12]) / w,
+            (m[1] * x + m[5] * y + m[9] * z + m[13]) / w,
+            (m[2] * x + m[6] * y + m[10] * z + m[14]) / w)
+
+
+def screen_to_ray(camera, mouse_x, mouse_y, width, height):
+    """Unproject a window-space mouse position into a world-space ray.
+
+    Returns:
+        tuple: (origin, direction) or None if the camera matrix is singular
+    """
+    if width <= 0 or height <= 0:
+        return None
+    inv = mat4_inverse(camera.get_view_projection_matrix())
+    if inv is None:
+        return None
+
+    nx = 2.0 * mouse_x / width - 1.0
+    ny = 1.0 - 2.0 * mouse_y / height
+    near = _transform_point(inv, nx, ny, -1.0)
+    far = _transform_point(inv, nx, ny, 1.0)
+    dx, dy, dz = far[0] - near[0], far[1] - near[1], far[2] - near[2]
+    length = math.sqrt(dx * dx + dy * dy + dz * dz)
+    if length == 0.0:
+        return None
+    return near, (dx / length, dy / length, dz / length)
+
+
+def ray_triangle(origin, direction, a, b, c):
+    # Möller–Trumbore; повертає відстань до перетину або None
+    e1x, e1y, e1z = b[0] - a[0], b[1] - a[1], b[2] - a[2]
+    e2x, e2y, e2z = c[0] - a[0], c[1] - a[1], c[2] - a[2]
+    dx, dy, dz = direction
+    px, py, pz = dy * e2z - dz * e2y, dz * e2x - dx * e2z, dx * e2y - dy * e2x
+    det = e1x * px + e1y * py + e1z * pz
+    if -1e-12 < det < 1e-12:
+        return None
+    inv_det = 1.0 / det
+    tx, ty, tz = origin[0] - a[0], origin[1] - a[1], origin[2] - a[2]
+    u = (tx * px + ty * py + tz * pz) * inv_det
+    if u < 0.0 or u > 1.0:
+        return None
+    qx, qy, qz = ty * e1z - tz * e1y, tz * e1x - tx * e1z, tx * e1y - ty * e1x
+    v = (dx * qx + dy * qy + dz * qz) * inv_det
+    if v < 0.0 or u + v > 1.0:
+        return None
+    t = (e2x * qx + e2y * qy + e2z * qz) * inv_det
+    return t if t >= 0.0 else None
+
+
+def ray_render(origin, direction, render):
+    """Exact hit test of a ray against the triangles of a Render's shape."""
+    verts = render.vertex_data
+    if not verts or render.transform is None:
+        return None
+    m = render.transform.to_mat4()
+    world = []
+    for i in range(0, len(verts) - 2, 3):
+        x, y, z = verts[i], verts[i + 1], verts[i + 2]
+        world.append((m[0] * x + m[4] * y + m[8] * z + m[12],
+                      m[1] * x + m[5] * y + m[9] * z + m[13],
+                      m[2] * x + m[6] * y + m[10] * z + m[14]))
+
+    indices = render.indices or range(len(world))
+    best = None
+    for i in range(0, len(indices) - len(indices) % 3, 3):
+        t = ray_triangle(origin, direction, world[indices[i]], world[indices[i + 1]], world[indices[i + 2]])
+        if t is not None and (best is None or t < best):
+            best = t
+    return best
+
+
+class BVH:
+    """Bounding volume hierarchy over axis-aligned boxes.
+
+    Nodes live in flat lists; a node is a leaf when its count is non-zero,
+    in which case ``first`` indexes into ``items``/``item_boxes``. Children
+    always have higher indices than their parent, so a reverse pass over
+    the nodes visits every child before its parent (used by ``refit``).
+    """
+
+    def __init__(self, boxes, payloads):
+        self.items = []
+        self.item_boxes = []
+        self.leaf_of = []  # індекс елемента -> його лист
+        self.bounds = []
+        self.first = []
+        self.count = []
+        self.parent = []
+        if boxes:
+            self._build(list(zip(boxes, payloads)))
+
+    def __len__(self):
+        return len(self.items)
+
+    def _new_node(self, entries, parent):
+        b = _union([e[0] for e in entries])
+        self.bounds.append(b)
+        self.first.append(0)
+        self.count.append(0)
+        self.parent.append(parent)
+        return len(self.bounds) - 1, b
+
+    def _build(self, entries):
+        root, _ = self._new_node(entries, -1)
+        stack = [(root, entries)]
+        while stack:
+            node, group = stack.pop()
+            if len(group) <= LEAF_SIZE:
+                self.first[node] = len(self.items)
+                self.count[node] = len(group)
+                self.items.extend(e[1] for e in group)
+                self.item_boxes.extend(e[0] for e in group)
+                self.leaf_of.extend([node] * len(group))
+                continue
+
+            # Ділимо по медіані центрів уздовж найдовшої осі
+            b = self.bounds[node]
+            axis = max(range(3), key=lambda k: b[k + 3] - b[k])
+            group.sort(key=lambda e: e[0][axis] + e[0][axis + 3])
+            mid = len(group) // 2
+            left, _ = self._new_node(group[:mid], node)
+            right, _ = self._new_node(group[mid:], node)
+            # Для внутрішнього вузла first зберігає лівого нащадка (правий - наступний)
+            self.first[node] = left
+            stack.append((right, group[mid:]))
+            stack.append((left, group[:mid]))
+
+    def raycast(self, origin, direction, hit_test):
+        """Return (t, payload) of the closest item accepted by hit_test.
+
+        hit_test(payload) must return the hit distance or None. Children are
+        visited nearest-first so later subtrees are pruned by the best hit.
+        """
+        if not self.bounds:
+            return None, None
+        ox, oy, oz = origin
+        ix, iy, iz = [1.0 / d if d != 0.0 else 1e30 for d in direction]
+        bounds, first, count, items = self.bounds, self.first, self.count, self.items
+
+        def enter(node):
+            # Slab test; повертає відстань входу або None
+            b = bounds[node]
+            t1, t2 = (b[0] - ox) * ix, (b[3] - ox) * ix
+            tmin, tmax = (t1, t2) if t1 < t2 else (t2, t1)
+            t1, t2 = (b[1] - oy) * iy, (b[4] - oy) * iy
+            if t1 > t2: t1, t2 = t2, t1
+            if t1 > tmin: tmin = t1
+            if t2 < tmax: tmax = t2
+            t1, t2 = (b[2] - oz) * iz, (b[5] - oz) * iz
+            if t1 > t2: t1, t2 = t2, t1
+            if t1 > tmin: tmin = t1
+            if t2 < tmax: tmax = t2
+            if tmax < 0.0 or tmax < tmin:
+                return None
+            return tmin
+
+        best_t, best = math.inf, None
+        root_t = enter(0)
+        stack = [(root_t, 0)] if root_t is not None else []
+        while stack:
+            node_t, node = stack.pop()
+            if node_t > best_t:
+                continue
+
+            n = count[node]
+            if n:
+                start = first[node]
+                for payload in items[start:start + n]:
+                    t = hit_test(payload)
+                    if t is not None and t < best_t:
+                        best_t, best = t, payload
+                continue
+
+            left, right = first[node], first[node] + 1
+            lt, rt = enter(left), enter(right)
+            if lt is not None and rt is not None:
+                # Ближчий вузол кладемо останнім, щоб обійти його першим
+                if lt < rt:
+                    stack.append((rt, right))
+                    stack.append((lt, left))
+                else:
+                    stack.append((lt, left))
+                    stack.append((rt, right))
+            elif lt is not None:
+                stack.append((lt, left))
+            elif rt is not None:
+                stack.append((rt, right))
+        return (best_t, best) if best is not None else (None, None)
+
+    def refit(self, updates):
+        """Give items new boxes and resize the bounds above them; the split stays as built.
+
+        Args:
+            updates: (item index, box) pairs
+
+        Returns:
+            int: Number of leaves touched
+        """
+        leaves = set()
+        boxes = self.item_boxes
+        for i, box in updates:
+            boxes[i] = box
+            leaves.add(self.leaf_of[i])
+        if not leaves:
+            return 0
+        bounds, first, count, parent = self.bounds, self.first, self.count, self.parent
+        if len(leaves) * 8 > len(bounds):
+            # Зсунулась значна частина сцени - один прохід знизу вгору дешевший за шляхи до кореня
+            for node in range(len(bounds) - 1, -1, -1):
+                n = count[node]
+                if n:
+                    bounds[node] = _union(boxes[first[node]:first[node] + n])
+                else:
+                    bounds[node] = _union2(bounds[first[node]], bounds[first[node] + 1])
+            return len(leaves)
+        for leaf in leaves:
+            bounds[leaf] = _union(boxes[first[leaf]:first[leaf] + count[leaf]])
+            node = parent[leaf]
+            while node >= 0:
+                b = _union2(bounds[first[node]], bounds[first[node] + 1])
+                if b == bounds[node]:
+                    break  # вище нічого не змінюється
+                bounds[node] = b
+                node = parent[node]
+        return len(leaves)
+
+
+def _hit_object(origin, direction, obj):
+    return ray_render(origin, direction, obj.render) if obj.render is not None else None
+
+
+class ScenePicker:
+    """Resolves viewport clicks to SceneObjects.
+
+    The BVH is built once per set of objects: it is rebuilt only after
+    ``invalidate()`` or when ``scene.objects`` gains, loses or reorders
+    objects.
+    Moved objects are handled by refitting: ``mark_moved(obj)`` refits one
+    object, ``mark_moved()`` compares every transform with the one the tree
+    was fitted to and refits the leaves that changed. Bounds use the
+    shape's bounding sphere so spinning objects never need a refit.
+    """
+
+    def __init__(self, scene):
+        self.scene = scene
+        self._bvh = None
+        self._objects_ref = None
+        self._objects_seen = []  # копія scene.objects на момент побудови
+        # Об'єкти з формою в порядку сцени (елементи BVH - індекси в цей список; прохід у порядку
+        # сцени йде пам'яттю послідовно) і для кожного: рендер, трансформ, (x, y, z, scale) рамки
+        self._objects = []
+        self._renders = []
+        self._transforms = []
+        self._fitted = []
+        self._item_of = []  # індекс у _objects -> позиція елемента в BVH
+        self._index = {}    # id(об'єкта) -> індекс у _objects
+        self._moved = set()
+        self._check_all = False
+
+    def invalidate(self):
+        """Objects were added/removed or gained/lost a render: rebuild on the next pick."""
+        self._bvh = None
+
+    def mark_moved(self, obj=None):
+        """obj (or, without an argument, any object) may have moved: refit on the next pick."""
+        if obj is None:
+            self._check_all = True
+        else:
+            self._moved.add(id(obj))
+
+    @staticmethod
+    def _fit(r):
+        t = r.transform
+        radius = r.shape.get_bounding_radius() * abs(t.scale)
+        return (t.x - radius, t.y - radius, t.z - radius, t.x + radius, t.y + radius, t.z + radius)
+
+    def _rebuild(self):
+        objects = [obj for obj in self.scene.objects
+                   if obj.render is not None and obj.render.shape is not None and obj.render.transform is not None]
+        self._bvh = BVH([self._fit(obj.render) for obj in objects], range(len(objects)))
+        self._objects = objects
+        self._renders = list(map(_render_of, objects))
+        self._transforms = [r.transform for r in self._renders]
+        self._fitted = list(map(_placement, self._transforms))
+        self._item_of = [0] * len(objects)
+        for pos, j in enumerate(self._bvh.items):
+            self._item_of[j] = pos
+        self._index = {id(obj): j for j, obj in enumerate(objects)}
+        self._objects_ref = self.scene.objects
+        self._objects_seen = list(self.scene.objects)
+        self._moved.clear()
+        self._check_all = False
+
+    def _refit(self):
+        objects, renders, transforms, fitted = self._objects, self._renders, self._transforms, self._fitted
+        if self._check_all:
+            # Цілі проходи map/compress замість Python-циклу по всіх об'єктах
+            current = list(map(_render_of, objects))
+            for j in compress(count(), map(is_not, current, renders)):
+                renders[j] = r = current[j]
+                if r is not None and r.shape is not None and r.transform is not None:
+                    transforms[j] = r.transform
+                    fitted[j] = None  # новий рендер (і, можливо, форма) - рамку перераховуємо
+            candidates = compress(count(), map(ne, map(_placement, transforms), fitted))
+        else:
+            candidates = [self._index[k] for k in self._moved if k in self._index]
+        updates = []
+        for j in candidates:
+            r = objects[j].render
+            if r is None or r.shape is None or r.transform is None:
+                continue  # без рендера влучання не буде; рамку лишаємо
+            renders[j], transforms[j] = r, r.transform
+            placement = _placement(r.transform)
+            if placement != fitted[j]:
+                fitted[j] = placement
+                updates.append((self._item_of[j], self._fit(r)))
+        self._bvh.refit(updates)
+        self._moved.clear()
+        self._check_all = False
+        return len(updates)
+
+    def _same_objects(self):
+        objects, seen = self.scene.objects, self._objects_seen
+        if len(objects) != len(seen):
+            return False
+        if objects is not self._objects_ref:
+            # Новий список (напр. після end_play) з тими самими об'єктами - дерево ще придатне
+            if not all(map(is_, objects, seen)):
+                return False
+            self._objects_ref = objects
+        return True
+
+    def pick_ray(self, origin, direction):
+        if self._bvh is None or not self._same_objects():
+            self._rebuild()
+        elif self._check_all or self._moved:
+            self._refit()
+        candidates = self._objects
+        _, j = self._bvh.raycast(origin, direction, lambda j: _hit_object(origin, direction, candidates[j]))
+        return candidates[j] if j is not None else None
+
+    def pick(self, camera, mouse_x, mouse_y, width, height):
+        """Return the closest SceneObject under the mouse, or None."""
+        ray = screen_to_ray(camera, mouse_x, mouse_y, width, height)
+        if ray is None:
+            return None
+        return self.pick_ray(*ray)
@@ -0,0 +1,47 @@
+"""
+Profiler - per-frame counters and section timings
+
+    profiler.count("commands.destroy", 3)
+    with profiler.section("scripts"):
+        ...
+
+``begin_frame`` moves the current frame's values into ``last_frame`` and
+adds them to ``totals``.
+"""
+
+import time
+from contextlib import contextmanager
+
+
+class Profiler:
+    def __init__(self):
+        self.frame = {}
+        self.last_frame = {}
+        self.totals = {}
+        self.frames = 0
+
+    def count(self, name, n=1):
+        self.frame[name] = self.frame.get(name, 0) + n
+
+    def add_time(self, name, seconds):
+        key = f"{name}_ms"
+        self.frame[key] = self.frame.get(key, 0.0) + seconds * 1000.0
+
+    @contextmanager
+    def section(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def begin_frame(self):
+        for name, value in self.frame.items():
+            self.totals[name] = self.totals.get(name, 0) + value
+        self.last_frame = self.frame
+        self.frame = {}
+        self.frames += 1
+
+    def reset(self):
+        self.frame, self.last_frame, self.totals = {}, {}, {}
+        self.frames = 0
@@ -0,0 +1,294 @@
+"""
+Project archives - parallel ZIP export/import and incremental backups
+
+Export deflates files on a thread pool (zlib releases the GIL) and writes
+the finished members straight into the archive in walk order, so nothing
+is staged on disk. Formats that are already compressed are stored as-is.
+
+Backups are content-addressed: ``<backup>/objects/<sha[:2]>/<sha>`` holds
+each distinct file once and ``<backup>/snapshots/<stamp>.json`` maps
+relative paths to hashes, so a new snapshot only writes changed files.
+
+``progress(done_bytes, total_bytes, name)`` is called after every file.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+# Вже стиснуті формати - повторне стиснення тільки витрачає час
+STORED_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".webp", ".zip", ".gz", ".ogg", ".mp3", ".mp4"}
+# Похідні дані, які відновлюються з джерел
+EXCLUDED_DIRS = {".cache", "__pycache__"}
+EXCLUDED_FILES = {".blobs.json"}  # локальний маніфест спільного сховища блобів
+CHUNK_SIZE = 1 << 20
+
+
+def _workers(workers):
+    return workers or min(8, (os.cpu_count() or 1) + 2)
+
+
+def walk_project(project_path):
+    """Yield (full_path, archive_name, size) for every file worth archiving."""
+    for root, dirs, files in os.walk(project_path):
+        dirs[:] = sorted(d for d in dirs if d not in EXCLUDED_DIRS)
+        for f in sorted(files):
+            if f in EXCLUDED_FILES:
+                continue
+            full = os.path.join(root, f)
+            rel = os.path.relpath(full, project_path).replace(os.sep, "/")
+            yield full, rel, os.path.getsize(full)
+
+
+def _deflate_file(path, level):
+    """Raw-deflate one file in memory; returns (crc, chunks, compressed_size)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    crc = 0
+    chunks = []
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(CHUNK_SIZE)
+            if not block:
+                break
+            crc = zlib.crc32(block, crc)
+            out = compressor.compress(block)
+            if out:
+                chunks.append(out)
+    chunks.append(compressor.flush())
+    return crc, chunks, sum(len(c) for c in chunks)
+
+
+def _write_deflated(zf, path, arcname, size, crc, chunks, compress_size):
+    """Append an already deflated member to an open ZipFile.
+
+    zipfile has no public API for pre-compressed data, so this does what
+    ZipFile.write does internally: local header, data, then registration
+    for the central directory written on close.
+    """
+    zinfo = zipfile.ZipInfo.from_file(path, arcname)
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.file_size = size
+    zinfo.compress_size = compress_size
+    zinfo.CRC = crc
+    zip64 = size > zipfile.ZIP64_LIMIT or compress_size > zipfile.ZIP64_LIMIT
+    zinfo.header_offset = zf.fp.tell()
+    zf.fp.write(zinfo.FileHeader(zip64))
+    for chunk in chunks:
+        zf.fp.write(chunk)
+    zf.filelist.append(zinfo)
+    zf.NameToInfo[arcname] = zinfo
+    zf.start_dir = zf.fp.tell()
+    zf._didModify = True
+
+
+def export_archive(project_path, archive_path, workers=None, level=6, progress=None):
+    """Write project_path into a ZIP at archive_path.
+
+    Returns:
+        str: archive_path
+    """
+    files = list(walk_project(project_path))
+    total = sum(size for _, _, size in files)
+    done = 0
+    window = _workers(workers) * 2  # обмежує кількість стиснутих файлів у пам'яті
+    tmp_path = archive_path + ".part"
+    with ThreadPoolExecutor(max_workers=_workers(workers)) as pool, \
+            zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        pending = []
+
+        def drain(limit):
+            nonlocal done
+            while len(pending) > limit:
+                full, rel, size, future = pending.pop(0)
+                if future is None:
+                    zf.write(full, rel, compress_type=zipfile.ZIP_STORED)
+                else:
+                    _write_deflated(zf, full, rel, size, *future.result())
+                done += size
+                if progress:
+                    progress(done, total, rel)
+
+        for full, rel, size in files:
+            stored = os.path.splitext(rel)[1].lower() in STORED_EXTENSIONS or size == 0
+            future = None if stored else pool.submit(_deflate_file, full, level)
+            pending.append((full, rel, size, future))
+            drain(window)
+        drain(0)
+    os.replace(tmp_path, archive_path)
+    return archive_path
+
+
+def _safe_target(dest, name):
+    """Resolve an archive member name inside dest, rejecting path traversal."""
+    if name.startswith(("/", "\\")) or ":" in name:
+        raise ValueError(f"Unsafe path in archive: {name}")
+    target = os.path.realpath(os.path.join(dest, *name.split("/")))
+    root = os.path.realpath(dest)
+    if target != root and not target.startswith(root + os.sep):
+        raise ValueError(f"Unsafe path in archive: {name}")
+    return target
+
+
+def import_archive(zip_path, dest, required="project.json", workers=None, progress=None):
+    """Validate and extract a project archive into dest (which must not exist).
+
+    Members are extracted in parallel into a temporary sibling directory
+    that is renamed into place only after everything succeeded.
+
+    Returns:
+        str: dest
+    """
+    if os.path.exists(dest):
+        raise FileExistsError(f"Destination already exists: {dest}")
+    with zipfile.ZipFile(zip_path) as zf:
+        members = [m for m in zf.infolist() if not m.is_dir()]
+    names = {m.filename for m in members}
+    if required and required not in names:
+        raise ValueError(f"Not a project archive (missing {required}): {zip_path}")
+
+    tmp_dest = dest + ".importing"
+    shutil.rmtree(tmp_dest, ignore_errors=True)
+    targets = [(m, _safe_target(tmp_dest, m.filename)) for m in members]
+    total = sum(m.file_size for m in members)
+    done = 0
+    lock = threading.Lock()
+    local = threading.local()
+
+    def extract(member, target):
+        nonlocal done
+        # Окремий дескриптор архіву на кожен потік
+        zf = getattr(local, "zf", None)
+        if zf is None:
+            zf = local.zf = zipfile.ZipFile(zip_path)
+            opened.append(zf)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with zf.open(member) as src, open(target, "wb") as dst:
+            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        with lock:
+            done += member.file_size
+            if progress:
+                progress(done, total, member.filename)
+
+    opened = []
+    try:
+        with ThreadPoolExecutor(max_workers=_workers(workers)) as pool:
+            for future in [pool.submit(extract, m, t) for m, t in targets]:
+                future.result()
+        os.replace(tmp_dest, dest)
+    except BaseException:
+        shutil.rmtree(tmp_dest, ignore_errors=True)
+        raise
+    finally:
+        for zf in opened:
+            zf.close()
+    return dest
+
+
+def _hash_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _snapshots(backup_dir):
+    snap_dir = os.path.join(backup_dir, "snapshots")
+    if not os.path.isdir(snap_dir):
+        return []
+    return sorted(f[:-5] for f in os.listdir(snap_dir) if f.endswith(".json"))
+
+
+def _read_snapshot(backup_dir, snapshot):
+    with open(os.path.join(backup_dir, "snapshots", f"{snapshot}.json"), "r") as f:
+        return json.load(f)
+
+
+def backup_project(project_path, backup_dir, workers=None, progress=None):
+    """Store a new content-addressed snapshot of project_path.
+
+    Files whose size and mtime match the previous snapshot reuse its hash
+    without being read; only objects not yet in the store are written.
+
+    Returns:
+        dict: snapshot name, file count, number of new objects and bytes written
+    """
+    previous = {}
+    snapshots = _snapshots(backup_dir)
+    if snapshots:
+        previous = _read_snapshot(backup_dir, snapshots[-1])["files"]
+
+    files = list(walk_project(project_path))
+    total = sum(size for _, _, size in files)
+    entries = {}
+    to_hash = []
+    for full, rel, size in files:
+        mtime = os.stat(full).st_mtime_ns
+        old = previous.get(rel)
+        if old and old["size"] == size and old["mtime_ns"] == mtime:
+            entries[rel] = old
+        else:
+            to_hash.append((full, rel, size, mtime))
+
+    objects_dir = os.path.join(backup_dir, "objects")
+    done = 0
+    written = [0, 0]
+    lock = threading.Lock()
+
+    def store(full, rel, size, mtime):
+        nonlocal done
+        digest = _hash_file(full)
+        obj_path = os.path.join(objects_dir, digest[:2], digest)
+        if not os.path.exists(obj_path):
+            os.makedirs(os.path.dirname(obj_path), exist_ok=True)
+            tmp = f"{obj_path}.{threading.get_ident()}.tmp"
+            shutil.copyfile(full, tmp)
+            os.replace(tmp, obj_path)
+            with lock:
+                written[0] += 1
+                written[1] += size
+        with lock:
+            done += size
+            if progress:
+                progress(done, total, rel)
+        return rel, {"sha256": digest, "size": size, "mtime_ns": mtime}
+
+    with ThreadPoolExecutor(max_workers=_workers(workers)) as pool:
+        for rel, entry in pool.map(lambda args: store(*args), to_hash):
+            entries[rel] = entry
+
+    name = time.strftime("%Y%m%d-%H%M%S")
+    while name in snapshots:
+        name += "_"
+    os.makedirs(os.path.join(backup_dir, "snapshots"), exist_ok=True)
+    with open(os.path.join(backup_dir, "snapshots", f"{name}.json"), "w") as f:
+        json.dump({"source": project_path, "files": dict(sorted(entries.items()))}, f, indent=2)
+    return {"snapshot": name, "files": len(entries), "new_objects": written[0], "bytes_written": written[1]}
+
+
+def restore_backup(backup_dir, dest, snapshot=None):
+    """Recreate a project from a snapshot (the latest one by default).
+
+    Returns:
+        str: dest
+    """
+    if snapshot is None:
+        snapshots = _snapshots(backup_dir)
+        if not snapshots:
+            raise FileNotFoundError(f"No snapshots in {backup_dir}")
+        snapshot = snapshots[-1]
+    if os.path.exists(dest):
+        raise FileExistsError(f"Destination already exists: {dest}")
+    files = _read_snapshot(backup_dir, snapshot)["files"]
+    for rel, entry in files.items():
+        target = _safe_target(dest, rel)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        digest = entry["sha256"]
+        shutil.copyfile(os.path.join(backup_dir, "objects", digest[:2], digest), target)
+    return dest
@@ -0,0 +1,214 @@
+"""
+Project catalog - SQLite index of project metadata and file counts
+
+The catalog lives in ``<projects>/.pof/catalog.sqlite`` - in a subdirectory,
+so that SQLite's journal files don't change the projects root's mtime on
+every commit. Each row stores
+the mtimes of the project's config file and its scripts/assets/scenes
+directories; a project is only re-read when one of them changed, and the
+projects root is only re-listed when its own mtime changed.
+"""
+
+import json
+import os
+import sqlite3
+
+CATALOG_DIR = ".pof"
+CATALOG_FILE = "catalog.sqlite"
+LEGACY_CATALOG_FILE = ".pof_catalog.sqlite"
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS projects (
+    name TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    config_mtime INTEGER,
+    scripts_mtime INTEGER,
+    assets_mtime INTEGER,
+    scenes_mtime INTEGER,
+    description TEXT,
+    created TEXT,
+    modified TEXT,
+    version TEXT,
+    engine_version TEXT,
+    settings TEXT,
+    scene_count INTEGER,
+    script_count INTEGER,
+    asset_count INTEGER
+);
+"""
+
+_INFO_COLUMNS = ("name", "description", "created", "modified", "version", "settings", "path",
+                 "scene_count", "script_count", "asset_count")
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class ProjectCatalog:
+    """Incrementally refreshed index over every project in base_path."""
+
+    def __init__(self, base_path, config_file="project.json", scripts_dir="scripts", assets_dir="assets",
+                 scene_file="scene.json", scenes_dir="scenes"):
+        self.base_path = base_path
+        self.config_file = config_file
+        self.scripts_dir = scripts_dir
+        self.assets_dir = assets_dir
+        self.scene_file = scene_file
+        self.scenes_dir = scenes_dir
+        self.db_path = os.path.join(base_path, CATALOG_DIR, CATALOG_FILE)
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self.db = sqlite3.connect(self.db_path)
+            self.db.executescript(_SCHEMA)
+        except (OSError, sqlite3.Error) as e:
+            # Напр. корінь тільки для читання - працюємо з тимчасовим індексом
+            print(f"Project catalog unavailable ({e}), using in-memory index")
+            self.db_path = ":memory:"
+            self.db = sqlite3.connect(self.db_path)
+            self.db.executescript(_SCHEMA)
+        if self._meta("schema") != str(SCHEMA_VERSION):
+            # Старий індекс будується заново - таблицю зі старими колонками видаляємо
+            self.db.execute("DROP TABLE IF EXISTS projects")
+            self.db.execute("DELETE FROM meta")
+            self.db.executescript(_SCHEMA)
+            self._set_meta("schema", str(SCHEMA_VERSION))
+            self.db.commit()
+            # Індекс попередніх версій лежав прямо в корені
+            try:
+                os.remove(os.path.join(base_path, LEGACY_CATALOG_FILE))
+            except OSError:
+                pass
+
+    def close(self):
+        self.db.close()
+
+    def _meta(self, key):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    # --- Оновлення ---
+
+    def _stamps(self, project_path):
+        return (_mtime(os.path.join(project_path, self.config_file)),
+                _mtime(os.path.join(project_path, self.scripts_dir)),
+                _mtime(os.path.join(project_path, self.assets_dir)),
+                _mtime(os.path.join(project_path, self.scenes_dir)))
+
+    def _scan(self, name, stamps):
+        """Read one project from disk into the catalog (no commit)."""
+        path = os.path.join(self.base_path, name)
+        try:
+            with open(os.path.join(path, self.config_file), "r") as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Skipping project '{name}': {e}")
+            self.db.execute("DELETE FROM projects WHERE name = ?", (name,))
+            return
+        scripts_path = os.path.join(path, self.scripts_dir)
+        assets_path = os.path.join(path, self.assets_dir)
+        script_count = sum(1 for f in os.listdir(scripts_path) if f.endswith(".py")) \
+            if os.path.isdir(scripts_path) else 0
+        asset_count = len(os.listdir(assets_path)) if os.path.isdir(assets_path) else 0
+        scenes_path = os.path.join(path, self.scenes_dir)
+        scene_count = int(os.path.exists(os.path.join(path, self.scene_file)))
+        if os.path.isdir(scenes_path):
+            scene_count += sum(1 for f in os.listdir(scenes_path) if f.endswith(".json"))
+        self.db.execute(
+            "INSERT OR REPLACE INTO projects VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (name, path, stamps[0], stamps[1], stamps[2], stamps[3], config.get("description", ""),
+             config.get("created", ""), config.get("modified", ""), config.get("version", ""),
+             config.get("engine_version", ""), json.dumps(config.get("settings", {})),
+             scene_count, script_count, asset_count))
+
+    def refresh_project(self, name):
+        """Re-check one project's mtimes and re-read it if anything changed.
+
+        Returns:
+            bool: True if the project exists
+        """
+        path = os.path.join(self.base_path, name)
+        stamps = self._stamps(path)
+        if stamps[0] is None:
+            self.remove(name)
+            return False
+        row = self.db.execute("SELECT config_mtime, scripts_mtime, assets_mtime, scenes_mtime FROM projects "
+                              "WHERE name = ?", (name,)).fetchone()
+        if row is None or tuple(row) != stamps:
+            self._scan(name, stamps)
+            self.db.commit()
+        return True
+
+    def refresh(self, deep=False):
+        """Bring the catalog up to date.
+
+        The root directory is re-listed only when its mtime changed. Every
+        known project's project.json is stat'ed (deleting or editing it does
+        not touch the root); with deep=True its scripts/assets/scenes
+        directories are checked as well. Only changed projects are re-read.
+        """
+        root_mtime = _mtime(self.base_path)
+        listed = self._meta("root_mtime") != str(root_mtime)
+        if listed:
+            names = set()
+            with os.scandir(self.base_path) as it:
+                for entry in it:
+                    if entry.is_dir() and os.path.exists(os.path.join(entry.path, self.config_file)):
+                        names.add(entry.name)
+            known = {r[0] for r in self.db.execute("SELECT name FROM projects")}
+            for name in known - names:
+                self.db.execute("DELETE FROM projects WHERE name = ?", (name,))
+            for name in names - known:
+                self._scan(name, self._stamps(os.path.join(self.base_path, name)))
+            self._set_meta("root_mtime", str(root_mtime))
+        rows = self.db.execute("SELECT name, config_mtime, scripts_mtime, assets_mtime, scenes_mtime "
+                               "FROM projects").fetchall()
+        for name, *old in rows:
+            path = os.path.join(self.base_path, name)
+            if deep:
+                stamps = self._stamps(path)
+            else:
+                config_mtime = _mtime(os.path.join(path, self.config_file))
+                if config_mtime == old[0]:
+                    continue
+                stamps = self._stamps(path) if config_mtime is not None else (None,)
+            if stamps[0] is None:
+                self.db.execute("DELETE FROM projects WHERE name = ?", (name,))
+            elif tuple(old) != stamps:
+                self._scan(name, stamps)
+        self.db.commit()
+
+    def remove(self, name):
+        self.db.execute("DELETE FROM projects WHERE name = ?", (name,))
+        self.db.commit()
+
+    # --- Запити ---
+
+    def names(self):
+        return [r[0] for r in self.db.execute("SELECT name FROM projects ORDER BY name")]
+
+    def info(self, name):
+        """Return the catalog row for name as a get_project_info dict, or None."""
+        row = self.db.execute(f"SELECT {', '.join(_INFO_COLUMNS)} FROM projects WHERE name = ?",
+                              (name,)).fetchone()
+        if row is None:
+            return None
+        info = dict(zip(_INFO_COLUMNS, row))
+        info["settings"] = json.loads(info["settings"] or "{}")
+        return info
+
+    def statistics(self):
+        """Aggregate counts over all projects in one query."""
+        count, scripts, assets = self.db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(script_count), 0), COALESCE(SUM(asset_count), 0) FROM projects").fetchone()
+        return {"total_projects": count, "total_scripts": scripts, "total_assets": assets,
+                "average_scripts": scripts / count if count else 0.0,
+                "average_assets": assets / count if count else 0.0}
@@ -4,6 +4,9 @@ import shutil
 from pathlib import Path
 from datetime import datetime
 
+from .blob_store import BlobStore, make_writable
+from .project_catalog import ProjectCatalog
+
 
 class ProjectManager:
     """Manages game projects - creation, loading, saving, and organization."""
@@ -13,22 +16,37 @@ class ProjectManager:
     SCENE_FILE = "scene.json"
     ASSETS_DIR = "assets"
     SCRIPTS_DIR = "scripts"
+    SCENES_DIR = "scenes"
+    BLOBS_DIR = ".blobs"
     
-    def __init__(self, base_path=None):
+    def __init__(self, base_path=None, shared_blobs=False):
         """Initialize ProjectManager.
         
         Args:
             base_path: Root directory for all projects. Defaults to ./projects
+            shared_blobs: Deduplicate assets/ and scripts/ across projects
+                through <base_path>/.blobs (copy-on-write clones; assets/
+                falls back to hardlinks where clones are unavailable)
         """
         if base_path is None:
             base_path = os.path.join(os.path.dirname(__file__), "..", self.PROJECTS_DIR)
         
         self.base_path = os.path.abspath(base_path)
         self.current_project = None
+        self._catalog = None
+        self.blobs = BlobStore(os.path.join(self.base_path, self.BLOBS_DIR)) if shared_blobs else None
         
         # Create projects directory if it doesn't exist
         os.makedirs(self.base_path, exist_ok=True)
     
+    @property
+    def catalog(self):
+        """SQLite index of all projects, opened on first use."""
+        if self._catalog is None:
+            self._catalog = ProjectCatalog(self.base_path, self.PROJECT_CONFIG_FILE, self.SCRIPTS_DIR,
+                                           self.ASSETS_DIR, self.SCENE_FILE, self.SCENES_DIR)
+        return self._catalog
+    
     def create_project(self, name, description="", width=1024, height=768):
         """Create a new game project.
         
@@ -55,6 +73,7 @@ class ProjectManager:
         os.makedirs(project_path, exist_ok=True)
         os.makedirs(os.path.join(project_path, self.ASSETS_DIR), exist_ok=True)
         os.makedirs(os.path.join(project_path, self.SCRIPTS_DIR), exist_ok=True)
+        os.makedirs(os.path.join(project_path, self.SCENES_DIR), exist_ok=True)
         
         # Create project metadata
         project_data = {
@@ -110,6 +129,8 @@ class ProjectManager:
         with open(scene_path, "w") as f:
             json.dump(default_scene, f, indent=2)
         
+        self._intern_blobs(project_path)
+        self.catalog.refresh_project(name)
         print(f"✓ Project '{name}' created successfully at {project_path}")
         return self._load_project_data(project_path)
     
@@ -154,26 +175,23 @@ class ProjectManager:
         config["scene_path"] = os.path.join(project_path, self.SCENE_FILE)
         config["assets_path"] = os.path.join(project_path, self.ASSETS_DIR)
         config["scripts_path"] = os.path.join(project_path, self.SCRIPTS_DIR)
+        config["scenes_path"] = os.path.join(project_path, self.SCENES_DIR)
         
         return config
     
     def list_projects(self):
         """List all available projects.
         
+        The projects root is only re-listed when its mtime changed.
+        
         Returns:
             list: List of project names
         """
         if not os.path.exists(self.base_path):
             return []
         
-        projects = []
-        for item in os.listdir(self.base_path):
-            item_path = os.path.join(self.base_path, item)
-            config_path = os.path.join(item_path, self.PROJECT_CONFIG_FILE)
-            if os.path.isdir(item_path) and os.path.exists(config_path):
-                projects.append(item)
-        
-        return sorted(projects)
+        self.catalog.refresh()
+        return self.catalog.names()
     
     def delete_project(self, name, confirm=True):
         """Delete a project.
@@ -193,7 +211,12 @@ class ProjectManager:
         if confirm and name != self.current_project.get("name", ""):
             print(f"Warning: Deleting project '{name}'")
         
-        shutil.rmtree(project_path)
+        # Посилання на спільні блоби, які треба перевірити після видалення
+        digests = [e["sha256"] for e in BlobStore.read_manifest(project_path).values()]
+        shutil.rmtree(project_path, onerror=make_writable)
+        self.catalog.remove(name)
+        if self.blobs and digests:
+            self.blobs.collect_garbage(digests)
         
         if self.current_project and self.current_project.get("name") == name:
             self.current_project = None
@@ -207,25 +230,28 @@ class ProjectManager:
         Args:
             name: Project name
             
+        Served from the catalog; project.json, scripts/, assets/ and scenes/
+        are only re-read when their mtimes changed. Does not change current_project.
+        
         Returns:
             dict: Project information
         """
-        project_data = self.load_project(name)
-        
-        info = {
-            "name": project_data["name"],
-            "description": project_data["description"],
-            "created": project_data["created"],
-            "modified": project_data["modified"],
-            "version": project_data["version"],
-            "settings": project_data["settings"],
-            "path": project_data["path"],
-            "scene_count": 1,  # Can extend for multiple scenes
-            "script_count": len(self._get_scripts(project_data["scripts_path"])),
-            "asset_count": len(self._get_assets(project_data["assets_path"]))
-        }
+        if not self.catalog.refresh_project(name):
+            raise FileNotFoundError(f"Project '{name}' not found")
         
-        return info
+        return self.catalog.info(name)
+    
+    def get_statistics(self, deep=True):
+        """Get aggregate counts over all projects.
+        
+        Args:
+            deep: Also re-check every project's mtimes (four stats per project)
+            
+        Returns:
+            dict: total_projects, total_scripts, total_assets, average_scripts, average_assets
+        """
+        self.catalog.refresh(deep=deep)
+        return self.catalog.statistics()
     
     def _get_scripts(self, scripts_path):
         """Get all scripts in project.
@@ -293,16 +319,22 @@ class ProjectManager:
         
         # Update current project
         self.current_project = self._load_project_data(config_path)
+        self.catalog.refresh_project(os.path.basename(config_path))
         
         print("✓ Project settings saved")
         return self.current_project
     
-    def export_project(self, name, export_path):
+    def export_project(self, name, export_path, workers=None, progress=None):
         """Export project as ZIP archive.
         
+        Files are compressed in parallel; PNG/JPEG and other compressed
+        formats are stored without recompression.
+        
         Args:
             name: Project name
             export_path: Path to export ZIP file
+            workers: Number of compression threads. Defaults to CPU count
+            progress: Optional callback(done_bytes, total_bytes, file_name)
             
         Returns:
             str: Path to exported file
@@ -312,18 +344,25 @@ class ProjectManager:
         if not os.path.exists(project_path):
             raise FileNotFoundError(f"Project '{name}' not found")
         
-        export_name = os.path.splitext(export_path)[0]
-        archive_path = shutil.make_archive(export_name, "zip", project_path)
+        from . import project_archive  # zipfile/concurrent.futures лише для архівів
+        archive_path = os.path.abspath(os.path.splitext(export_path)[0] + ".zip")
+        project_archive.export_archive(project_path, archive_path, workers=workers, progress=progress)
         
         print(f"✓ Project exported to {archive_path}")
         return archive_path
     
-    def import_project(self, zip_path, project_name=None):
+    def import_project(self, zip_path, project_name=None, workers=None, progress=None):
         """Import project from ZIP archive.
         
+        The archive must contain project.json and no paths outside the
+        project; it is extracted in parallel into a temporary directory
+        that is renamed into place when complete.
+        
         Args:
             zip_path: Path to ZIP file
             project_name: Name for imported project. Defaults to archive name
+            workers: Number of extraction threads. Defaults to CPU count
+            progress: Optional callback(done_bytes, total_bytes, file_name)
             
         Returns:
             dict: Project data
@@ -336,12 +375,99 @@ class ProjectManager:
         
         project_path = os.path.join(self.base_path, project_name)
         
+        if os.path.exists(project_path):
+            raise FileExistsError(f"Project '{project_name}' already exists at {project_path}")
+        
+        from . import project_archive
         # Extract zip
-        shutil.unpack_archive(zip_path, project_path)
+        project_archive.import_archive(zip_path, project_path, self.PROJECT_CONFIG_FILE,
+                                       workers=workers, progress=progress)
+        self._intern_blobs(project_path)
+        self.catalog.refresh_project(project_name)
         
         print(f"✓ Project imported as '{project_name}'")
         return self._load_project_data(project_path)
     
+    def _intern_blobs(self, project_path):
+        if self.blobs:
+            # scripts/ редагуються на місці, тож hardlink (спільний inode) лише для assets/
+            self.blobs.intern_project(project_path, (self.ASSETS_DIR, self.SCRIPTS_DIR),
+                                      hardlink_dirs=(self.ASSETS_DIR,))
+    
+    def deduplicate_projects(self):
+        """Move assets/ and scripts/ of every project into the shared blob store.
+        
+        Returns:
+            dict: Blob store statistics
+        """
+        if not self.blobs:
+            raise RuntimeError("Shared blob store is not enabled")
+        
+        for name in self.list_projects():
+            self._intern_blobs(os.path.join(self.base_path, name))
+        
+        stats = self.blobs.stats()
+        print(f"✓ {stats['blobs']} blobs shared by {stats['references']} files, {stats['bytes_saved']} bytes saved")
+        return stats
+    
+    def verify_blobs(self):
+        """Re-hash every project's shared files and detach the ones modified in place.
+        
+        Returns:
+            int: Number of manifest entries dropped
+        """
+        if not self.blobs:
+            return 0
+        
+        dropped = 0
+        for name in self.list_projects():
+            path = os.path.join(self.base_path, name)
+            before = len(BlobStore.read_manifest(path))
+            dropped += before - len(self.blobs.verify_project(path))
+        print(f"✓ Blob store verified, {dropped} modified files detached")
+        return dropped
+    
+    def collect_garbage(self):
+        """Remove blobs that no project references.
+        
+        Returns:
+            tuple: (removed blob count, freed bytes)
+        """
+        if not self.blobs:
+            return 0, 0
+        
+        removed, freed = self.blobs.collect_garbage()
+        print(f"✓ Removed {removed} unreferenced blobs ({freed} bytes)")
+        return removed, freed
+    
+    def backup_project(self, name, backup_dir=None, workers=None, progress=None):
+        """Store an incremental content-addressed snapshot of a project.
+        
+        Only files that changed since the previous snapshot are written.
+        
+        Args:
+            name: Project name
+            backup_dir: Backup store. Defaults to <projects>/.backups/<name>
+            workers: Number of hashing threads. Defaults to CPU count
+            progress: Optional callback(done_bytes, total_bytes, file_name)
+            
+        Returns:
+            dict: Snapshot name and counts of files and new objects
+        """
+        project_path = os.path.join(self.base_path, name)
+        
+        if not os.path.exists(project_path):
+            raise FileNotFoundError(f"Project '{name}' not found")
+        
+        if backup_dir is None:
+            backup_dir = os.path.join(self.base_path, ".backups", name)
+        
+        from . import project_archive
+        result = project_archive.backup_project(project_path, backup_dir, workers=workers, progress=progress)
+        
+        print(f"✓ Backup {result['snapshot']}: {result['new_objects']} new of {result['files']} files")
+        return result
+    
     def create_script_template(self, script_name):
         """Create a new script template in current project.
         
@@ -417,6 +543,52 @@ class {self._to_class_name(script_name)}:
         """
         return self.current_project["path"] if self.current_project else None
     
+    def list_scenes(self, project=None):
+        """List a project's scene files.
+        
+        Args:
+            project: Project data; defaults to the current project
+            
+        Returns:
+            list: Paths, scene.json first, then scenes/*.json sorted by name
+        """
+        project = project or self.current_project
+        if not project:
+            raise RuntimeError("No project loaded")
+        
+        scenes = [project["scene_path"]] if os.path.exists(project["scene_path"]) else []
+        scenes_path = project["scenes_path"]
+        if os.path.isdir(scenes_path):
+            scenes.extend(os.path.join(scenes_path, f) for f in sorted(os.listdir(scenes_path)) if f.endswith(".json"))
+        return scenes
+    
+    def create_scene(self, scene_name):
+        """Create an empty scene in the current project's scenes/ directory.
+        
+        Args:
+            scene_name: Name of the scene (without .json extension)
+            
+        Returns:
+            str: Path to created scene
+        """
+        if not self.current_project:
+            raise RuntimeError("No project loaded")
+        if not scene_name or len(scene_name.strip()) == 0:
+            raise ValueError("Scene name cannot be empty")
+        
+        scenes_path = self.current_project["scenes_path"]
+        scene_path = os.path.join(scenes_path, f"{scene_name}.json")
+        if os.path.exists(scene_path):
+            raise FileExistsError(f"Scene '{scene_name}' already exists at {scene_path}")
+        
+        os.makedirs(scenes_path, exist_ok=True)
+        with open(scene_path, "w") as f:
+            json.dump({"scene": {"name": scene_name, "objects": []}}, f, indent=2)
+        
+        self.catalog.refresh_project(os.path.basename(self.current_project["path"]))
+        print(f"✓ Scene created: {scene_path}")
+        return scene_path
+    
     def get_project_scene_path(self):
         """Get path to current project's scene file.
         
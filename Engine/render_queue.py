@@ -0,0 +1,77 @@
+"""
+Render queue - 64-bit sort keys and radix-sorted draw order
+
+Opaque key:      [0][shader:7][texture:16][mesh:16][depth:24]   front-to-back
+Transparent key: [1][depth:24 inverted][shader:7][texture:16][mesh:16]  back-to-front
+
+Opaque draws are grouped by state first so program/texture/VAO binds are
+shared; transparent draws must be ordered by depth first for blending.
+"""
+
+import numpy as np
+
+DEPTH_BITS = 24
+DEPTH_MAX = (1 << DEPTH_BITS) - 1
+TRANSPARENT_BIT = np.uint64(1 << 63)
+
+
+def quantize_depth(depth, near, far):
+    span = far - near if far > near else 1.0
+    q = np.clip((depth - near) / span, 0.0, 1.0) * DEPTH_MAX
+    return q.astype(np.uint64)
+
+
+def build_sort_keys(transparent, shader, texture, mesh, depth, near=0.1, far=100.0):
+    """Pack per-draw state into uint64 sort keys (all inputs are 1-D arrays)."""
+    transparent = np.asarray(transparent, dtype=bool)
+    shader = np.asarray(shader, dtype=np.uint64) & np.uint64(0x7F)
+    texture = np.asarray(texture, dtype=np.uint64) & np.uint64(0xFFFF)
+    mesh = np.asarray(mesh, dtype=np.uint64) & np.uint64(0xFFFF)
+    d = quantize_depth(np.asarray(depth, dtype=np.float64), near, far)
+
+    opaque = (shader << np.uint64(56)) | (texture << np.uint64(40)) | (mesh << np.uint64(24)) | d
+    blended = (TRANSPARENT_BIT | ((np.uint64(DEPTH_MAX) - d) << np.uint64(39)) |
+               (shader << np.uint64(32)) | (texture << np.uint64(16)) | mesh)
+    return np.where(transparent, blended, opaque)
+
+
+def radix_argsort(keys):
+    """Stable LSD radix sort of uint64 keys in four 16-bit passes.
+
+    NumPy's stable argsort is a radix sort for 16-bit integers, so each pass
+    is linear; passes whose digit is constant are skipped.
+    """
+    keys = np.asarray(keys, dtype=np.uint64)
+    order = np.arange(len(keys))
+    for shift in (0, 16, 32, 48):
+        digit = ((keys[order] >> np.uint64(shift)) & np.uint64(0xFFFF)).astype(np.uint16)
+        if len(digit) < 2 or digit.min() == digit.max():
+            continue
+        order = order[np.argsort(digit, kind="stable")]
+    return order
+
+
+class RenderQueue:
+    """Orders mesh renders by sort key and tracks how many binds were needed."""
+
+    def __init__(self):
+        self.stats = {"draws": 0, "program_binds": 0, "vao_binds": 0, "texture_binds": 0, "transparent": 0}
+
+    def sort(self, renders, program, camera):
+        """Return (ordered renders, index of the first transparent draw)."""
+        n = len(renders)
+        if n == 0:
+            return [], 0
+        transparent = np.fromiter((r.color[3] < 1.0 for r in renders), dtype=bool, count=n)
+        mesh = np.fromiter((r._gpu[0] for r in renders), dtype=np.uint64, count=n)
+        z = np.fromiter((r.transform.z for r in renders), dtype=np.float64, count=n)
+        # Камера дивиться вздовж -Z, тож глибина - відстань від її площини
+        depth = camera.pos[2] - z
+        texture = np.zeros(n, dtype=np.uint64)
+        shader = np.full(n, program, dtype=np.uint64)
+
+        keys = build_sort_keys(transparent, shader, texture, mesh, depth, camera.near, camera.far)
+        order = radix_argsort(keys)
+        first_transparent = n - int(transparent.sum())
+        self.stats["transparent"] = n - first_transparent
+        return [renders[i] for i in order.tolist()], first_transparent
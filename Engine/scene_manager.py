@@ -0,0 +1,250 @@
+"""
+Scene manager - background preloading, budgeted switching and additive chunks
+
+    scenes = SceneManager(engine, project["path"])
+    scenes.open(project["scene_path"])          # first scene, synchronous
+    scenes.preload("scenes/level2.json")        # parse + geometry on a worker thread
+    scenes.switch("scenes/level2.json")         # uploads spread over frames, then one swap
+    scenes.load_additive("scenes/cave.json")    # chunk on top of the active scene
+    scenes.unload("scenes/cave.json")
+
+Parsing and building Renders (vertex data, scripts) happens off the GL
+thread. ``update`` must be called once per frame from the thread that
+owns the GL context: it uploads prepared geometry until the frame's byte
+budget is spent, and only when a scene is fully uploaded does it replace
+the draw list (switch) or attach the chunk, so nothing appears half
+built. GPU data of unloaded scenes is released over the next frames.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from ECS.scene import Scene
+from .memory import memory_tracker
+
+DEFAULT_UPLOAD_BUDGET = 4 * 1024 * 1024  # байтів вершин/індексів за кадр
+DEFAULT_RELEASE_BUDGET = 512  # рендерів, чиї GPU-дані звільняються за кадр
+
+
+def prepare_scene(path, assets_path=None):
+    """Load a scene file and build its Renders without touching GL (runs on the worker)."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Scene file not found: {path}")
+    scene = Scene.load(path, assets_path)
+    scene.prepare()
+    return scene
+
+
+class _SceneLoad:
+    """One queued switch or chunk load."""
+
+    __slots__ = ("path", "additive", "future", "scene", "renders", "uploaded")
+
+    def __init__(self, path, additive, future):
+        self.path = path
+        self.additive = additive
+        self.future = future
+        self.scene = None
+        self.renders = None
+        self.uploaded = 0
+
+
+class SceneManager:
+    """Active scene plus additive chunks, with loads streamed in the background.
+
+    Relative scene paths are resolved against root (the project directory).
+    ``on_switch`` callbacks receive the new active scene.
+    """
+
+    def __init__(self, engine, root=None, assets_path=None, upload_budget=DEFAULT_UPLOAD_BUDGET,
+                 release_budget=DEFAULT_RELEASE_BUDGET):
+        self.engine = engine
+        self.root = root
+        self.assets_path = assets_path
+        self.upload_budget = upload_budget
+        self.release_budget = release_budget
+        self.scene = None
+        self.chunks = {}      # шлях -> Scene
+        self.on_switch = []
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pof-scene")
+        self._preloaded = {}  # шлях -> Future з підготовленою сценою
+        self._loads = deque()
+        self._releases = deque()
+        self.uploaded_bytes = 0
+
+    def resolve(self, path):
+        if self.root is not None and not os.path.isabs(path):
+            path = os.path.join(self.root, path)
+        return os.path.normcase(os.path.abspath(path))
+
+    # --- Завантаження ---
+
+    def open(self, path):
+        """Load and spawn a scene synchronously as the active scene (startup)."""
+        path = self.resolve(path)
+        # Знімки tracemalloc лише з POF_TRACE_MEMORY=1, інакше це порожні контексти
+        with memory_tracker.snapshot("scene.load"):
+            scene = Scene.load(path, self.assets_path)
+        with memory_tracker.snapshot("scene.spawn"):
+            renders = scene.prepare()
+            for render in renders:
+                self.engine.prepare_render(render)
+            self._activate(scene, renders, additive=False)
+        return scene
+
+    def preload(self, path):
+        """Start parsing a scene in the background; switch/load_additive reuse the result."""
+        path = self.resolve(path)
+        future = self._preloaded.get(path)
+        if future is None:
+            future = self._preloaded[path] = self._pool.submit(prepare_scene, path, self.assets_path)
+        return future
+
+    def is_preloaded(self, path):
+        future = self._preloaded.get(self.resolve(path))
+        return future is not None and future.done()
+
+    def _queue(self, path, additive):
+        path = self.resolve(path)
+        for load in self._loads:
+            if load.path == path and load.additive == additive:
+                return load
+        future = self._preloaded.pop(path, None) or self._pool.submit(prepare_scene, path, self.assets_path)
+        load = _SceneLoad(path, additive, future)
+        self._loads.append(load)
+        return load
+
+    def switch(self, path):
+        """Replace the active scene and all chunks once path is parsed and uploaded."""
+        return self._queue(path, additive=False)
+
+    def load_additive(self, path):
+        """Add path as a chunk next to the active scene once it is parsed and uploaded."""
+        if self.resolve(path) in self.chunks:
+            return None
+        return self._queue(path, additive=True)
+
+    def unload(self, path):
+        """Remove a chunk (or cancel its pending load).
+
+        Returns:
+            bool: True if something was unloaded or cancelled
+        """
+        path = self.resolve(path)
+        for load in list(self._loads):
+            if load.path == path and load.additive:
+                self._loads.remove(load)
+                self._release_load(load)
+                return True
+        scene = self.chunks.pop(path, None)
+        if scene is None:
+            return False
+        renders = self._scene_renders(scene)
+        for render in renders:
+            self.engine.detach_render(render)
+        self._releases.extend(renders)
+        return True
+
+    # --- Кадр ---
+
+    def update(self):
+        """Upload queued scene data within the frame budget and apply finished loads.
+
+        At least one render is uploaded per call so huge meshes still make
+        progress. Returns the number of bytes uploaded.
+        """
+        spent = 0
+        while self._loads and spent < self.upload_budget:
+            load = self._loads[0]
+            if load.renders is None:
+                if not load.future.done():
+                    break
+                try:
+                    load.scene = load.future.result()
+                except Exception as e:
+                    print(f"✗ Failed to load scene {load.path}: {e}")
+                    self._loads.popleft()
+                    continue
+                load.renders = [obj.render for obj in load.scene.objects if obj.render]
+            renders = load.renders
+            while load.uploaded < len(renders) and spent < self.upload_budget:
+                spent += self.engine.prepare_render(renders[load.uploaded])
+                load.uploaded += 1
+            if load.uploaded < len(renders):
+                break
+            self._loads.popleft()
+            self._activate(load.scene, renders, load.additive)
+
+        for _ in range(min(self.release_budget, len(self._releases))):
+            self.engine.release_render(self._releases.popleft())
+        self.uploaded_bytes += spent
+        return spent
+
+    def update_scenes(self, dt, profiler=None):
+        """Run scripts and deferred commands of the active scene and every chunk."""
+        if self.scene is not None:
+            self.scene.update(self.engine, dt, profiler)
+        for chunk in list(self.chunks.values()):
+            chunk.update(self.engine, dt, profiler)
+
+    def _activate(self, scene, renders, additive):
+        scene.manager = self
+        if additive:
+            for render in renders:
+                self.engine.attach_render(render)
+            self.chunks[self.resolve(scene.path)] = scene
+            print(f"✓ Scene chunk '{scene.name}' loaded ({len(renders)} objects)")
+            return
+        old = [self.scene] if self.scene is not None else []
+        old.extend(self.chunks.values())
+        self.chunks = {}
+        for previous in old:
+            previous.manager = None
+            self._releases.extend(self._scene_renders(previous))
+        # Один обмін списку замість тисяч detach/attach
+        self.engine.set_renders(renders)
+        self.scene = scene
+        for callback in self.on_switch:
+            callback(scene)
+        print(f"✓ Scene '{scene.name}' active ({len(renders)} objects)")
+
+    @staticmethod
+    def _scene_renders(scene):
+        """Every Render owned by scene: objects, runtime spawns and pooled instances."""
+        renders = [obj.render for obj in scene.objects if obj.render]
+        renders.extend(obj.render for obj in scene.spawned.values() if obj.render)
+        for pool in scene.pools.values():
+            renders.extend(obj.render for obj in pool.trim(0) if obj.render)
+        scene.spawned = {}
+        return renders
+
+    def _release_load(self, load):
+        if load.renders is not None:
+            self._releases.extend(load.renders[:load.uploaded])
+        else:
+            load.future.cancel()
+
+    # --- Стан ---
+
+    def pending(self):
+        """Queued loads as [{"path", "additive", "ready", "uploaded", "total"}]."""
+        return [{"path": load.path, "additive": load.additive, "ready": load.renders is not None,
+                 "uploaded": load.uploaded, "total": len(load.renders) if load.renders is not None else None}
+                for load in self._loads]
+
+    def scenes(self):
+        return ([self.scene] if self.scene is not None else []) + list(self.chunks.values())
+
+    def shutdown(self):
+        """Stop the worker and free everything still queued for release (before engine.terminate)."""
+        # cancel_futures у shutdown() лише з Python 3.9 - скасовуємо чергу самі
+        for future in self._preloaded.values():
+            future.cancel()
+        for load in self._loads:
+            self._release_load(load)
+        self._pool.shutdown(wait=False)
+        self._loads.clear()
+        self._preloaded.clear()
+        while self._releases:
+            self.engine.release_render(self._releases.popleft())
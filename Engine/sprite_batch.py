@@ -0,0 +1,134 @@
+"""
+Sprite batching - one draw call per texture for all textured quads
+"""
+
+import ctypes
+
+import numpy as np
+from OpenGL.GL import *
+
+from .memory import gl_memory
+from .uniform_buffer import FRAME_BLOCK_GLSL
+
+SPRITE_VERTEX_SRC = """
+#version 330 core
+""" + FRAME_BLOCK_GLSL + """
+layout (location = 0) in vec3 aPos;
+layout (location = 1) in vec2 aTexCoord;
+layout (location = 2) in vec4 aColor;
+out vec2 TexCoord;
+out vec4 Color;
+void main() {
+    gl_Position = uViewProj * vec4(aPos, 1.0);
+    TexCoord = aTexCoord;
+    Color = aColor;
+}
+"""
+
+SPRITE_FRAGMENT_SRC = """
+#version 330 core
+in vec2 TexCoord;
+in vec4 Color;
+out vec4 FragColor;
+uniform sampler2D uTexture;
+void main() {
+    FragColor = texture(uTexture, TexCoord) * Color;
+}
+"""
+
+FLOATS_PER_VERTEX = 9  # pos(3) + uv(2) + color(4)
+_QUAD_CORNERS = np.array([[-0.5, -0.5], [0.5, -0.5], [0.5, 0.5], [-0.5, 0.5]], dtype=np.float32)
+_QUAD_INDICES = np.array([0, 1, 2, 0, 2, 3], dtype=np.uint32)
+
+
+def build_sprite_vertices(renders):
+    """Build interleaved world-space quad vertices for a list of sprite renders.
+
+    Returns:
+        np.ndarray: float32 array of shape (len(renders) * 4, FLOATS_PER_VERTEX)
+    """
+    n = len(renders)
+    mats = np.array([r.transform.to_mat4() for r in renders], dtype=np.float32).reshape(n, 4, 4)
+    sizes = np.array([(r.sprite.width, r.sprite.height) for r in renders], dtype=np.float32)
+    uvs = np.array([r.sprite.uv for r in renders], dtype=np.float32)
+    colors = np.array([r.color for r in renders], dtype=np.float32)
+
+    local = np.zeros((n, 4, 3), dtype=np.float32)
+    local[:, :, :2] = _QUAD_CORNERS[None, :, :] * sizes[:, None, :]
+    # mats[n, стовпець, рядок] - матриці по стовпцях
+    world = np.einsum("nvc,ncr->nvr", local, mats[:, :3, :3]) + mats[:, None, 3, :3]
+
+    out = np.empty((n, 4, FLOATS_PER_VERTEX), dtype=np.float32)
+    out[:, :, 0:3] = world
+    u0, v0, u1, v1 = uvs[:, 0], uvs[:, 1], uvs[:, 2], uvs[:, 3]
+    out[:, 0, 3], out[:, 0, 4] = u0, v1
+    out[:, 1, 3], out[:, 1, 4] = u1, v1
+    out[:, 2, 3], out[:, 2, 4] = u1, v0
+    out[:, 3, 3], out[:, 3, 4] = u0, v0
+    out[:, :, 5:9] = colors[:, None, :]
+    return out.reshape(n * 4, FLOATS_PER_VERTEX)
+
+
+def build_quad_indices(count):
+    return (np.arange(count, dtype=np.uint32)[:, None] * 4 + _QUAD_INDICES[None, :]).ravel()
+
+
+class SpriteBatch:
+    """Streams sprite quads into one dynamic buffer and draws them per texture."""
+
+    def __init__(self, program):
+        self.program = program
+        self.vao = glGenVertexArrays(1)
+        self.vbo = glGenBuffers(1)
+        self.ebo = glGenBuffers(1)
+        self._index_capacity = 0
+        self.draw_calls = 0
+
+        glBindVertexArray(self.vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        stride = FLOATS_PER_VERTEX * 4
+        glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(0)
+        glVertexAttribPointer(1, 2, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(3 * 4))
+        glEnableVertexAttribArray(1)
+        glVertexAttribPointer(2, 4, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(5 * 4))
+        glEnableVertexAttribArray(2)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ebo)
+        glBindVertexArray(0)
+
+    def _ensure_indices(self, count):
+        if count <= self._index_capacity:
+            return
+        capacity = max(count, self._index_capacity * 2, 256)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, capacity * 6 * 4, build_quad_indices(capacity), GL_STATIC_DRAW)
+        gl_memory.allocate("sprites", self.ebo, capacity * 6 * 4)
+        self._index_capacity = capacity
+
+    def draw(self, renders):
+        """Draw sprite renders grouped by texture, one glDrawElements per group."""
+        self.draw_calls = 0
+        if not renders:
+            return
+        batches = {}
+        for r in renders:
+            batches.setdefault(r.sprite.texture_id, []).append(r)
+
+        glUseProgram(self.program)
+        glUniform1i(glGetUniformLocation(self.program, "uTexture"), 0)
+        glActiveTexture(GL_TEXTURE0)
+        glBindVertexArray(self.vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        self._ensure_indices(max(len(items) for items in batches.values()))
+
+        for texture_id, items in batches.items():
+            verts = build_sprite_vertices(items)
+            glBufferData(GL_ARRAY_BUFFER, verts.nbytes, verts, GL_STREAM_DRAW)
+            glBindTexture(GL_TEXTURE_2D, texture_id)
+            glDrawElements(GL_TRIANGLES, len(items) * 6, GL_UNSIGNED_INT, None)
+            self.draw_calls += 1
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+    def delete(self):
+        glDeleteVertexArrays(1, [self.vao])
+        glDeleteBuffers(2, [self.vbo, self.ebo])
+        gl_memory.free("sprites", self.ebo)
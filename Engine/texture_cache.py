@@ -0,0 +1,143 @@
+"""
+Texture import cache - source images converted once to raw RGBA files
+
+Cache files live in ``<project>/.cache/textures`` and are named after the
+source content hash plus the import settings. Each file is a 16-byte header
+followed by tightly packed RGBA8 mip levels, so loading is an ``mmap``.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+MAGIC = b"POFT"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII")  # magic, version, levels, width, height
+
+
+def mip_sizes(width, height, levels):
+    sizes = []
+    for _ in range(levels):
+        sizes.append((width, height))
+        width, height = max(1, width // 2), max(1, height // 2)
+    return sizes
+
+
+def mip_count(width, height):
+    return max(width, height).bit_length()
+
+
+class CachedTexture:
+    """Memory-mapped cache file; ``levels`` holds (width, height, memoryview)."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, width, height = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"Not a texture cache file: {path}")
+        self.width = width
+        self.height = height
+        self.levels = []
+        view = memoryview(self._mm)
+        offset = HEADER.size
+        for w, h in mip_sizes(width, height, count):
+            size = w * h * 4
+            self.levels.append((w, h, view[offset:offset + size]))
+            offset += size
+        self.nbytes = offset - HEADER.size
+
+    def close(self):
+        self.levels = []
+        try:
+            self._mm.close()
+        except BufferError:
+            pass  # ще є живі view; mmap закриється разом з ними
+
+
+class TextureCache:
+    """Converts source images to the raw cache format and maps them back.
+
+    A small index (path -> mtime, size, sha256) avoids rehashing unchanged
+    sources on every run.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_dir, mipmaps=False):
+        self.cache_dir = cache_dir
+        self.mipmaps = mipmaps
+        self._lock = threading.Lock()
+        self._index_path = os.path.join(cache_dir, self.INDEX_FILE)
+        self._index = {}
+        os.makedirs(cache_dir, exist_ok=True)
+        if os.path.exists(self._index_path):
+            try:
+                with open(self._index_path, "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+
+    def settings_key(self):
+        return f"v{VERSION}-{'mip' if self.mipmaps else 'base'}"
+
+    def _content_hash(self, path):
+        st = os.stat(path)
+        key = os.path.abspath(path)
+        with self._lock:
+            entry = self._index.get(key)
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            return entry[2]
+
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        with self._lock:
+            self._index[key] = [st.st_mtime_ns, st.st_size, digest]
+            self._save_index()
+        return digest
+
+    def _save_index(self):
+        tmp = f"{self._index_path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp, self._index_path)
+
+    def cache_path(self, source_path):
+        return os.path.join(self.cache_dir, f"{self._content_hash(source_path)}-{self.settings_key()}.rgba")
+
+    def import_image(self, source_path):
+        """Convert source_path into the cache (if needed) and return the cache file path."""
+        target = self.cache_path(source_path)
+        if os.path.exists(target):
+            return target
+        if not Image:
+            raise RuntimeError("PIL not installed. Install with: pip install Pillow")
+
+        img = Image.open(source_path).convert("RGBA")
+        levels = mip_count(img.width, img.height) if self.mipmaps else 1
+        tmp = f"{target}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, levels, img.width, img.height))
+            level = img
+            for w, h in mip_sizes(img.width, img.height, levels):
+                if level.size != (w, h):
+                    level = level.resize((w, h), Image.BOX)
+                f.write(level.tobytes())
+        os.replace(tmp, target)
+        return target
+
+    def load(self, source_path):
+        """Return a CachedTexture for source_path, importing it on first use."""
+        return CachedTexture(self.import_image(source_path))
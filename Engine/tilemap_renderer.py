@@ -0,0 +1,199 @@
+"""
+Tilemap rendering - one static VBO per chunk, re-meshed only when dirty
+"""
+
+import ctypes
+
+import numpy as np
+from OpenGL.GL import *
+
+from ECS.tilemap import FLOATS_PER_VERTEX
+from .memory import gl_memory
+from .uniform_buffer import FRAME_BLOCK_GLSL
+
+TILEMAP_VERTEX_SRC = """
+#version 330 core
+""" + FRAME_BLOCK_GLSL + """
+layout (location = 0) in vec3 aPos;
+layout (location = 1) in vec2 aTexCoord;
+uniform mat4 uModel;
+out vec2 TexCoord;
+void main() {
+    gl_Position = uViewProj * uModel * vec4(aPos, 1.0);
+    TexCoord = aTexCoord;
+}
+"""
+
+TILEMAP_FRAGMENT_SRC = """
+#version 330 core
+in vec2 TexCoord;
+out vec4 FragColor;
+uniform sampler2D uTexture;
+uniform vec4 uColor;
+void main() {
+    FragColor = texture(uTexture, TexCoord) * uColor;
+}
+"""
+
+
+class _Tileset:
+    """Tile index -> (UV rect, texture slot) resolved against the atlas."""
+
+    def __init__(self, key, uv_table, slot_table, handles, owned):
+        self.key = key
+        self.uv_table = uv_table
+        self.slot_table = slot_table
+        self.handles = handles
+        self.owned = owned  # окремі (не атласні) текстури, які треба звільнити
+
+
+class TilemapRenderer:
+    """Keeps chunk meshes of every tilemap in sync and draws them.
+
+    GPU data is bound to the owning Render together with the Tilemap it
+    was built for. When apply_components replaces or drops ``render.tilemap``
+    the old map's chunks and textures are released on the next draw.
+    """
+
+    def __init__(self, program, engine):
+        self.program = program
+        self.engine = engine
+        self._uniforms = {n: glGetUniformLocation(program, n) for n in ("uModel", "uTexture", "uColor")}
+        # id(Render) -> (Render, Tilemap, _Tileset); Render тримається тут, тож id не перевикористається
+        self._bound = {}
+        self.chunks_built = 0
+        self.draw_calls = 0
+
+    def _resolve(self, render):
+        tilemap = render.tilemap
+        key = tuple(tilemap.tileset)
+        bound = self._bound.get(id(render))
+        if bound is not None and bound[1] is not tilemap:
+            self._release_bound(id(render))
+        elif bound is not None:
+            if bound[2].key == key:
+                return bound[2]
+            self._release_tileset(bound[2])
+
+        engine = self.engine
+        uv_table = np.zeros((len(key) + 1, 4), dtype=np.float32)
+        slot_table = np.full(len(key) + 1, -1, dtype=np.int64)
+        handles, slots, owned = [], {}, []
+        for i, path in enumerate(key, start=1):
+            region = engine.atlas.find(path) if engine.atlas_pages else None
+            if region:
+                handle = engine.atlas_pages[region["page"]]
+                uv_table[i] = region["uv"]
+            elif path:
+                # Тайл поза атласом - окрема текстура на весь UV
+                handle = engine.assets.acquire(path)
+                owned.append(handle)
+                uv_table[i] = (0.0, 0.0, 1.0, 1.0)
+            else:
+                continue
+            if id(handle) not in slots:
+                slots[id(handle)] = len(handles)
+                handles.append(handle)
+            slot_table[i] = slots[id(handle)]
+
+        ts = _Tileset(key, uv_table, slot_table, handles, owned)
+        self._bound[id(render)] = (render, tilemap, ts)
+        tilemap.mark_all_dirty()
+        return ts
+
+    def _release_tileset(self, ts):
+        for handle in ts.owned:
+            self.engine.assets.release(handle)
+        ts.owned = []
+
+    def _upload_chunk(self, tilemap, key, ts):
+        verts, indices, ranges = tilemap.build_chunk(key[0], key[1], ts.uv_table, ts.slot_table)
+        gpu = tilemap._gpu.get(key)
+        if not ranges:
+            if gpu:
+                self._delete_chunk(gpu)
+                del tilemap._gpu[key]
+            return
+        if gpu is None:
+            vao, vbo, ebo = glGenVertexArrays(1), glGenBuffers(1), glGenBuffers(1)
+            glBindVertexArray(vao)
+            glBindBuffer(GL_ARRAY_BUFFER, vbo)
+            stride = FLOATS_PER_VERTEX * 4
+            glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(0))
+            glEnableVertexAttribArray(0)
+            glVertexAttribPointer(1, 2, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(3 * 4))
+            glEnableVertexAttribArray(1)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
+        else:
+            vao, vbo, ebo, _ = gpu
+            glBindVertexArray(vao)
+            glBindBuffer(GL_ARRAY_BUFFER, vbo)
+        glBufferData(GL_ARRAY_BUFFER, verts.nbytes, verts, GL_STATIC_DRAW)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL_STATIC_DRAW)
+        gl_memory.allocate("tilemap", vbo, verts.nbytes + indices.nbytes)
+        glBindVertexArray(0)
+        tilemap._gpu[key] = (vao, vbo, ebo, ranges)
+        self.chunks_built += 1
+
+    @staticmethod
+    def _delete_chunk(gpu):
+        vao, vbo, ebo, _ = gpu
+        glDeleteVertexArrays(1, [vao])
+        glDeleteBuffers(2, [vbo, ebo])
+        gl_memory.free("tilemap", vbo)
+
+    def sync(self, render):
+        """Re-mesh the chunks of render.tilemap touched since the last sync."""
+        ts = self._resolve(render)
+        tilemap = render.tilemap
+        dirty = tilemap.take_dirty_chunks()
+        # Чанки поза межами (після зменшення карти) видаляємо
+        for key in [k for k in tilemap._gpu if k[0] >= tilemap.chunks_x or k[1] >= tilemap.chunks_y]:
+            self._delete_chunk(tilemap._gpu.pop(key))
+        for key in dirty:
+            self._upload_chunk(tilemap, key, ts)
+        return ts
+
+    def draw(self, renders):
+        self.draw_calls = 0
+        # Карти, які замінили або прибрали з Render після попереднього кадру
+        for key in [k for k, (r, tilemap, _) in self._bound.items() if r.tilemap is not tilemap]:
+            self._release_bound(key)
+        if not renders:
+            return
+        u = self._uniforms
+        glUseProgram(self.program)
+        glUniform1i(u["uTexture"], 0)
+        glActiveTexture(GL_TEXTURE0)
+        for r in renders:
+            tilemap = r.tilemap
+            ts = self.sync(r)
+            glUniformMatrix4fv(u["uModel"], 1, GL_FALSE, r.transform.to_mat4())
+            glUniform4f(u["uColor"], *r.color)
+            for vao, _, _, ranges in tilemap._gpu.values():
+                glBindVertexArray(vao)
+                for slot, first, count in ranges:
+                    glBindTexture(GL_TEXTURE_2D, ts.handles[slot].texture_id)
+                    glDrawElements(GL_TRIANGLES, count, GL_UNSIGNED_INT, ctypes.c_void_p(first * 4))
+                    self.draw_calls += 1
+        glBindVertexArray(0)
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+    def release(self, render):
+        """Free the chunks and textures built for render (no-op if none)."""
+        self._release_bound(id(render))
+
+    def _release_bound(self, key):
+        bound = self._bound.pop(key, None)
+        if bound is None:
+            return
+        _, tilemap, ts = bound
+        for gpu in tilemap._gpu.values():
+            self._delete_chunk(gpu)
+        tilemap._gpu.clear()
+        self._release_tileset(ts)
+        tilemap.mark_all_dirty()
+
+    def delete(self):
+        for key in list(self._bound):
+            self._release_bound(key)
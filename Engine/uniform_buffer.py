@@ -0,0 +1,75 @@
+"""
+Per-frame uniform buffer - camera and timing data shared by every program
+
+Layout (std140, 208 bytes):
+    offset   0  mat4 uView
+    offset  64  mat4 uProj
+    offset 128  mat4 uViewProj
+    offset 192  float uTime
+    offset 200  vec2 uResolution
+"""
+
+import numpy as np
+from OpenGL.GL import *
+
+FRAME_BINDING = 0
+FRAME_BLOCK_SIZE = 208
+_TIME_OFFSET = 192
+
+FRAME_BLOCK_GLSL = """
+layout(std140) uniform FrameData {
+    mat4 uView;
+    mat4 uProj;
+    mat4 uViewProj;
+    float uTime;
+    vec2 uResolution;
+};
+"""
+
+
+def pack_frame_data(view, proj, view_proj, time, width, height):
+    """Pack per-frame values into a std140 FrameData buffer."""
+    data = np.zeros(FRAME_BLOCK_SIZE // 4, dtype=np.float32)
+    data[0:16] = view
+    data[16:32] = proj
+    data[32:48] = view_proj
+    data[48] = time
+    data[50:52] = (width, height)  # vec2 вирівнюється на 8 байт
+    return data
+
+
+class FrameUniforms:
+    """Owns the FrameData buffer; matrices are re-uploaded only when the camera changed."""
+
+    def __init__(self, binding=FRAME_BINDING):
+        self.binding = binding
+        self.ubo = glGenBuffers(1)
+        self._camera_key = None
+        self.uploads = 0
+        glBindBuffer(GL_UNIFORM_BUFFER, self.ubo)
+        glBufferData(GL_UNIFORM_BUFFER, FRAME_BLOCK_SIZE, None, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+        glBindBufferBase(GL_UNIFORM_BUFFER, binding, self.ubo)
+
+    def attach(self, program):
+        """Bind program's FrameData block to the shared binding point."""
+        index = glGetUniformBlockIndex(program, "FrameData")
+        if index != GL_INVALID_INDEX:
+            glUniformBlockBinding(program, index, self.binding)
+
+    def update(self, camera, time):
+        view_proj = camera.get_view_projection_matrix()
+        key = (camera.version, camera.width, camera.height)
+        glBindBuffer(GL_UNIFORM_BUFFER, self.ubo)
+        if key != self._camera_key:
+            data = pack_frame_data(camera.get_view_matrix(), camera.get_projection_matrix(), view_proj,
+                                   time, camera.width, camera.height)
+            glBufferSubData(GL_UNIFORM_BUFFER, 0, data.nbytes, data)
+            self._camera_key = key
+            self.uploads += 1
+        else:
+            glBufferSubData(GL_UNIFORM_BUFFER, _TIME_OFFSET, 4, np.array([time], dtype=np.float32))
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+
+    def delete(self):
+        glDeleteBuffers(1, [self.ubo])
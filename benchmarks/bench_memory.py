@@ -0,0 +1,78 @@
+"""
+Memory benchmark - bytes per entity for Scene.spawn against the null renderer
+
+Usage:
+    python benchmarks/bench_memory.py [--count 100000] [--json]
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from ECS.scene import SHAPE_TYPES, Scene, SceneObject, default_render_component, default_transform_component
+from Engine.headless import HeadlessEngine
+
+
+def make_objects(count):
+    objects = []
+    for i in range(count):
+        shape_type = SHAPE_TYPES[i % len(SHAPE_TYPES)]
+        components = {"transform": default_transform_component(), "render": default_render_component(shape_type)}
+        if i % 4 == 0:
+            components["collider"] = {"width": 1.0, "height": 1.0, "is_solid": True, "mass": 1.0}
+        if i % 3 == 0:
+            components["rotation"] = {"speed_x": 0.0, "speed_y": 1.0, "speed_z": 0.0, "enabled": True}
+        objects.append(SceneObject(f"obj_{i}", f"Object {i}", components))
+    return objects
+
+
+def run(count):
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+
+    scene = Scene(objects=make_objects(count))
+    gc.collect()
+    after_load = tracemalloc.get_traced_memory()[0]
+
+    engine = HeadlessEngine()
+    scene.spawn(engine)
+    gc.collect()
+    after_spawn, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "count": count,
+        "scene_bytes_per_entity": (after_load - base) / count,
+        "runtime_bytes_per_entity": (after_spawn - after_load) / count,
+        "total_bytes_per_entity": (after_spawn - base) / count,
+        "peak_bytes": peak - base,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure bytes per spawned entity")
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--json", action="store_true", help="print machine-readable output")
+    args = parser.parse_args(argv)
+
+    result = run(args.count)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return result
+
+    print(f"Entities:            {result['count']}")
+    print(f"Scene data / entity: {result['scene_bytes_per_entity']:.0f} B")
+    print(f"Runtime / entity:    {result['runtime_bytes_per_entity']:.0f} B")
+    print(f"Total / entity:      {result['total_bytes_per_entity']:.0f} B")
+    print(f"Peak:                {result['peak_bytes'] / (1024 * 1024):.1f} MiB")
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Startup benchmark - import time per module via ``python -X importtime``
+
+Each target is imported in a fresh interpreter; the best of --repeat runs
+is reported. The selector path (``main``) must not pull in GL or imgui.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat 5] [--top 15] [--json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# модуль -> пакети, які він не має права імпортувати
+TARGETS = {
+    "main": ("OpenGL", "glfw", "imgui", "numpy"),
+    "Engine.project_manager": ("OpenGL", "glfw", "imgui", "numpy"),
+    "ECS.scene": ("OpenGL", "glfw", "imgui"),
+    "Engine.engine": (),
+}
+
+
+def measure(target):
+    """Import target once; returns {module: (self_us, cumulative_us)}."""
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {target}"],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed")
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def run(target, repeat):
+    best = None
+    for _ in range(repeat):
+        modules = measure(target)
+        if best is None or modules[target][1] < best[target][1]:
+            best = modules
+    forbidden = sorted({m for m in best for pkg in TARGETS.get(target, ())
+                        if m == pkg or m.startswith(pkg + ".")})
+    return {
+        "target": target,
+        "total_ms": best[target][1] / 1000.0,
+        "module_count": len(best),
+        "forbidden_imports": forbidden,
+        "modules": {name: {"self_ms": s / 1000.0, "cumulative_ms": c / 1000.0} for name, (s, c) in best.items()},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure import time of engine entry points")
+    parser.add_argument("targets", nargs="*", default=list(TARGETS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list per target")
+    parser.add_argument("--json", action="store_true", help="print machine-readable output")
+    args = parser.parse_args(argv)
+
+    results = []
+    for target in args.targets:
+        try:
+            results.append(run(target, args.repeat))
+        except RuntimeError as e:
+            results.append({"target": target, "error": str(e)})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return results
+
+    for result in results:
+        if "error" in result:
+            print(f"\n{result['target']}: not importable ({result['error']})")
+            continue
+        print(f"\n{result['target']}: {result['total_ms']:.1f} ms, {result['module_count']} modules")
+        if result["forbidden_imports"]:
+            print(f"  ✗ imports {', '.join(result['forbidden_imports'][:5])}")
+        slowest = sorted(result["modules"].items(), key=lambda kv: kv[1]["self_ms"], reverse=True)
+        for name, times in slowest[:args.top]:
+            print(f"  {times['self_ms']:8.2f} ms self {times['cumulative_ms']:8.2f} ms total  {name}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
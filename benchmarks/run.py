@@ -0,0 +1,334 @@
+"""
+Benchmark suite - engine hot paths at several scales with regression tracking
+
+Everything runs against HeadlessEngine (no window, no GL). Each case is
+timed --repeat times and the best run is kept.
+
+Usage:
+    python benchmarks/run.py                               # all cases, 100..100k
+    python benchmarks/run.py --scales 100,1000 --only scene_load,scene_spawn
+    python benchmarks/run.py --output results.json --baseline other_machine.json
+    python benchmarks/run.py --update-baseline             # store results as the new baseline
+
+Every run is compared to the stored baseline (benchmarks/baseline.json
+unless --baseline says otherwise); a case that is slower than
+baseline * (1 + --threshold) is a regression and the exit code is 1. A
+missing baseline file is an error (exit code 2). --update-baseline merges
+the measured cases into the baseline instead of comparing.
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from ECS import shapes
+from ECS.component import Collider
+from ECS.rotation import RotationComponent
+from ECS.scene import Scene, load_script_instance
+from ECS.transform import Transform
+from Engine.headless import HeadlessEngine
+from Engine.project_manager import ProjectManager
+from bench_memory import make_objects
+
+DEFAULT_SCALES = (100, 1000, 10000, 100000)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+SCRIPT_SOURCE = '''
+class BenchScript:
+    def on_start(self):
+        pass
+
+    def on_update(self):
+        pass
+'''
+
+
+def _time(fn, repeat, setup=None):
+    """Best wall time of fn() over repeat runs; setup() runs untimed before each."""
+    best = float("inf")
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            fn(arg) if setup else fn()
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best
+
+
+# --- Кейси: (scale, repeat, tmp) -> секунди ---
+
+def _scene_file(tmp, scale):
+    path = os.path.join(tmp, f"scene_{scale}.json")
+    if not os.path.exists(path):
+        Scene(objects=make_objects(scale), path=path).save()
+    return path
+
+
+def bench_scene_load(scale, repeat, tmp):
+    path = _scene_file(tmp, scale)
+    return _time(lambda: Scene.load(path), repeat)
+
+
+def bench_scene_save(scale, repeat, tmp):
+    scene = Scene.load(_scene_file(tmp, scale))
+    out = os.path.join(tmp, "saved.json")
+    return _time(lambda: scene.save(out), repeat)
+
+
+def bench_scene_spawn(scale, repeat, tmp):
+    path = _scene_file(tmp, scale)
+    return _time(lambda args: args[0].spawn(args[1]), repeat, setup=lambda: (Scene.load(path), HeadlessEngine()))
+
+
+def bench_transform_to_mat4(scale, repeat, tmp):
+    transforms = []
+    for i in range(scale):
+        t = Transform(i * 0.1, 0.0, 0.0, 1.0)
+        t.rotation_y = i * 0.01
+        transforms.append(t)
+    return _time(lambda: [t.to_mat4() for t in transforms], repeat)
+
+
+def bench_rotation_update(scale, repeat, tmp):
+    engine = HeadlessEngine()
+    Scene.load(_scene_file(tmp, scale)).spawn(engine)
+    system = engine.rotation_system
+    for render in engine.renderables:
+        render.rotation = RotationComponent(0.0, 0.0, 1.0)
+    system.rebuild(engine.renderables)
+    return _time(lambda: system.update(engine.renderables, 0.016), repeat)
+
+
+def bench_collisions(scale, repeat, tmp):
+    scene = Scene.load(_scene_file(tmp, scale))
+    scene.spawn(HeadlessEngine())
+    # У файлі сцени всі об'єкти в початку координат; колайдери розставляємо сіткою з перекриттям сусідів по x
+    transforms = [t for _, ts, _ in scene.world.query(Transform, Collider) for t in ts]
+    side = max(1, int(len(transforms) ** 0.5))
+    for k, t in enumerate(transforms):
+        t.x, t.y = (k % side) * 0.9, (k // side) * 2.0
+    return _time(lambda: scene.collisions.update(scene.world), repeat)
+
+
+def bench_shapes(scale, repeat, tmp):
+    makers = (shapes.Rectangle, shapes.Circle, shapes.Triangle, shapes.Polygon, shapes.Line, shapes.Cube)
+    return _time(lambda: [makers[i % len(makers)]() for i in range(scale)], repeat)
+
+
+def bench_engine_begin(scale, repeat, tmp):
+    engine = HeadlessEngine()
+    Scene.load(_scene_file(tmp, scale)).spawn(engine)
+    engine.begin()
+    return _time(engine.begin, repeat)
+
+
+def bench_input_update(scale, repeat, tmp):
+    """Engine.input.in_update needs a GLFW window; skipped when none can be created."""
+    try:
+        import glfw
+        import Engine.input as input_engine
+    except ImportError:
+        return None
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        if not glfw.init():
+            return None
+        glfw.window_hint(glfw.VISIBLE, glfw.FALSE)
+        window = glfw.create_window(64, 64, "bench", None, None)
+    if not window:
+        glfw.terminate()
+        return None
+    glfw.make_context_current(window)
+    try:
+        return _time(lambda: [input_engine.in_update() for _ in range(scale)], repeat)
+    finally:
+        glfw.destroy_window(window)
+        glfw.terminate()
+
+
+def bench_load_script_instance(scale, repeat, tmp):
+    path = os.path.join(tmp, "bench_script.py")
+    with open(path, "w") as f:
+        f.write(SCRIPT_SOURCE)
+    load_script_instance(path)
+    return _time(lambda: [load_script_instance(path) for _ in range(scale)], repeat)
+
+
+def _projects_root(tmp, scale):
+    root = os.path.join(tmp, f"projects_{scale}")
+    if not os.path.exists(root):
+        # Мінімальні проекти напряму, без create_project - щоб підготовка не тривала хвилинами
+        for i in range(scale):
+            path = os.path.join(root, f"project_{i:06d}")
+            os.makedirs(os.path.join(path, ProjectManager.SCRIPTS_DIR))
+            os.makedirs(os.path.join(path, ProjectManager.ASSETS_DIR))
+            with open(os.path.join(path, ProjectManager.PROJECT_CONFIG_FILE), "w") as f:
+                json.dump({"name": f"project_{i:06d}", "description": "", "created": "", "modified": "",
+                           "version": "0.1.0", "settings": {"width": 1024, "height": 768}}, f)
+    return root
+
+
+def bench_list_projects(scale, repeat, tmp):
+    root = _projects_root(tmp, scale)
+    ProjectManager(root).list_projects()
+    return _time(lambda: ProjectManager(root).list_projects(), repeat)
+
+
+def bench_list_projects_cold(scale, repeat, tmp):
+    root = _projects_root(tmp, scale)
+
+    def drop_catalog():
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(os.path.join(root, ".pof", "catalog.sqlite"))
+
+    return _time(lambda _: ProjectManager(root).list_projects(), repeat, setup=drop_catalog)
+
+
+# name -> (функція, найбільший масштаб або None, якщо без обмежень)
+CASES = {
+    "scene_load": (bench_scene_load, None),
+    "scene_save": (bench_scene_save, None),
+    "scene_spawn": (bench_scene_spawn, None),
+    "transform_to_mat4": (bench_transform_to_mat4, None),
+    "rotation_update": (bench_rotation_update, None),
+    "collisions": (bench_collisions, None),
+    "shapes": (bench_shapes, None),
+    "engine_begin": (bench_engine_begin, None),
+    "input_update": (bench_input_update, 10000),
+    "load_script_instance": (bench_load_script_instance, None),
+    "list_projects": (bench_list_projects, 10000),
+    "list_projects_cold": (bench_list_projects_cold, 10000),
+}
+
+
+def run(cases, scales, repeat, log=None):
+    tmp = tempfile.mkdtemp(prefix="pof_bench_")
+    results = []
+    try:
+        for name in cases:
+            fn, max_scale = CASES[name]
+            for scale in scales:
+                if max_scale is not None and scale > max_scale:
+                    continue
+                # Повідомлення рушія (✓ ...) не потрапляють у вивід бенчмарку
+                with contextlib.redirect_stdout(io.StringIO()):
+                    seconds = fn(scale, repeat, tmp)
+                result = {"name": name, "scale": scale, "seconds": seconds,
+                          "per_item_us": seconds * 1e6 / scale if seconds is not None else None}
+                results.append(result)
+                if log:
+                    log(result)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Annotate results with baseline ratios; returns the regressed entries."""
+    reference = {(r["name"], r["scale"]): r["seconds"] for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        base = reference.get((r["name"], r["scale"]))
+        if base and r["seconds"] is not None:
+            r["baseline_seconds"] = base
+            r["ratio"] = r["seconds"] / base
+            if r["ratio"] > 1.0 + threshold:
+                regressions.append(r)
+    return regressions
+
+
+def update_baseline(path, report):
+    """Write report to path, keeping stored cases that this run did not measure."""
+    merged = {}
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            merged = {(r["name"], r["scale"]): r for r in json.load(f).get("results", [])}
+    for r in report["results"]:
+        merged[(r["name"], r["scale"])] = {k: r[k] for k in ("name", "scale", "seconds", "per_item_us")}
+    order = {name: i for i, name in enumerate(CASES)}
+    stored = dict(report, results=sorted(merged.values(), key=lambda r: (order.get(r["name"], len(order)), r["scale"])))
+    with open(path, "w") as f:
+        json.dump(stored, f, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark engine hot paths")
+    parser.add_argument("--scales", default=",".join(str(s) for s in DEFAULT_SCALES))
+    parser.add_argument("--only", default=None, help="comma-separated case names")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=None, help="write results JSON here")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="compare against this results JSON "
+                                                                     "(default %(default)s)")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before flagging")
+    parser.add_argument("--update-baseline", action="store_true", help="merge results into --baseline")
+    parser.add_argument("--json", action="store_true", help="print machine-readable output")
+    args = parser.parse_args(argv)
+
+    cases = args.only.split(",") if args.only else list(CASES)
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)} (available: {', '.join(CASES)})")
+    scales = [int(s) for s in args.scales.split(",")]
+    baseline = None
+    if not args.update_baseline:
+        if not os.path.exists(args.baseline):
+            parser.error(f"baseline file not found: {args.baseline} (create it with --update-baseline)")
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+
+    def log(r):
+        if args.json:
+            return
+        if r["seconds"] is None:
+            print(f"{r['name']:<22} {r['scale']:>7}   skipped (no GLFW window)")
+        else:
+            print(f"{r['name']:<22} {r['scale']:>7} {r['seconds'] * 1000:10.2f} ms {r['per_item_us']:9.3f} us/item")
+
+    results = run(cases, scales, args.repeat, log)
+    report = {"python": platform.python_version(), "platform": platform.platform(),
+              "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "repeat": args.repeat, "results": results}
+
+    regressions = []
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        report["baseline"] = args.baseline
+        report["regressions"] = [{"name": r["name"], "scale": r["scale"], "ratio": r["ratio"]} for r in regressions]
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.update_baseline:
+        update_baseline(args.baseline, report)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    elif args.update_baseline:
+        print(f"✓ baseline updated: {args.baseline}")
+    else:
+        unmatched = [r for r in results if r["seconds"] is not None and "ratio" not in r]
+        if unmatched:
+            print(f"! {len(unmatched)} result(s) have no baseline entry (run --update-baseline to add them)")
+        for r in regressions:
+            print(f"✗ regression {r['name']} @ {r['scale']}: {r['ratio']:.2f}x baseline")
+        if not regressions:
+            print("✓ no regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
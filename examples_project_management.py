@@ -193,23 +193,15 @@ def list_project_scripts(project_name):
 def project_statistics():
     """Display statistics about all projects"""
     
-    projects = manager.list_projects()
-    
-    total_projects = len(projects)
-    total_scripts = 0
-    total_assets = 0
-    
-    for project_name in projects:
-        info = manager.get_project_info(project_name)
-        total_scripts += info['script_count']
-        total_assets += info['asset_count']
+    # Один запит до каталогу замість get_project_info для кожного проекту
+    stats = manager.get_statistics()
     
     print(f"\nProject Statistics:")
-    print(f"  Total Projects: {total_projects}")
-    print(f"  Total Scripts: {total_scripts}")
-    print(f"  Total Assets: {total_assets}")
-    print(f"  Average Scripts: {total_scripts / total_projects if total_projects > 0 else 0:.1f}")
-    print(f"  Average Assets: {total_assets / total_projects if total_projects > 0 else 0:.1f}")
+    print(f"  Total Projects: {stats['total_projects']}")
+    print(f"  Total Scripts: {stats['total_scripts']}")
+    print(f"  Total Assets: {stats['total_assets']}")
+    print(f"  Average Scripts: {stats['average_scripts']:.1f}")
+    print(f"  Average Assets: {stats['average_assets']:.1f}")
 
 # project_statistics()
 
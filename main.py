@@ -10,11 +10,7 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from Engine.engine import Engine
-from ECS.scene import Scene
-from Engine.editor import Editor
-import Engine.input as input_engine
-from Engine.project_manager import ProjectManager
+# Тільки легкі модулі: селектор проектів не повинен завантажувати glfw/PyOpenGL/imgui
 from Engine.project_ui import ProjectCreator
 
 
@@ -58,7 +54,15 @@ def run_with_project_selection():
 
 
 def main():
-    """Main application entry point."""
+    """Main application entry point.
+    
+    With command line arguments the batch CLI (Engine/cli.py) runs instead
+    of the interactive selector.
+    """
+    if len(sys.argv) > 1:
+        from Engine.cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
+    
     try:
         # Get project manager
         manager = run_with_project_selection()
@@ -67,67 +71,7 @@ def main():
             print("✗ No project loaded")
             return
         
-        project = manager.current_project
-        scene_path = project["scene_path"]
-        
-        print("\n" + "="*60)
-        print(f"  Running: {project['name']}")
-        print("="*60 + "\n")
-        
-        # Get engine settings from project
-        settings = project["settings"]
-        width = settings.get("width", 1024)
-        height = settings.get("height", 768)
-        title = f"POF Engine - {project['name']}"
-        fps = settings.get("target_fps", 60)
-        
-        # Initialize engine
-        engine = Engine(width, height, title)
-        
-        # Load scene
-        if not os.path.exists(scene_path):
-            print(f"✗ Scene file not found: {scene_path}")
-            return
-        
-        scene = Scene.load(scene_path)
-        scene.spawn(engine)
-        
-        # Initialize editor
-        editor = None
-        try:
-            editor = Editor(engine, scene, scene_path)
-            print("✓ Editor initialized")
-        except RuntimeError as exc:
-            print(f"⚠ Editor not available: {exc}")
-        
-        # Set default camera zoom
-        engine.camera.set_zoom(100.5)
-        
-        print(f"✓ Engine started - Press ESC to exit\n")
-        
-        # Main game loop
-        frame_count = 0
-        while not engine.should_close():
-            engine.begin()
-            input_engine.in_update()
-            
-            if editor:
-                editor.begin_frame()
-            
-            engine.draw()
-            
-            if editor:
-                editor.end_frame()
-            
-            engine.end()
-            frame_count += 1
-        
-        # Cleanup
-        if editor:
-            editor.shutdown()
-        engine.terminate()
-        
-        print(f"\n✓ Engine closed (ran {frame_count} frames)")
+        run_project(manager.current_project)
         
     except KeyboardInterrupt:
         print("\n\n✗ Application interrupted by user")
@@ -139,5 +83,105 @@ def main():
         sys.exit(1)
 
 
+def run_project(project):
+    """Open the engine window and run a loaded project until it is closed.
+    
+    Args:
+        project: Project data from ProjectManager.load_project
+    """
+    scene_path = project["scene_path"]
+    
+    print("\n" + "="*60)
+    print(f"  Running: {project['name']}")
+    print("="*60 + "\n")
+    
+    # GL, imgui і сцена потрібні лише після вибору проекту
+    from Engine.engine import Engine
+    from Engine.editor import Editor
+    from Engine.project_manager import ProjectManager
+    from Engine.scene_manager import SceneManager
+    import Engine.input as input_engine
+    from Engine.memory import memory_tracker
+    
+    # Get engine settings from project
+    settings = project["settings"]
+    width = settings.get("width", 1024)
+    height = settings.get("height", 768)
+    title = f"POF Engine - {project['name']}"
+    fps = settings.get("target_fps", 60)
+    
+    # Initialize engine
+    engine = Engine(width, height, title)
+    
+    # Load scene
+    if not os.path.exists(scene_path):
+        print(f"✗ Scene file not found: {scene_path}")
+        return
+    
+    engine.assets.use_cache(os.path.join(project["path"], ".cache", "textures"),
+                            mipmaps=settings.get("texture_mipmaps", False))
+    engine.load_atlas(project["assets_path"])
+    # Інші сцени проекту довантажуються у фоні (SceneManager.switch/load_additive)
+    scenes = SceneManager(engine, project["path"], project["assets_path"])
+    scene = scenes.open(scene_path)
+    
+    # Initialize editor
+    editor = None
+    try:
+        scene_paths = ProjectManager(os.path.dirname(project["path"])).list_scenes(project)
+        editor = Editor(engine, scene, scene.path, scenes, scene_paths)
+        scenes.on_switch.append(editor.set_scene)
+        print("✓ Editor initialized")
+    except RuntimeError as exc:
+        print(f"⚠ Editor not available: {exc}")
+    
+    # Set default camera zoom
+    engine.camera.set_zoom(100.5)
+    
+    print(f"✓ Engine started - Press ESC to exit\n")
+    
+    # Main game loop
+    frame_count = 0
+    while not engine.should_close():
+        with memory_tracker.phase("begin"):
+            engine.begin()
+        with memory_tracker.phase("scene.stream"):
+            scenes.update()
+        with memory_tracker.phase("input"):
+            input_engine.in_update()
+        # Скрипти і відкладені команди (спавн/видалення) - лише під час гри
+        if editor is None or editor.is_playing:
+            with memory_tracker.phase("scene.update"):
+                scenes.update_scenes(engine.dt, engine.profiler)
+        
+        if editor:
+            with memory_tracker.phase("editor.begin"):
+                editor.begin_frame()
+        
+        with memory_tracker.phase("draw"):
+            engine.draw()
+        
+        if editor:
+            with memory_tracker.phase("editor.end"):
+                editor.end_frame()
+        
+        with memory_tracker.phase("end"):
+            engine.end()
+        memory_tracker.end_frame()
+        frame_count += 1
+    
+    # Cleanup
+    if editor:
+        editor.shutdown()
+    scenes.shutdown()
+    engine.terminate()
+    
+    if memory_tracker.enabled:
+        report_path = memory_tracker.dump(os.path.join(project["path"], "memory_report.json"))
+        print(f"✓ Memory report written to {report_path}")
+    
+    print(f"\n✓ Engine closed (ran {frame_count} frames)")
+
+
 if __name__ == "__main__":
     main()